@@ -0,0 +1,125 @@
+"""Benchmark: columnar EpdCorpus vs. one IlcdProcess object per EPD.
+
+Builds synthetic ``processes``/``lcia`` cache tables and measures load time
+and retained memory of both representations.
+
+Run with ``python benchmarks/bench_corpus.py [epds] [indicators] [modules]``.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from materia_epd.core.constants import VARS
+from materia_epd.epd.corpus import EpdCorpus
+from materia_epd.epd.models import IlcdProcess
+
+EPD_FOLDER = Path("/epds")
+
+
+def make_frames(n: int, indicators: int, modules: int):
+    rng = np.random.default_rng(0)
+    uuids = [f"{i:08d}-0000-0000-0000-000000000000" for i in range(n)]
+    material = rng.uniform(0.1, 10.0, size=(n, len(VARS)))
+    material[rng.random((n, len(VARS))) < 0.7] = np.nan
+    processes = pd.DataFrame(material, columns=list(VARS))
+    processes.insert(0, "uuid", uuids)
+    processes.insert(1, "loc", rng.choice(["FR", "DE", "CH", "IT", None], size=n))
+    processes.insert(2, "ref_flow_uuid", [f"flow-{u}" for u in uuids])
+    processes.insert(3, "source_path", [f"{u}.xml" for u in uuids])
+    processes.insert(4, "base_names", json.dumps({"en": "Product", "fr": "Produit"}))
+    processes.insert(5, "hs_classes", json.dumps([{"level": "2", "class_id": "6904"}]))
+    processes.insert(6, "ref_flow_property", "93a60a56-a3c8-11da-a746-0800200b9a66")
+    processes.insert(7, "declared_unit", "mass")
+
+    per_epd = indicators * modules
+    lcia = pd.DataFrame(
+        {
+            "uuid": np.repeat(uuids, per_epd),
+            "indicator": np.tile(
+                np.repeat([f"Indicator {i}" for i in range(indicators)], modules), n
+            ),
+            "module": np.tile([f"M{m}" for m in range(modules)], n * indicators),
+            "value": rng.normal(size=n * per_epd),
+        }
+    )
+    return processes, lcia
+
+
+def load_objects(processes: pd.DataFrame, lcia: pd.DataFrame) -> list[IlcdProcess]:
+    """The list-of-objects loader the corpus replaces."""
+    raw_lcia_by_uuid: dict[str, dict[str, dict[str, float]]] = {}
+    for row in lcia.itertuples(index=False):
+        by_indicator = raw_lcia_by_uuid.setdefault(row.uuid, {})
+        by_indicator.setdefault(row.indicator, {})[row.module] = row.value
+
+    epds = []
+    for row in processes.itertuples(index=False):
+        material_kwargs = {
+            col: None if pd.isna(v := getattr(row, col)) else float(v) for col in VARS
+        }
+        epds.append(
+            IlcdProcess.from_cache_record(
+                uuid=row.uuid,
+                loc=row.loc,
+                ref_flow_uuid=row.ref_flow_uuid,
+                source_path=row.source_path,
+                material_kwargs=material_kwargs,
+                raw_lcia=raw_lcia_by_uuid.get(row.uuid, {}),
+                epd_folder=EPD_FOLDER,
+                base_names=json.loads(row.base_names),
+                hs_classes=json.loads(row.hs_classes),
+                dec_unit=row.declared_unit,
+                ref_flow_property=row.ref_flow_property,
+            )
+        )
+    return epds
+
+
+def load_corpus(processes: pd.DataFrame, lcia: pd.DataFrame) -> EpdCorpus:
+    return EpdCorpus.from_frames(processes, lcia, EPD_FOLDER)
+
+
+def measure(loader, processes, lcia) -> tuple[float, float]:
+    gc.collect()
+    started = time.perf_counter()
+    result = loader(processes, lcia)
+    elapsed = time.perf_counter() - started
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = loader(processes, lcia)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, retained / 2**20
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    indicators = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    modules = int(sys.argv[3]) if len(sys.argv) > 3 else 6
+    processes, lcia = make_frames(n, indicators, modules)
+    print(f"{n} EPDs, {indicators} indicators x {modules} modules each")
+
+    results = {
+        "objects": measure(load_objects, processes, lcia),
+        "corpus": measure(load_corpus, processes, lcia),
+    }
+    for name, (seconds, mib) in results.items():
+        print(f"{name:8s} load {seconds:7.2f} s   retained {mib:8.1f} MiB")
+    (obj_s, obj_mib), (col_s, col_mib) = results["objects"], results["corpus"]
+    print(f"speed-up x{obj_s / col_s:.1f}, memory x{obj_mib / col_mib:.1f} smaller")
+
+
+if __name__ == "__main__":
+    main()
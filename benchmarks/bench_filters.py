@@ -0,0 +1,76 @@
+"""Benchmark: per-product cost of filtering a large corpus.
+
+For one generic product, filters the whole corpus by uuid and location
+(the worst case: nearly every EPD is rejected) and reports CPU time and
+peak traced memory of
+
+- ``eager``: per-EPD ``matches`` with a formatted reason string for every
+  rejection (previous ``get_filtered_epds``)
+- ``ledger``: one columnar pass recording ``(uuid, reason, filter)``
+  entries, no text rendered
+
+Run with ``python benchmarks/bench_filters.py [epds] [requested]``.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+
+from bench_corpus import make_frames
+
+from materia_epd.epd.corpus import EpdCorpus
+from materia_epd.epd.filters import (
+    LocationFilter,
+    UUIDFilter,
+    filter_failure,
+    get_filtered_epds,
+)
+
+
+def eager(epds, filter):
+    accepted, rejected = [], []
+    for epd in epds:
+        if not filter.matches(epd):
+            rejected.append((epd.uuid, filter_failure(epd, filter)))
+        else:
+            accepted.append(epd)
+    return accepted, rejected
+
+
+def measure(run, corpus, filters) -> tuple[float, float]:
+    started = time.process_time()
+    for f in filters:
+        run(corpus, f)
+    seconds = time.process_time() - started
+
+    tracemalloc.start()
+    kept = [run(corpus, f) for f in filters]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return seconds, peak / 2**20
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    requested = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    processes, lcia = make_frames(n, 1, 1)
+    corpus = EpdCorpus.from_frames(processes, lcia, "/epds")
+    uuids = list(corpus.uuids[:: max(1, n // requested)])
+    filters = [UUIDFilter({"uuids": uuids}), LocationFilter({"FR", "CH"})]
+    print(f"{n} EPDs, {len(uuids)} requested uuids, {len(filters)} filters")
+
+    results = {
+        "eager": measure(eager, corpus, filters),
+        "ledger": measure(get_filtered_epds, corpus, filters),
+    }
+    for name, (seconds, mib) in results.items():
+        print(f"{name:7s} cpu {seconds:7.3f} s   peak {mib:8.1f} MiB")
+    (e_s, e_mib), (l_s, l_mib) = results["eager"], results["ledger"]
+    print(f"cpu x{e_s / l_s:.0f} less, memory x{e_mib / l_mib:.0f} smaller")
+
+
+if __name__ == "__main__":
+    main()
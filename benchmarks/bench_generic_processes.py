@@ -0,0 +1,136 @@
+"""Benchmark: peak RSS of holding generic processes with vs. without XML trees.
+
+Writes a synthetic generic-process folder, then loads it in a fresh child
+process per mode and reports the child's peak RSS:
+
+- ``objects``: one IlcdProcess per product, XML roots kept (previous run loop)
+- ``records``: GenericProcess records, XML released after extraction
+
+Run with ``python benchmarks/bench_generic_processes.py [products]``.
+"""
+
+from __future__ import annotations
+
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from materia_epd.core.constants import FLOW_PROPERTY_MAPPING
+
+KG_UUID = FLOW_PROPERTY_MAPPING["kg"]
+INDICATORS = 25
+MODULES = ["A1-A3", "A4", "A5", *(f"B{i}" for i in range(1, 8)), "C1", "C2", "C3"]
+EXCHANGES = 60
+
+
+def _flow_xml(uuid: str) -> str:
+    return f"""<flow xmlns:flow="http://lca.jrc.it/ILCD/Flow"
+ xmlns:common="http://lca.jrc.it/ILCD/Common" xmlns:mat="http://www.matml.org/">
+  <common:UUID>{uuid}</common:UUID>
+  <flow:flowProperties><flow:flowProperty dataSetInternalID="0">
+    <flow:referenceToFlowPropertyDataSet refObjectId="{KG_UUID}">
+      <common:shortDescription xml:lang="en">Mass</common:shortDescription>
+    </flow:referenceToFlowPropertyDataSet>
+    <flow:meanValue>1.0</flow:meanValue>
+  </flow:flowProperty></flow:flowProperties>
+  <flow:referenceToReferenceFlowProperty>0</flow:referenceToReferenceFlowProperty>
+  <mat:MatML_Doc />
+</flow>"""
+
+
+def _process_xml(uuid: str, flow_uuid: str) -> str:
+    exchanges = "".join(
+        f"""<proc:exchange dataSetInternalID="{i}"><proc:meanAmount>1</proc:meanAmount>
+<proc:referenceToFlowDataSet refObjectId="{flow_uuid if i == 0 else f"x-{i}"}">
+<common:shortDescription xml:lang="en">Exchange {i}</common:shortDescription>
+</proc:referenceToFlowDataSet></proc:exchange>"""
+        for i in range(EXCHANGES)
+    )
+    amounts = "".join(
+        f'<epd:amount epd:module="{m}">{i + 0.5}</epd:amount>'
+        for i, m in enumerate(MODULES)
+    )
+    results = "".join(
+        f"""<proc:LCIAResult><proc:referenceToLCIAMethodDataSet>
+<common:shortDescription xml:lang="en">Indicator {i}</common:shortDescription>
+</proc:referenceToLCIAMethodDataSet>{amounts}</proc:LCIAResult>"""
+        for i in range(INDICATORS)
+    )
+    return f"""<process xmlns:common="http://lca.jrc.it/ILCD/Common"
+ xmlns:proc="http://lca.jrc.it/ILCD/Process"
+ xmlns:epd="http://www.iai.kit.edu/EPD/2013">
+  <common:UUID>{uuid}</common:UUID>
+  <proc:name><proc:baseName xml:lang="en">Product {uuid}</proc:baseName></proc:name>
+  <common:classification name="HS Classification">
+    <common:class level="2" classId="7208">Flat-rolled products</common:class>
+  </common:classification>
+  <proc:locationOfOperationSupplyOrProduction location="FR" />
+  <proc:quantitativeReference>
+    <proc:referenceToReferenceFlow>0</proc:referenceToReferenceFlow>
+  </proc:quantitativeReference>
+  <proc:exchanges>{exchanges}</proc:exchanges>
+  <proc:LCIAResults>{results}</proc:LCIAResults>
+</process>"""
+
+
+def write_folder(root: Path, products: int) -> None:
+    for sub in ("processes", "flows", "matches"):
+        (root / sub).mkdir(parents=True)
+    for i in range(products):
+        uuid, flow_uuid = f"gen-{i:06d}", f"flow-{i:06d}"
+        (root / "flows" / f"{flow_uuid}.xml").write_text(_flow_xml(flow_uuid))
+        (root / "processes" / f"{uuid}.xml").write_text(_process_xml(uuid, flow_uuid))
+        (root / "matches" / f"{uuid}.json").write_text(json.dumps({"uuids": ["e"]}))
+
+
+def load(root: Path, mode: str) -> int:
+    import xml.etree.ElementTree as ET
+
+    from materia_epd.epd import models
+
+    models.get_market_shares = lambda loc, hs: {"FR": 1.0}
+    held = []
+    for path in sorted((root / "processes").glob("*.xml")):
+        xml_root = ET.parse(path).getroot()
+        if mode == "records":
+            process = models.GenericProcess.load(path, xml_root)
+        else:
+            process = models.IlcdProcess(root=xml_root, path=path)
+            process.get_ref_flow()
+            process.get_declared_unit()
+            process.get_hs_class()
+            process.get_market()
+            process.get_matches()
+        held.append(process)
+    return len(held)
+
+
+def main() -> None:
+    if len(sys.argv) == 4 and sys.argv[1] == "--load":
+        load(Path(sys.argv[2]), sys.argv[3])
+        print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+        return
+
+    products = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "gen"
+        write_folder(root, products)
+        print(f"{products} generic processes")
+        peaks = {}
+        for mode in ("objects", "records"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--load", str(root), mode],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            peaks[mode] = int(out.stdout.split()[-1]) / 1024
+            print(f"{mode:8s} peak RSS {peaks[mode]:8.1f} MiB")
+    print(f"peak RSS x{peaks['objects'] / peaks['records']:.1f} smaller")
+
+
+if __name__ == "__main__":
+    main()
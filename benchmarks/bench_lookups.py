@@ -0,0 +1,68 @@
+"""Micro-benchmark: precomputed lookup tables vs. linear mapping scans.
+
+Run with ``python benchmarks/bench_lookups.py``.
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from materia_epd.core.constants import FLOW_PROPERTY_MAPPING, UNIT_PROPERTY_MAPPING
+from materia_epd.core.lookups import (
+    PROPERTY_UNIT_BY_FIELD,
+    UNIT_BY_FLOW_PROPERTY_UUID,
+    canonical_indicator,
+)
+from materia_epd.resources import get_indicator_synonyms
+
+NUMBER = 200_000
+
+
+def _scan_indicator(name: str) -> str | None:
+    return next(
+        (c for c, aliases in get_indicator_synonyms().items() if name in aliases),
+        None,
+    )
+
+
+def _scan_unit(uuid: str) -> str | None:
+    return next(
+        (s for s, mapped in FLOW_PROPERTY_MAPPING.items() if mapped == uuid),
+        None,
+    )
+
+
+def _rebuild_property_unit(field: str) -> str | None:
+    return {v: k for k, v in UNIT_PROPERTY_MAPPING.items()}.get(field)
+
+
+CASES = [
+    (
+        "indicator alias -> canonical",
+        lambda: _scan_indicator("GWP (luluc)"),
+        lambda: canonical_indicator("GWP (luluc)"),
+    ),
+    (
+        "flow-property uuid -> unit",
+        lambda: _scan_unit(FLOW_PROPERTY_MAPPING["unit"]),
+        lambda: UNIT_BY_FLOW_PROPERTY_UUID.get(FLOW_PROPERTY_MAPPING["unit"]),
+    ),
+    (
+        "field -> property unit",
+        lambda: _rebuild_property_unit("weight_per_piece"),
+        lambda: PROPERTY_UNIT_BY_FIELD.get("weight_per_piece"),
+    ),
+]
+
+
+def main() -> None:
+    print(f"{'case':<32}{'scan [ns]':>12}{'lookup [ns]':>14}{'speedup':>10}")
+    for label, scan, lookup in CASES:
+        assert scan() == lookup()
+        t_scan = timeit.timeit(scan, number=NUMBER) / NUMBER * 1e9
+        t_lookup = timeit.timeit(lookup, number=NUMBER) / NUMBER * 1e9
+        print(f"{label:<32}{t_scan:>12.0f}{t_lookup:>14.0f}{t_scan / t_lookup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
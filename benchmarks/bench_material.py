@@ -0,0 +1,142 @@
+"""Benchmark: Material rule propagation and rescaling.
+
+Builds a random ``(n, len(VARS))`` material matrix with a share of unknown
+fields and times:
+
+- ``_compute`` per row through the rule queue vs. the per-pattern plan
+- ``rescale`` (uncached) of every row to its own mass, queue vs. plan
+- ``scalar`` per-row propagation vs. one batched
+  :func:`materia_epd.core.physics.propagate_rules` call
+- memoized ``rescale`` vs. one :func:`materia_epd.core.physics.rescale_many`
+  call over ``rows // 10`` over-determined (conflicting) materials
+
+Run with ``python benchmarks/bench_material.py [rows] [unknown_share]``.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+
+from materia_epd.core.constants import VARS
+from materia_epd.core.physics import (
+    Material,
+    _propagate_row,
+    _rescale_cached,
+    propagate_rules,
+    rescale_many,
+)
+
+
+def make_values(n: int, unknown: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    values = rng.uniform(0.1, 10.0, size=(n, 11))
+    values[rng.random(values.shape) < unknown] = np.nan
+    return values
+
+
+def _materials(values: np.ndarray) -> list[Material]:
+    return [
+        Material(**{n: None if np.isnan(v) else v for n, v in zip(VARS, row)})
+        for row in values
+    ]
+
+
+def time_compute(materials: list[Material], method: str) -> float:
+    thawed = [m._thaw() for m in materials]
+    started = time.perf_counter()
+    for m in thawed:
+        getattr(m, method)()
+    return time.perf_counter() - started
+
+
+def time_rescale(materials: list[Material], compute) -> float:
+    original = Material._compute
+    Material._compute = compute
+    try:
+        started = time.perf_counter()
+        for m in materials:
+            if m.mass is not None:
+                try:
+                    with np.errstate(all="ignore"):
+                        m._thaw()._rescale({"mass": m.mass * 2})
+                except ValueError:
+                    pass
+        return time.perf_counter() - started
+    finally:
+        Material._compute = original
+
+
+def conflicting_materials(n: int) -> list[Material]:
+    rng = np.random.default_rng(1)
+    fields = ["volume", "gross_density", "surface", "layer_thickness", "grammage"]
+    materials = []
+    for _ in range(n):
+        chosen = rng.choice(fields, size=rng.integers(2, 6), replace=False)
+        kwargs = {name: rng.uniform(0.5, 5.0) for name in ["mass", *chosen]}
+        materials.append(Material(**kwargs))
+    return materials
+
+
+def time_rescale_many(materials: list[Material], batched: bool) -> float:
+    _rescale_cached.cache_clear()
+    started = time.perf_counter()
+    with np.errstate(all="ignore"):
+        if batched:
+            rescale_many(materials, {"mass": 3.0})
+        else:
+            for m in materials:
+                try:
+                    m.rescale({"mass": 3.0})
+                except ValueError:
+                    pass
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    unknown = float(sys.argv[2]) if len(sys.argv) > 2 else 0.7
+    values = make_values(n, unknown)
+    print(f"{n} rows, {unknown:.0%} unknown fields")
+
+    materials = _materials(values)
+    queued_s = time_compute(materials, "_compute_queued")
+    planned_s = time_compute(materials, "_compute")
+    print(
+        f"_compute  queue {queued_s:6.2f} s   plan {planned_s:6.2f} s   "
+        f"x{queued_s / planned_s:.1f}"
+    )
+    queued_s = time_rescale(materials, Material._compute_queued)
+    planned_s = time_rescale(materials, Material._compute)
+    print(
+        f"rescale   queue {queued_s:6.2f} s   plan {planned_s:6.2f} s   "
+        f"x{queued_s / planned_s:.1f}"
+    )
+    conflicting = conflicting_materials(n // 10)
+    single_s = time_rescale_many(conflicting, batched=False)
+    batch_s = time_rescale_many(conflicting, batched=True)
+    print(
+        f"rescale   each  {single_s:6.2f} s   batch {batch_s:5.2f} s   "
+        f"x{single_s / batch_s:.1f}"
+    )
+
+    started = time.perf_counter()
+    scalar = [_propagate_row(row) for row in values]
+    scalar_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    derived, conflicts = propagate_rules(values)
+    batch_s = time.perf_counter() - started
+
+    expected = np.array([d for d, _ in scalar])
+    assert np.array_equal(derived, expected, equal_nan=True)
+    assert conflicts.tolist() == [c for _, c in scalar]
+    print(f"scalar {scalar_s:7.2f} s")
+    print(f"batch  {batch_s:7.2f} s   ({int(conflicts.sum())} rows with conflicts)")
+    print(f"speed-up x{scalar_s / batch_s:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark: sequential extraction with and without read-ahead prefetching.
+
+Simulates high-latency storage by sleeping ``LATENCY_MS`` on every file read.
+Run with ``python benchmarks/bench_prefetch.py [files] [latency_ms]``.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from materia_epd.core.constants import FLOW_PROPERTY_MAPPING
+from materia_epd.epd import cache, extract
+from materia_epd.io import archives
+
+PROCESS_XML = """<process xmlns:common="http://lca.jrc.it/ILCD/Common"
+         xmlns:proc="http://lca.jrc.it/ILCD/Process"
+         xmlns:epd="http://www.iai.kit.edu/EPD/2013">
+  <common:UUID>epd-{i}</common:UUID>
+  <proc:locationOfOperationSupplyOrProduction location="FR" />
+  <proc:quantitativeReference>
+    <proc:referenceToReferenceFlow>0</proc:referenceToReferenceFlow>
+  </proc:quantitativeReference>
+  <proc:exchanges>
+    <proc:exchange dataSetInternalID="0">
+      <proc:meanAmount>1</proc:meanAmount>
+      <proc:referenceToFlowDataSet refObjectId="{kg}" />
+    </proc:exchange>
+  </proc:exchanges>
+  <proc:LCIAResults>{lcia}
+  </proc:LCIAResults>
+</process>"""
+
+LCIA_XML = """
+    <proc:LCIAResult>
+      <proc:referenceToLCIAMethodDataSet>
+        <common:shortDescription xml:lang="en">GWP-total</common:shortDescription>
+      </proc:referenceToLCIAMethodDataSet>
+      <epd:amount epd:module="A1-A3">{i}</epd:amount>
+      <epd:amount epd:module="C4">1.0</epd:amount>
+    </proc:LCIAResult>"""
+
+
+def _write_corpus(folder: Path, count: int) -> list[str]:
+    paths = []
+    for i in range(count):
+        path = folder / f"epd-{i}.xml"
+        path.write_text(
+            PROCESS_XML.format(
+                i=i,
+                kg=FLOW_PROPERTY_MAPPING["kg"],
+                lcia="".join(LCIA_XML.format(i=i) for _ in range(20)),
+            ),
+            encoding="utf-8",
+        )
+        paths.append(str(path.resolve()))
+    return paths
+
+
+def _simulate_latency(latency_s: float) -> None:
+    read_bytes = archives.read_source_bytes
+    open_source = extract.open_xml_source
+
+    def slow_read(source):
+        time.sleep(latency_s)
+        return read_bytes(source)
+
+    def slow_open(source):
+        if archives._PREFETCHED.get() is None:
+            time.sleep(latency_s)
+        return open_source(source)
+
+    archives.read_source_bytes = slow_read
+    extract.open_xml_source = slow_open
+
+
+def _run(paths: list[str], read_ahead: int) -> float:
+    start = time.perf_counter()
+    records, failures = cache._extract_sequential(
+        paths,
+        extract.extract_process_record,
+        description="bench",
+        disable_progress=True,
+        verbose=False,
+        read_ahead=read_ahead,
+    )
+    assert len(records) == len(paths) and not failures
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _write_corpus(Path(tmp), count)
+        _simulate_latency(latency_ms / 1e3)
+        print(f"{count} files, {latency_ms:g} ms simulated read latency")
+        baseline = _run(paths, read_ahead=0)
+        print(f"  no prefetch      {baseline:7.3f} s")
+        for read_ahead in (4, cache.PREFETCH_READ_AHEAD):
+            elapsed = _run(paths, read_ahead=read_ahead)
+            print(
+                f"  read-ahead {read_ahead:<4}  {elapsed:7.3f} s"
+                f"  ({baseline / elapsed:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark: ILCD output writer throughput.
+
+Writes aggregated results for a synthetic generic-process folder with
+
+- ``indent``: whole-tree ``ET.indent`` before every write (previous writer)
+- ``stream``: subtree indentation and the streaming writer (current writer)
+
+and reports processes written per second (best of ``REPEATS``).
+
+Run with ``python benchmarks/bench_writer.py [products]``.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from bench_generic_processes import INDICATORS, MODULES, write_folder
+
+from materia_epd.epd import models
+from materia_epd.io import files
+
+RESULTS = {f"Indicator {i}": {m: float(i) for m in MODULES} for i in range(INDICATORS)}
+REPEATS = 3
+FLOW = {"mass": 3.0, "gross_density": 7850.0, "volume": 0.0004}
+
+
+def _indent_then_write(root, path) -> bool:
+    """The previous ``write_xml_root``."""
+    ET.indent(root, space="  ")
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
+    return True
+
+
+def run(root: Path, out: Path, mode: str) -> float:
+    models.get_market_shares = lambda loc, hs: {"FR": 1.0}
+    models.write_xml_root = (
+        _indent_then_write if mode == "indent" else files.write_xml_root
+    )
+    processes = [
+        models.GenericProcess.load(path, ET.parse(path).getroot()).reload()
+        for path in sorted((root / "processes").glob("*.xml"))
+    ]
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.process_time()
+        for process in processes:
+            process.write_process(RESULTS, out)
+            process.write_flow(FLOW, out)
+        best = min(best, time.process_time() - started)
+    return best
+
+
+def main() -> None:
+    products = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "gen"
+        write_folder(root, products)
+        print(f"{products} processes, {INDICATORS} indicators x {len(MODULES)}")
+        seconds = {
+            mode: run(root, Path(tmp) / mode, mode) for mode in ("indent", "stream")
+        }
+    for mode, s in seconds.items():
+        print(f"{mode:8s} {s:7.2f} s   {products / s:8.0f} processes/s")
+    print(f"speed-up x{seconds['indent'] / seconds['stream']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
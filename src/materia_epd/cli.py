@@ -5,13 +5,31 @@ from pathlib import Path
 import click
 from rich.console import Console
 
-from materia_epd.epd.cache import build_epd_cache, resolve_cache_dir
 from materia_epd.logging_utils import setup_logging
-from materia_epd.pipeline.run import run_materia
 
 console = Console()
 
 
+# The pipeline and cache pull in pandas and matplotlib. Import them on use so
+# that spawned extraction workers, which re-import the main module, stay light.
+def run_materia(*args, **kwargs):
+    from materia_epd.pipeline.run import run_materia as _run_materia
+
+    return _run_materia(*args, **kwargs)
+
+
+def build_epd_cache(*args, **kwargs):
+    from materia_epd.epd.cache import build_epd_cache as _build_epd_cache
+
+    return _build_epd_cache(*args, **kwargs)
+
+
+def resolve_cache_dir(*args, **kwargs):
+    from materia_epd.epd.cache import resolve_cache_dir as _resolve_cache_dir
+
+    return _resolve_cache_dir(*args, **kwargs)
+
+
 @click.command()
 @click.argument("input_path", type=click.Path(exists=True, path_type=Path))
 @click.argument("epd_folder_path", type=click.Path(exists=True, path_type=Path))
@@ -28,6 +46,19 @@ console = Console()
     default=False,
     help="Skip the EPD cache and parse source XML files directly.",
 )
+@click.option(
+    "--writers",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Background output writers (default: 4; 0 writes outputs inline).",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Processes running average and market-average products (default: 1).",
+)
 @click.option(
     "--verbose", "-v", "verbose", is_flag=True, flag_value=True, default=False
 )
@@ -37,6 +68,8 @@ def aggregate(
     output_path: Path | None,
     epd_cache: Path | None,
     no_epd_cache: bool,
+    writers: int | None,
+    jobs: int | None,
     verbose: bool,
 ):
     """Run the EPD aggregation pipeline."""
@@ -48,6 +81,8 @@ def aggregate(
         epd_cache_dir=epd_cache,
         use_epd_cache=not no_epd_cache,
         verbose=verbose,
+        writers=writers,
+        jobs=jobs,
     )
 
 
@@ -68,6 +103,12 @@ def aggregate(
     default=None,
     help="Parallel worker count (default: CPU count).",
 )
+@click.option(
+    "--timings",
+    is_flag=True,
+    default=False,
+    help="Record per-phase extraction timings and store them in manifest.json.",
+)
 @click.option(
     "--verbose", "-v", "verbose", is_flag=True, flag_value=True, default=False
 )
@@ -76,6 +117,7 @@ def build_cache_cmd(
     cache_dir: Path | None,
     force: bool,
     workers: int | None,
+    timings: bool,
     verbose: bool,
 ):
     """Pre-build the EPD Feather cache without running the aggregation pipeline."""
@@ -88,6 +130,7 @@ def build_cache_cmd(
         workers=workers,
         console=console,
         verbose=verbose,
+        timings=timings,
     )
     console.print(f"[green]EPD cache written to {resolved}[/green]")
 
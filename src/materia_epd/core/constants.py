@@ -35,6 +35,9 @@ class XP:
     QUANT_REF = ".//proc:quantitativeReference/proc:referenceToReferenceFlow"
     UUID = ".//common:UUID"
     LOCATION = ".//proc:locationOfOperationSupplyOrProduction"
+    BASE_NAME = ".//proc:name/proc:baseName"
+    CLASSIFICATION = ".//common:classification"
+    CLASS = "common:class"
     HS_CLASSIFICATION = ".//common:classification[@name='HS Classification']"
     CLASS_LEVEL_2 = "common:class[@level='2']"
     MEAN_AMOUNT = "proc:meanAmount"
@@ -0,0 +1,65 @@
+"""Precomputed reverse indexes over the ILCD mapping constants.
+
+Built once at import so hot loops do dict lookups instead of scanning
+``FLOW_PROPERTY_MAPPING``, ``UNIT_*_MAPPING`` or the indicator synonyms.
+"""
+
+from __future__ import annotations
+
+from materia_epd.core.constants import (
+    FLOW_PROPERTY_MAPPING,
+    UNIT_PROPERTY_MAPPING,
+    UNIT_QUANTITY_MAPPING,
+)
+from materia_epd.resources import get_indicator_synonyms
+
+
+def normalize_alias(name: str) -> str:
+    """Collapse whitespace and casefold an indicator name for lookup."""
+    return " ".join(name.split()).casefold()
+
+
+def build_indicator_index(synonyms: dict[str, list[str]]) -> dict[str, str]:
+    """Map normalized alias -> canonical indicator; the first canonical wins."""
+    index: dict[str, str] = {}
+    for canonical, aliases in synonyms.items():
+        for alias in aliases:
+            index.setdefault(normalize_alias(alias), canonical)
+    return index
+
+
+# flow-property uuid -> unit symbol (e.g. "kg")
+UNIT_BY_FLOW_PROPERTY_UUID: dict[str, str] = {
+    uuid: unit for unit, uuid in FLOW_PROPERTY_MAPPING.items()
+}
+
+# material field -> unit symbol, for quantities (e.g. "mass" -> "kg")
+QUANTITY_UNIT_BY_FIELD: dict[str, str] = {
+    field: unit for unit, field in UNIT_QUANTITY_MAPPING.items()
+}
+
+# material field -> unit symbol, for MatML properties (e.g. "grammage" -> "kg/m^2")
+PROPERTY_UNIT_BY_FIELD: dict[str, str] = {
+    field: unit for unit, field in UNIT_PROPERTY_MAPPING.items()
+}
+
+# flow-property uuid -> quantity field (e.g. "mass")
+QUANTITY_FIELD_BY_FLOW_PROPERTY_UUID: dict[str, str] = {
+    uuid: UNIT_QUANTITY_MAPPING[unit]
+    for uuid, unit in UNIT_BY_FLOW_PROPERTY_UUID.items()
+    if unit in UNIT_QUANTITY_MAPPING
+}
+
+# all material fields, quantities and properties, in mapping order
+MATERIAL_FIELDS: tuple[str, ...] = tuple(
+    dict.fromkeys([*UNIT_QUANTITY_MAPPING.values(), *UNIT_PROPERTY_MAPPING.values()])
+)
+
+INDICATOR_BY_ALIAS: dict[str, str] = build_indicator_index(get_indicator_synonyms())
+
+
+def canonical_indicator(name: str | None) -> str | None:
+    """Return the canonical indicator for an LCIA method name, if known."""
+    if not name:
+        return None
+    return INDICATOR_BY_ALIAS.get(normalize_alias(name))
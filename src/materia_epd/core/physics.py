@@ -1,7 +1,10 @@
 import logging
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
 
 import numpy as np
 import structlog
@@ -58,8 +61,108 @@ for k, ru in enumerate(RULES):
         RULES_BY_REQ[r].append(k)
 
 
+class PlanStep(NamedTuple):
+    target: int
+    op: RuleMode
+    operands: Tuple[int, ...]
+    assign: bool
+
+
+@lru_cache(maxsize=None)
+def _derivation_plan(pattern: int) -> Tuple[PlanStep, ...]:
+    """
+    Straight-line form of ``Material._compute`` for a known-variable pattern.
+
+    Bit i of ``pattern`` is set when VARS[i] is known. Steps come in the
+    order the rule queue would fire them; ``assign=False`` marks a
+    consistency check against an already known target. Divides are assumed
+    to have a usable denominator; callers fall back to the queue otherwise.
+    """
+    known = [bool(pattern >> i & 1) for i in range(len(VARS))]
+    queue = [i for i, k in enumerate(known) if k]
+    steps: List[PlanStep] = []
+    while queue:
+        var_idx = queue.pop(0)
+        for ru_idx in RULES_BY_REQ[var_idx]:
+            ru = RULES[ru_idx]
+            if not all(known[r] for r in ru.reqs):
+                continue
+            if known[ru.target]:
+                steps.append(PlanStep(ru.target, ru.mode, ru.reqs, False))
+                continue
+            steps.append(PlanStep(ru.target, ru.mode, ru.reqs, True))
+            known[ru.target] = True
+            queue.append(ru.target)
+    return tuple(steps)
+
+
+@lru_cache(maxsize=None)
+def derivable_bits(pattern: int) -> int:
+    """Bits of the VARS known once the rules have run on ``pattern``."""
+    for step in _derivation_plan(pattern):
+        if step.assign:
+            pattern |= 1 << step.target
+    return pattern
+
+
+def _rescaling_requirement(combo) -> int:
+    fields = set(combo)
+    # thickness rescaling also goes through surface and density
+    if "layer_thickness" in combo:
+        fields |= {"surface", "gross_density"}
+    return sum(1 << NAME_TO_IDX[name] for name in fields)
+
+
+# bit k of a rescaling mask is set when ACCEPTED_RESCALINGS[k] is feasible
+RESCALING_REQUIREMENTS: Tuple[int, ...] = tuple(
+    _rescaling_requirement(combo) for combo in ACCEPTED_RESCALINGS
+)
+
+
+def feasible_rescalings(bits):
+    """
+    Rescaling mask for derivable-field ``bits``, an int or an integer array.
+
+    A cleared bit k means rescaling to ACCEPTED_RESCALINGS[k] is bound to
+    fail with a missing field; a set bit only means it may succeed.
+    """
+    mask = 0
+    for k, required in enumerate(RESCALING_REQUIREMENTS):
+        mask = mask | ((bits & required) == required) << k
+    return mask
+
+
+def rescaling_index(targets: Dict[str, Optional[float]]) -> Optional[int]:
+    """Position of ``targets`` in ACCEPTED_RESCALINGS, None when not valid."""
+    targets = {k: v for k, v in targets.items() if v is not None}
+    if any(v <= 0 for v in targets.values()):
+        return None
+    fields = set(targets)
+    return next((k for k, c in enumerate(ACCEPTED_RESCALINGS) if c == fields), None)
+
+
+def missing_field_error(
+    bits: int, targets: Dict[str, Optional[float]]
+) -> Optional[str]:
+    """
+    The ValueError message ``Material.rescale`` raises for valid ``targets``
+    when a field it needs is not derivable from ``bits``, None otherwise.
+    """
+    for field in (k for k, v in targets.items() if v is not None):
+        if not bits >> NAME_TO_IDX[field] & 1:
+            return f"Cannot scale: '{field}' is None"
+        bits |= 1 << NAME_TO_IDX[field]
+        if field == "layer_thickness":
+            if not bits >> NAME_TO_IDX["surface"] & 1:
+                return "Cannot adjust thickness: surface must be known and > 0."
+            if not bits >> NAME_TO_IDX["gross_density"] & 1:
+                return "Cannot adjust thickness: density must be known and > 0."
+    return None
+
+
 def _is_close(a: float, b: float) -> bool:
-    return np.isclose(a, b, rtol=_TOL_REL, atol=_TOL_ABS)
+    # np.isclose without the array round-trip
+    return abs(a - b) <= _TOL_ABS + _TOL_REL * abs(b)
 
 
 def _round(value: float, decimals: int = _REL_DEC) -> float:
@@ -123,7 +226,8 @@ def _rule_log_coeffs(ru: Rule) -> Dict[int, float]:
 def _build_property_eq_system(
     adj_col: Dict[int, int],
 ) -> tuple[np.ndarray, np.ndarray]:
-    rows: list[list[float]] = []
+    rows: list[tuple[float, ...]] = []
+    seen: set[tuple[float, ...]] = set()
     for ru in RULES:
         coeffs = _rule_log_coeffs(ru)
         if not all(idx in adj_col for idx in coeffs.keys()):
@@ -132,54 +236,101 @@ def _build_property_eq_system(
         for idx, c in coeffs.items():
             row[adj_col[idx]] += c
         if any(abs(x) > _TOL_ABS for x in row):
-            if any(row == r or row == [-x for x in r] for r in rows):
+            key = tuple(row)
+            if key in seen or tuple(-x for x in row) in seen:
                 continue
-            else:
-                rows.append(row)
-    A_eq = np.asarray(rows, dtype=float)
+            seen.add(key)
+            rows.append(key)
+    A_eq = np.asarray(rows, dtype=float).reshape(len(rows), len(adj_col))
     b_eq = np.zeros(A_eq.shape[0], dtype=float)
     return A_eq, b_eq
 
 
+def _independent_rows(A_eq: np.ndarray, fixed_rows: np.ndarray) -> np.ndarray:
+    """
+    Rows of ``A_eq`` that are linearly independent of each other and of
+    ``fixed_rows``, so the KKT block built from them is non-singular.
+    Dropped rows are implied by the kept ones; the feasible set is unchanged.
+    """
+    kept: List[np.ndarray] = []
+    basis = np.asarray(fixed_rows, dtype=float).reshape(-1, A_eq.shape[1])
+    rank = np.linalg.matrix_rank(basis) if len(basis) else 0
+    for row in A_eq:
+        candidate = np.vstack([basis, row])
+        if np.linalg.matrix_rank(candidate) > rank:
+            basis, rank = candidate, rank + 1
+            kept.append(row)
+    return np.asarray(kept, dtype=float).reshape(len(kept), A_eq.shape[1])
+
+
+@lru_cache(maxsize=None)
+def _projection_operator(
+    known: Tuple[int, ...], fixed: Tuple[int, ...]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Solved KKT system of the log-space projection, per variable pattern.
+
+    ``known`` are the VARS indices of the scaled baseline and ``fixed`` the
+    positions, within ``known``, of the rescaling targets. Returns ``(B, T)``
+    so that the projected logs are ``B @ base_logs + T @ target_logs``.
+    """
+    A_eq, _ = _build_property_eq_system({idx: j for j, idx in enumerate(known)})
+    n, c = len(known), len(fixed)
+    W = np.eye(n)
+    E = np.zeros((n, c))
+    E[list(fixed), range(c)] = 1
+    A_eq = _independent_rows(A_eq, E.T)
+    r = A_eq.shape[0]
+
+    K = np.block(
+        [
+            [2.0 * W, A_eq.T, E],
+            [A_eq, np.zeros((r, r)), np.zeros((r, c))],
+            [E.T, np.zeros((c, r)), np.zeros((c, c))],
+        ]
+    )
+    # right-hand sides for unit base logs (first n columns) and target logs
+    R = np.zeros((n + r + c, n + c))
+    R[:n, :n] = 2.0 * W
+    R[np.arange(c) + n + r, np.arange(c) + n] = 1.0
+
+    try:
+        X = np.linalg.solve(K, R)
+    except np.linalg.LinAlgError:
+        X, *_ = np.linalg.lstsq(K, R, rcond=None)
+    return X[:n, :n], X[:n, n:]
+
+
 def _project_logs_onto_eq(
     scaled_baseline: Dict[str, float],
     targets: Dict[str, float],
     internal_idxs: Dict[str, int],
 ) -> np.ndarray:
     adj_idxs = [NAME_TO_IDX[name] for name in VARS if scaled_baseline[name] is not None]
-    adj_col = {idx: j for j, idx in enumerate(adj_idxs)}
     base_logs = np.array(
         [np.log(scaled_baseline[IDX_TO_NAME[idx]]) for idx in adj_idxs], dtype=float
     )
-    weights = np.full(len(adj_idxs), float(1), dtype=float)
-    A_eq, b_eq = _build_property_eq_system(adj_col)
-    n_constraints = len(targets)
-    W = np.diag(weights)
-    E = np.zeros((len(base_logs), n_constraints))
     d = np.array([np.log(targets[key]) for key in targets], dtype=float)
-    for j, key in enumerate(targets.keys()):
-        E[internal_idxs[key], j] = 1
-    n, r, c = len(base_logs), A_eq.shape[0], len(targets)
-
-    K = np.block(
-        [
-            [2.0 * W, A_eq.T, E],
-            [A_eq, np.zeros((r, r)), np.zeros((r, c))],
-            [E.T, np.zeros((c, r)), np.zeros((c, c))],
-        ]
+    B, T = _projection_operator(
+        tuple(adj_idxs), tuple(internal_idxs[key] for key in targets)
     )
+    return B @ base_logs + T @ d
 
-    rhs = np.concatenate([2.0 * W @ base_logs, b_eq, d])
 
-    try:
-        x = np.linalg.solve(K, rhs)
-    except np.linalg.LinAlgError:
-        x, *_ = np.linalg.lstsq(K, rhs, rcond=None)
-    return x[:n]
+# Rescaled materials kept per (material, targets); failures are kept too.
+RESCALE_CACHE_SIZE = 16384
 
 
 class Material:
+    """
+    Quantities and properties of a declared unit.
+
+    Instances are immutable: :meth:`rescale` returns a new Material, so one
+    EPD's material can be shared by every product that filters it.
+    """
+
     def __init__(self, **kwargs):
+        object.__setattr__(self, "_frozen", False)
         for name in VARS:
             setattr(self, name, None)
 
@@ -191,11 +342,117 @@ class Material:
         self.scaling_factor: float = 1.0
         self.initial_baseline: Dict[str, Optional[float]] = {}
         self.scaled_baseline: Dict[str, Optional[float]] = {}
+        self._derived: Optional[Tuple[Optional[float], ...]] = None
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if self._frozen:
+            raise AttributeError(f"Material is immutable; cannot set {name!r}")
+        object.__setattr__(self, name, value)
+
+    def _state(self) -> tuple:
+        return (tuple(getattr(self, name) for name in VARS), self.scaling_factor)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Material):
+            return NotImplemented
+        return self._state() == other._state()
+
+    def __hash__(self) -> int:
+        if not self._frozen:
+            return hash(self._state())
+        cached = self.__dict__.get("_hash")
+        if cached is None:
+            cached = hash(self._state())
+            object.__setattr__(self, "_hash", cached)
+        return cached
+
+    def __repr__(self) -> str:
+        known = {k: v for k, v in self.to_dict().items() if v is not None}
+        return f"Material({known}, scaling_factor={self.scaling_factor})"
+
+    def _thaw(self) -> "Material":
+        """Mutable copy, used to derive a new Material."""
+        copy = object.__new__(Material)
+        copy.__dict__.update(self.__dict__)
+        copy.__dict__.pop("_hash", None)
+        copy.__dict__.update(
+            _frozen=False,
+            _conflicts=list(self._conflicts),
+            initial_baseline=dict(self.initial_baseline),
+            scaled_baseline=dict(self.scaled_baseline),
+        )
+        return copy
 
     def to_dict(self) -> Dict[str, Optional[float]]:
         return {name: getattr(self, name) for name in VARS}
 
+    def derived_bits(self) -> int:
+        """Bits of the VARS known once the rules have run on this material."""
+        if self._derived is not None:
+            return sum(1 << i for i, v in enumerate(self._derived) if v is not None)
+        pattern = sum(
+            1 << i for i, name in enumerate(VARS) if getattr(self, name) is not None
+        )
+        return derivable_bits(pattern)
+
+    @classmethod
+    def with_derivation(
+        cls, derived: Sequence[Optional[float]], **kwargs
+    ) -> "Material":
+        """
+        A Material whose rule propagation was already run, e.g. by
+        :func:`propagate_rules`; ``derived`` holds all VARS after it.
+        """
+        material = cls(**kwargs)
+        object.__setattr__(material, "_derived", tuple(derived))
+        return material
+
     def _compute(self) -> "Material":
+        if self._derived is not None:
+            for name, value in zip(VARS, self._derived):
+                setattr(self, name, value)
+            self._derived = None
+            self._conflicts.clear()
+            return
+
+        vals = [getattr(self, name) for name in VARS]
+        pattern = 0
+        for i, v in enumerate(vals):
+            if v is not None:
+                pattern |= 1 << i
+        conflicts = []
+        derived = []
+        for target, op, operands, assign in _derivation_plan(pattern):
+            if op is RuleMode.PRODUCT:
+                cand = 1.0
+                for i in operands:
+                    cand *= vals[i]
+            else:
+                denom = 1.0
+                for i in operands[1:]:
+                    denom *= vals[i]
+                if abs(denom) <= _TOL_ABS:
+                    return self._compute_queued()
+                cand = float(vals[operands[0]]) / denom
+            if assign:
+                vals[target] = cand
+                derived.append(target)
+            elif not _is_close(vals[target], cand):
+                conflicts.append(
+                    (
+                        VARS[target],
+                        float(vals[target]),
+                        float(cand),
+                        tuple(VARS[i] for i in operands),
+                    )
+                )
+        self._conflicts[:] = conflicts
+        for i in derived:
+            setattr(self, VARS[i], vals[i])
+
+    def _compute_queued(self) -> "Material":
+        """Rule-queue propagation, used when a plan meets a zero denominator."""
         vals = [getattr(self, name) for name in VARS]
         known = [v is not None for v in vals]
         queue = [i for i, k in enumerate(known) if k]
@@ -223,17 +480,26 @@ class Material:
                 setattr(self, VARS[ru.target], cand)
                 queue.append(ru.target)
 
+    def _known_scaled(self) -> List[str]:
+        return [name for name in VARS if self.scaled_baseline.get(name) is not None]
+
     def _clean(self, targets: Dict[str, float]) -> "Material":
         if self._conflicts is None:
             return self
 
-        known_vars = [
-            name for name in VARS if self.scaled_baseline.get(name) is not None
-        ]
+        known_vars = self._known_scaled()
         internal_idxs = {name: i for i, name in enumerate(known_vars)}
         y = _project_logs_onto_eq(self.scaled_baseline, targets, internal_idxs)
+        self._apply_projection(known_vars, y)
+
+    def _assign(self, row: np.ndarray) -> None:
+        """Set all VARS from a conflict-free :func:`propagate_rules` row."""
+        for name, value in zip(VARS, row.tolist()):
+            setattr(self, name, None if np.isnan(value) else value)
+        self._conflicts.clear()
 
-        for name, idx in internal_idxs.items():
+    def _apply_projection(self, known_vars: List[str], y: np.ndarray) -> None:
+        for idx, name in enumerate(known_vars):
             setattr(self, name, _round(float(np.exp(y[idx]))))
 
         self._compute()
@@ -248,6 +514,25 @@ class Material:
             )
 
     def rescale(self, targets: Dict[str, float]) -> "Material":
+        """
+        Return a copy rescaled to ``targets``; ``self`` is left unchanged.
+
+        Results, and ValueError messages, are memoized per (material,
+        targets) in a bounded LRU, so products sharing a declared unit reuse
+        them. Targets are applied in the caller's order.
+        """
+        rescaled, error = _rescale_cached(self, tuple(targets.items()))
+        if error is not None:
+            raise ValueError(error)
+        return rescaled
+
+    def _rescale(self, targets: Dict[str, float]) -> None:
+        targets = self._scale(targets)
+        if set(self._known_scaled()) != set(targets):
+            self._clean(targets)
+
+    def _scale(self, targets: Dict[str, float]) -> Dict[str, float]:
+        """Derive, scale to ``targets`` and record the scaled baseline."""
         targets = {k: v for k, v in targets.items() if v is not None}
 
         for field, value in targets.items():
@@ -291,7 +576,259 @@ class Material:
                 setattr(self, name, getattr(self, name) * self.scaling_factor)
 
         self.scaled_baseline = self.to_dict()
-        known_scaled = {k: v for k, v in self.scaled_baseline.items() if v is not None}
-        if set(known_scaled.keys()) == set(targets.keys()):
-            return self
-        self._clean(targets)
+        return targets
+
+
+def _propagate_row(row: np.ndarray) -> Tuple[np.ndarray, bool]:
+    material = Material(
+        **{name: None if np.isnan(v) else v for name, v in zip(VARS, row)}
+    )._thaw()
+    material._compute()
+    derived = [np.nan if v is None else v for v in material.to_dict().values()]
+    return np.asarray(derived, dtype=float), bool(material._conflicts)
+
+
+# below this many rows per pattern the scalar plan is faster than numpy
+_BATCH_MIN_ROWS = 6
+
+
+def propagate_rules(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batch ``Material._compute`` over an ``(N, len(VARS))`` array.
+
+    NaN and non-positive entries are unknown. Rows are grouped by their
+    known-variable pattern and each group replays the scalar propagation
+    order with array operations, so derived values are identical and
+    ``conflicts[i]`` is true exactly when the scalar pass records one. Rows
+    hitting a near-zero denominator, and patterns shared by fewer than
+    ``_BATCH_MIN_ROWS`` rows, are handed to the scalar path.
+
+    Returns ``(derived, conflicts)``; ``derived`` has NaN where a value
+    stays unknown.
+    """
+    source = np.asarray(values, dtype=float).reshape(-1, len(VARS))
+    vals = np.where(source > 0, source, np.nan)
+    conflicts = np.zeros(len(vals), dtype=bool)
+    bits = 1 << np.arange(len(VARS))
+    patterns = (~np.isnan(vals)).astype(np.int64) @ bits
+
+    order = np.argsort(patterns, kind="stable")
+    unique, starts = np.unique(patterns[order], return_index=True)
+    for pattern, rows in zip(unique, np.split(order, starts[1:])):
+        if len(rows) < _BATCH_MIN_ROWS:
+            for row in rows:
+                vals[row], conflicts[row] = _propagate_row(vals[row])
+            continue
+        with np.errstate(divide="ignore", invalid="ignore"):
+            block, clash, irregular = _replay_events(vals[rows], int(pattern))
+        vals[rows] = block
+        conflicts[rows] = clash
+        for row in rows[irregular]:
+            vals[row], conflicts[row] = _propagate_row(
+                np.where(source[row] > 0, source[row], np.nan)
+            )
+
+    return vals, conflicts
+
+
+def _replay_events(
+    block: np.ndarray, pattern: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Run the propagation events of ``pattern`` on rows sharing it."""
+    block = block.copy()
+    clash = np.zeros(len(block), dtype=bool)
+    irregular = np.zeros(len(block), dtype=bool)
+    for target, op, operands, assign in _derivation_plan(pattern):
+        if op is RuleMode.PRODUCT:
+            cand = block[:, operands[0]]
+            for i in operands[1:]:
+                cand = cand * block[:, i]
+        else:
+            nom_idx, *denom_idxs = operands
+            denom = np.ones(len(block))
+            for i in denom_idxs:
+                denom = denom * block[:, i]
+            irregular |= np.abs(denom) <= _TOL_ABS
+            cand = block[:, nom_idx] / denom
+        if assign:
+            block[:, target] = cand
+        else:
+            clash |= ~np.isclose(block[:, target], cand, rtol=_TOL_REL, atol=_TOL_ABS)
+    return block, clash, irregular
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _RescaleMemo:
+    """
+    Bounded LRU of rescale outcomes keyed by ``(material, targets)``, with
+    ``targets`` in the order they are applied. Failures are stored as their
+    message so each caller raises a fresh ``ValueError``.
+
+    Callable like an ``lru_cache`` wrapper, with ``cache_info`` and
+    ``cache_clear``; :func:`rescale_many` also reads and fills it directly.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __call__(
+        self, material: Material, targets: Tuple[Tuple[str, float], ...]
+    ) -> Tuple[Optional[Material], Optional[str]]:
+        outcome = self.get((material, targets))
+        if outcome is None:
+            outcome = _rescale_outcome(material, targets)
+            self.put((material, targets), outcome)
+        return outcome
+
+    def get(self, key):
+        with self._lock:
+            outcome = self._entries.get(key)
+            if outcome is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return outcome
+
+    def put(self, key, outcome) -> None:
+        with self._lock:
+            self._entries[key] = outcome
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = 0
+
+
+def _freeze(rescaled: Material) -> Tuple[Optional[Material], Optional[str]]:
+    rescaled._frozen = True
+    return rescaled, None
+
+
+def _rescale_outcome(
+    material: Material, targets: Tuple[Tuple[str, float], ...]
+) -> Tuple[Optional[Material], Optional[str]]:
+    rescaled = material._thaw()
+    try:
+        rescaled._rescale(dict(targets))
+    except ValueError as e:
+        return None, str(e)
+    return _freeze(rescaled)
+
+
+_rescale_cached = _RescaleMemo(RESCALE_CACHE_SIZE)
+
+
+def _derive_in_batch(materials: List[Material]) -> None:
+    """Pre-derive thawed materials with one :func:`propagate_rules` call."""
+    if not materials:
+        return
+    values = np.array(
+        [[np.nan if v is None else v for v in m.to_dict().values()] for m in materials],
+        dtype=float,
+    )
+    derived, _ = propagate_rules(values)
+    # non-positive values are unknown to the batch path but known to _compute
+    positive = (np.isnan(values) | (values > 0)).all(axis=1)
+    for material, row, ok in zip(materials, derived.tolist(), positive):
+        if ok and material._derived is None:
+            material._derived = tuple(None if np.isnan(v) else v for v in row)
+
+
+def rescale_many(
+    materials: Sequence[Material], targets: Dict[str, float]
+) -> List[Tuple[Optional[Material], Optional[str]]]:
+    """
+    Rescale ``materials`` to the same ``targets`` in one pass.
+
+    Returns one ``(rescaled, error message)`` pair per material and stores
+    them in the rescale memo, so later :meth:`Material.rescale` calls are
+    hits.
+    Materials needing a projection are grouped by (known variables,
+    targets) pattern; each group is projected with one stacked product
+    and re-derived with :func:`propagate_rules`.
+    """
+    key = tuple(targets.items())
+    outcomes: Dict[Material, Tuple[Optional[Material], Optional[str]]] = {}
+    misses: List[Material] = []
+    pending: Dict[Tuple, List[Tuple[Material, Material, Dict[str, float]]]] = {}
+
+    for material in dict.fromkeys(materials):
+        outcome = _rescale_cached.get((material, key))
+        if outcome is None:
+            misses.append(material)
+        else:
+            outcomes[material] = outcome
+
+    thawed = [material._thaw() for material in misses]
+    _derive_in_batch(thawed)
+    for material, rescaled in zip(misses, thawed):
+        try:
+            scaled_targets = rescaled._scale(dict(key))
+        except ValueError as e:
+            outcomes[material] = (None, str(e))
+            continue
+        known = rescaled._known_scaled()
+        if set(known) == set(scaled_targets):
+            outcomes[material] = _freeze(rescaled)
+            continue
+        pattern = (
+            tuple(NAME_TO_IDX[name] for name in known),
+            tuple(known.index(name) for name in scaled_targets),
+        )
+        pending.setdefault(pattern, []).append((material, rescaled, scaled_targets))
+
+    for (known, fixed), group in pending.items():
+        if len(group) < _BATCH_MIN_ROWS:
+            for material, rescaled, scaled_targets in group:
+                try:
+                    rescaled._clean(scaled_targets)
+                except ValueError as e:
+                    outcomes[material] = (None, str(e))
+                else:
+                    outcomes[material] = _freeze(rescaled)
+            continue
+
+        B, T = _projection_operator(known, fixed)
+        base_logs = np.log(
+            [[r.scaled_baseline[VARS[i]] for i in known] for _, r, _ in group]
+        )
+        target_logs = np.log([list(t.values()) for _, _, t in group])
+        logs = base_logs @ B.T + target_logs @ T.T
+        values = np.full((len(group), len(VARS)), np.nan)
+        values[:, known] = [[_round(v) for v in row] for row in np.exp(logs).tolist()]
+        derived, conflicts = propagate_rules(values)
+        regular = ~conflicts & (values[:, known] > 0).all(axis=1)
+
+        names = [VARS[i] for i in known]
+        for (material, rescaled, _), y, row, ok in zip(group, logs, derived, regular):
+            try:
+                if ok:
+                    rescaled._assign(row)
+                else:
+                    rescaled._apply_projection(names, y)
+            except ValueError as e:
+                outcomes[material] = (None, str(e))
+            else:
+                outcomes[material] = _freeze(rescaled)
+
+    for material in misses:
+        _rescale_cached.put((material, key), outcomes[material])
+    return [outcomes[material] for material in materials]
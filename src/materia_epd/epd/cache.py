@@ -6,10 +6,14 @@ import json
 import logging
 import multiprocessing
 import os
+import time
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from pathlib import Path
+from functools import partial
+from pathlib import Path, PureWindowsPath
+from typing import Callable
 
 import pandas as pd
 import structlog
@@ -23,20 +27,51 @@ from rich.progress import (
     track,
 )
 
-from materia_epd.core.constants import PROPERTIES, QUANTITIES
-from materia_epd.epd.extract import extract_epd_record
+from materia_epd.core.constants import PROPERTIES, QUANTITIES, REASONABLE_RANGES
+from materia_epd.core.physics import check_properties_ranges
+from materia_epd.epd.corpus import EpdCorpus
+from materia_epd.epd.extract import (
+    extract_flow_record,
+    extract_process_record,
+    flow_failure_for_process,
+)
 from materia_epd.epd.extraction_errors import EpdExtractionError
-from materia_epd.epd.models import IlcdProcess
+from materia_epd.epd.extraction_timings import (
+    PhaseTimer,
+    print_timing_report,
+    summarize_extraction_timings,
+)
+from materia_epd.epd.workers import init_extraction_worker, summarize_worker_startup
+from materia_epd.io.archives import (
+    XmlPrefetcher,
+    XmlSource,
+    ZipMember,
+    as_xml_source,
+    index_latest_flow_members,
+    is_zip_source,
+    list_xml_members,
+    serve_prefetched,
+    zip_fingerprints,
+)
+from materia_epd.io.files import index_latest_flow_files
 
 logger = structlog.wrap_logger(logging.getLogger(__name__))
 
 DEFAULT_CACHE_DIR_NAME = ".materia_epd_cache"
-CACHE_FORMAT_VERSION = 1
+CACHE_FORMAT_VERSION = 3
 PROCESSES_FEATHER = "processes.feather"
+FLOWS_FEATHER = "flows.feather"
 LCIA_FEATHER = "lcia.feather"
 MANIFEST_JSON = "manifest.json"
 
+# Sequential extraction reads this many upcoming files ahead on I/O threads.
+PREFETCH_READ_AHEAD = 16
+PREFETCH_THREADS = 4
+
 MATERIAL_COLUMNS = list(QUANTITIES) + list(PROPERTIES)
+FLOW_METADATA_COLUMNS = ["ref_flow_property", "declared_unit"]
+# Product metadata; nested values are stored as JSON strings.
+PROCESS_METADATA_COLUMNS = ["base_names", "hs_classes", *FLOW_METADATA_COLUMNS]
 
 
 class CacheError(Exception):
@@ -54,7 +89,10 @@ def resolve_cache_dir(epd_cache: Path | None) -> Path:
 
 
 def cache_exists(cache_dir: Path) -> bool:
-    return all((cache_dir / name).exists() for name in (PROCESSES_FEATHER, LCIA_FEATHER, MANIFEST_JSON))
+    return all(
+        (cache_dir / name).exists()
+        for name in (PROCESSES_FEATHER, FLOWS_FEATHER, LCIA_FEATHER, MANIFEST_JSON)
+    )
 
 
 def _fingerprint_file(path: Path) -> dict:
@@ -63,17 +101,37 @@ def _fingerprint_file(path: Path) -> dict:
 
 
 def _collect_source_fingerprints(epd_folder: Path) -> dict[str, dict]:
+    if is_zip_source(epd_folder):
+        return zip_fingerprints(epd_folder)
     fingerprints: dict[str, dict] = {}
     for sub in ("processes", "flows"):
         folder = epd_folder / sub
         if not folder.is_dir():
             continue
         for xml_file in sorted(folder.glob("*.xml")):
-            rel = str(xml_file.relative_to(epd_folder))
+            rel = xml_file.relative_to(epd_folder).as_posix()
             fingerprints[rel] = _fingerprint_file(xml_file)
     return fingerprints
 
 
+def _list_xml_sources(epd_folder: Path, folder: str) -> list[XmlSource]:
+    """XML files of ``folder`` in an EPD directory or ILCD ZIP export."""
+    if is_zip_source(epd_folder):
+        return list_xml_members(epd_folder, folder)
+    return sorted((epd_folder / folder).glob("*.xml"))
+
+
+def _index_latest_flows(epd_folder: Path) -> dict[str, XmlSource]:
+    if is_zip_source(epd_folder):
+        return index_latest_flow_members(epd_folder)
+    return index_latest_flow_files(epd_folder / "flows")
+
+
+def _worker_arg(source: XmlSource) -> str | ZipMember:
+    """Absolute str path (Windows spawn) or the picklable ZIP member itself."""
+    return source if isinstance(source, ZipMember) else str(source.resolve())
+
+
 def _read_manifest(cache_dir: Path) -> dict | None:
     path = cache_dir / MANIFEST_JSON
     try:
@@ -101,7 +159,7 @@ def _should_use_parallel(num_files: int, workers: int) -> bool:
 
 def _record_extraction_failure(
     failures: list[dict],
-    process_path: Path,
+    source_path: XmlSource,
     exc: Exception,
 ) -> None:
     if isinstance(exc, EpdExtractionError):
@@ -110,91 +168,116 @@ def _record_extraction_failure(
 
     failures.append(
         {
-            "file": process_path.name,
-            "process_path": str(process_path),
+            "file": source_path.name,
+            "process_path": str(source_path),
             "stage": "extract_epd_record",
             "error": str(exc),
             "cause_type": type(exc).__name__,
-            "detail": f"{process_path.name} [extract_epd_record] {exc}",
+            "detail": f"{source_path.name} [extract_epd_record] {exc}",
         }
     )
 
 
+FailureHandler = Callable[[list, XmlSource, Exception], None]
+
+
 def _log_extraction_failures(failures: list[dict]) -> None:
     for failure in failures:
         logger.warning("Failed to extract EPD", **failure)
 
 
 def _retry_paths_sequential(
-    process_paths: list[str],
-    flows_folder: str,
+    paths: list[str | ZipMember],
+    worker: Callable[[str | ZipMember], dict],
     records: list[dict],
-    failures: list[dict],
+    failures: list,
     *,
     reason: str,
+    description: str = "Extracting EPDs",
     progress: Progress | None = None,
     task_id: int | None = None,
     verbose: bool = False,
+    on_failure: FailureHandler = _record_extraction_failure,
 ) -> None:
-    if not process_paths:
+    if not paths:
         return
     logger.warning(
         "Retrying EPD extraction sequentially after parallel worker failure",
         reason=reason,
-        file_count=len(process_paths),
+        file_count=len(paths),
     )
-    for path_str in process_paths:
-        path = Path(path_str)
+    for path_str in paths:
+        path = as_xml_source(path_str)
         try:
-            records.append(extract_epd_record(path_str, flows_folder))
+            records.append(worker(path_str))
         except Exception as exc:
-            _record_extraction_failure(failures, path, exc)
+            on_failure(failures, path, exc)
         if progress is not None and task_id is not None:
             if verbose:
                 progress.update(
                     task_id,
-                    description=f"Extracting EPDs — {path.name}",
+                    description=f"{description} — {path.name}",
                 )
             progress.advance(task_id)
 
 
 def _extract_sequential(
-    process_paths: list[Path],
-    flows_folder: str,
+    paths: list[str | ZipMember],
+    worker: Callable[[str | ZipMember], dict],
     *,
+    description: str,
     disable_progress: bool,
     verbose: bool,
-) -> tuple[list[dict], list[dict]]:
+    on_failure: FailureHandler = _record_extraction_failure,
+    read_ahead: int = PREFETCH_READ_AHEAD,
+) -> tuple[list[dict], list]:
+    """
+    Extract paths one by one in this process.
+
+    With ``read_ahead > 0`` the bytes of upcoming files are read on a small
+    thread pool while the current one is parsed, hiding storage latency.
+    """
     records: list[dict] = []
-    failures: list[dict] = []
-    iterator = process_paths
+    failures: list = []
+    iterator = (
+        XmlPrefetcher(paths, threads=PREFETCH_THREADS, read_ahead=read_ahead)
+        if read_ahead > 0 and len(paths) > 1
+        else ((path_str, None) for path_str in paths)
+    )
     if not disable_progress:
         iterator = track(
-            process_paths,
-            description="Extracting EPDs",
-            transient=True,
+            iterator, description=description, total=len(paths), transient=True
         )
-    for path in iterator:
+    for path_str, data in iterator:
         try:
-            records.append(extract_epd_record(str(path.resolve()), flows_folder))
+            with serve_prefetched(path_str, data):
+                records.append(worker(path_str))
         except Exception as exc:
-            _record_extraction_failure(failures, path, exc)
+            on_failure(failures, as_xml_source(path_str), exc)
     return records, failures
 
 
 def _extract_parallel(
-    process_paths: list[Path],
-    flows_folder: str,
+    paths: list[str | ZipMember],
+    worker: Callable[[str | ZipMember], dict],
     workers: int,
     *,
+    description: str,
     disable_progress: bool,
     verbose: bool,
-) -> tuple[list[dict], list[dict]]:
+    on_failure: FailureHandler = _record_extraction_failure,
+    worker_startup: list[dict] | None = None,
+) -> tuple[list[dict], list]:
+    """
+    Extract paths on a process pool whose workers are pre-warmed once.
+
+    Start-up reports of the workers are appended to ``worker_startup``.
+    """
     records: list[dict] = []
-    failures: list[dict] = []
+    failures: list = []
     mp_context = multiprocessing.get_context()
-    path_strs = [str(p.resolve()) for p in process_paths]
-    completed: set[str] = set()
+    completed: set[str | ZipMember] = set()
+    startup_queue = mp_context.SimpleQueue()
 
     progress_columns = [
         SpinnerColumn(),
@@ -207,12 +290,12 @@ def _extract_parallel(
 
     def _run_pool(progress: Progress | None, task_id: int | None) -> None:
         with ProcessPoolExecutor(
-            max_workers=workers, mp_context=mp_context
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=init_extraction_worker,
+            initargs=(startup_queue, time.time()),
         ) as executor:
-            futures = {
-                executor.submit(extract_epd_record, p, flows_folder): p
-                for p in path_strs
-            }
+            futures = {executor.submit(worker, p): p for p in paths}
             try:
                 for future in as_completed(futures):
                     source = futures[future]
@@ -222,29 +305,33 @@ def _extract_parallel(
                     except BrokenProcessPool:
                         raise
                     except Exception as exc:
-                        _record_extraction_failure(failures, Path(source), exc)
+                        on_failure(failures, as_xml_source(source), exc)
                         completed.add(source)
                     if progress is not None and task_id is not None:
                         if verbose:
                             progress.update(
                                 task_id,
-                                description=f"Extracting EPDs — {Path(source).name}",
+                                description=(
+                                    f"{description} — {as_xml_source(source).name}"
+                                ),
                             )
                         progress.advance(task_id)
             except BrokenProcessPool:
-                pending = [p for p in path_strs if p not in completed]
+                pending = [p for p in paths if p not in completed]
                 _retry_paths_sequential(
                     pending,
-                    flows_folder,
+                    worker,
                     records,
                     failures,
                     reason=(
                         "A worker process was terminated abruptly "
                         "(often caused by memory pressure)."
                     ),
+                    description=description,
                     progress=progress,
                     task_id=task_id,
                     verbose=verbose,
+                    on_failure=on_failure,
                 )
                 completed.update(pending)
 
@@ -252,29 +339,283 @@ def _extract_parallel(
         _run_pool(None, None)
     else:
         with Progress(*progress_columns, transient=True) as progress:
-            task_id = progress.add_task("Extracting EPDs", total=len(path_strs))
+            task_id = progress.add_task(description, total=len(paths))
             _run_pool(progress, task_id)
 
+    startup: list[dict] = []
+    while not startup_queue.empty():
+        startup.append(startup_queue.get())
+    startup_queue.close()
+    if worker_startup is not None:
+        worker_startup.extend(startup)
+    logger.debug(
+        "Extraction workers started",
+        description=description,
+        **summarize_worker_startup(startup),
+    )
     return records, failures
 
 
-def _records_to_frames(records: list[dict]) -> tuple[pd.DataFrame, pd.DataFrame]:
-    process_rows = []
-    lcia_rows = []
+def _extract_records(
+    paths: list[str | ZipMember],
+    worker: Callable[[str | ZipMember], dict],
+    worker_count: int,
+    *,
+    description: str,
+    disable_progress: bool,
+    verbose: bool,
+    on_failure: FailureHandler = _record_extraction_failure,
+    worker_startup: list[dict] | None = None,
+) -> tuple[list[dict], list]:
+    if _should_use_parallel(len(paths), worker_count):
+        return _extract_parallel(
+            paths,
+            worker,
+            worker_count,
+            description=description,
+            disable_progress=disable_progress,
+            verbose=verbose,
+            on_failure=on_failure,
+            worker_startup=worker_startup,
+        )
+    return _extract_sequential(
+        paths,
+        worker,
+        description=description,
+        disable_progress=disable_progress,
+        verbose=verbose,
+        on_failure=on_failure,
+    )
 
-    for rec in records:
-        if not rec.get("uuid"):
-            continue
+
+def _keep_flow_error(failures: list, flow_path: XmlSource, exc: Exception) -> None:
+    """Keep flow errors as exceptions; they are attributed to processes on join."""
+    if not isinstance(exc, EpdExtractionError):
+        exc = EpdExtractionError(
+            process_path=str(flow_path),
+            stage="extract_flow_record",
+            message=str(exc),
+            flow_path=str(flow_path),
+            cause_type=type(exc).__name__,
+        )
+    failures.append(exc)
+
+
+def _flow_records_to_frame(flow_records: list[dict]) -> pd.DataFrame:
+    rows = []
+    for rec in flow_records:
         row = {
-            "uuid": rec["uuid"],
-            "loc": rec.get("loc"),
-            "ref_flow_uuid": rec.get("ref_flow_uuid"),
-            "source_path": rec.get("source_path"),
+            "flow_uuid": rec["flow_uuid"],
+            "version": rec.get("version"),
+            "source_path": rec["source_path"],
+            **{col: rec.get(col) for col in FLOW_METADATA_COLUMNS},
         }
-        for col in MATERIAL_COLUMNS:
-            row[col] = rec.get("material_kwargs", {}).get(col)
-        process_rows.append(row)
+        for col in QUANTITIES:
+            row[col] = rec["quantities"].get(col)
+        for col in PROPERTIES:
+            row[col] = rec["properties"].get(col)
+        rows.append(row)
+    return pd.DataFrame(
+        rows,
+        columns=[
+            "flow_uuid",
+            "version",
+            "source_path",
+            *FLOW_METADATA_COLUMNS,
+            *MATERIAL_COLUMNS,
+        ],
+    ).astype({col: "float64" for col in MATERIAL_COLUMNS})
+
+
+def _load_reusable_flows(
+    cache_dir: Path, epd_folder: Path, fingerprints: dict[str, dict]
+) -> pd.DataFrame | None:
+    """Return flow rows from a previous cache whose source files are unchanged."""
+    manifest = _read_manifest(cache_dir)
+    if manifest is None or manifest.get("format_version") != CACHE_FORMAT_VERSION:
+        return None
+    if Path(manifest.get("source_dir", "")).resolve() != epd_folder.resolve():
+        return None
+    try:
+        flows_df = pd.read_feather(cache_dir / FLOWS_FEATHER)
+    except (OSError, ValueError):
+        return None
+
+    # manifests written before keys were posix hold backslashes on Windows
+    previous = {
+        PureWindowsPath(rel).as_posix(): fp
+        for rel, fp in manifest.get("files", {}).items()
+    }
+    unchanged = {
+        rel.split("/", 1)[1]
+        for rel, fp in fingerprints.items()
+        if rel.startswith("flows/") and previous.get(rel) == fp
+    }
+    return flows_df[flows_df["source_path"].isin(unchanged)]
+
+
+def _extract_flows(
+    flow_files: dict[str, XmlSource],
+    reusable: pd.DataFrame | None,
+    worker_count: int,
+    *,
+    disable_progress: bool,
+    verbose: bool,
+    timings: dict[str, dict[str, float]] | None = None,
+    worker_startup: list[dict] | None = None,
+) -> tuple[pd.DataFrame, dict[str, EpdExtractionError]]:
+    """
+    Extract the given flows, reusing unchanged rows from a previous build.
+
+    When ``timings`` is a dict, per-phase seconds of each parsed flow are
+    stored in it under ``flows/<file name>``.
+    """
+    reused = pd.DataFrame()
+    if reusable is not None and not reusable.empty:
+        wanted = {path.name for path in flow_files.values()}
+        reused = reusable[reusable["source_path"].isin(wanted)]
+
+    reused_names = set(reused["source_path"]) if not reused.empty else set()
+    to_parse = sorted(
+        (
+            _worker_arg(path)
+            for path in flow_files.values()
+            if path.name not in reused_names
+        ),
+        key=str,
+    )
+    flow_records, flow_errors = _extract_records(
+        to_parse,
+        (
+            partial(extract_flow_record, timings=True)
+            if timings is not None
+            else extract_flow_record
+        ),
+        worker_count,
+        description="Extracting flows",
+        disable_progress=disable_progress,
+        verbose=verbose,
+        on_failure=_keep_flow_error,
+        worker_startup=worker_startup,
+    )
+    logger.debug(
+        "EPD flows extracted",
+        parsed=len(to_parse),
+        reused=len(reused),
+        failures=len(flow_errors),
+    )
+
+    if timings is not None:
+        for rec in flow_records:
+            timings[f"flows/{rec['source_path']}"] = rec.get("timings", {})
 
+    parsed = _flow_records_to_frame(flow_records)
+    flows_df = (
+        pd.concat([reused, parsed], ignore_index=True) if not reused.empty else parsed
+    )
+    errors_by_file = {Path(err.process_path).name: err for err in flow_errors}
+    errors = {
+        uuid: errors_by_file[path.name]
+        for uuid, path in flow_files.items()
+        if path.name in errors_by_file
+    }
+    return flows_df.reset_index(drop=True), errors
+
+
+def _apply_range_checks(processes_df: pd.DataFrame) -> None:
+    """Run :func:`check_properties_ranges` only on rows with out-of-range values."""
+    out_of_range = pd.Series(False, index=processes_df.index)
+    for col in MATERIAL_COLUMNS:
+        low, high = REASONABLE_RANGES[col]
+        values = processes_df[col]
+        out_of_range |= values.notna() & ((values < low) | (values > high))
+
+    for idx in processes_df.index[out_of_range]:
+        kwargs = {
+            col: (None if pd.isna(v) else float(v))
+            for col, v in processes_df.loc[idx, MATERIAL_COLUMNS].items()
+        }
+        checked = check_properties_ranges(processes_df.at[idx, "uuid"], kwargs)
+        for col, value in checked.items():
+            processes_df.at[idx, col] = value
+
+
+def _join_processes_to_flows(
+    process_records: list[dict],
+    flows_df: pd.DataFrame,
+    flow_errors: dict[str, EpdExtractionError],
+    processes_dir: Path,
+    stage_timer: PhaseTimer | None = None,
+) -> tuple[pd.DataFrame, list[dict]]:
+    """Attach per-EPD material columns by joining processes to their flow rows."""
+    stage_timer = stage_timer or PhaseTimer(enabled=False)
+    failures: list[dict] = []
+    columns = ["uuid", "loc", "ref_flow_uuid", "exchange_amount", "source_path"]
+    proc_df = pd.DataFrame(
+        [
+            {
+                **{col: rec.get(col) for col in columns},
+                "base_names": json.dumps(rec.get("base_names") or {}),
+                "hs_classes": json.dumps(rec.get("hs_classes") or []),
+            }
+            for rec in process_records
+            if rec.get("uuid")
+        ],
+        columns=[*columns, "base_names", "hs_classes"],
+    )
+
+    flow_cols = flows_df.rename(columns={"source_path": "flow_source_path"})
+    merged = proc_df.merge(
+        flow_cols.drop(columns=["version"]),
+        how="left",
+        left_on="ref_flow_uuid",
+        right_on="flow_uuid",
+        validate="many_to_one",
+    )
+
+    unresolved = merged["flow_source_path"].isna()
+    for row in merged[unresolved].itertuples(index=False):
+        process_path = processes_dir / row.source_path
+        flow_error = flow_errors.get(row.ref_flow_uuid)
+        if flow_error is not None:
+            err = flow_failure_for_process(flow_error, process_path, row.uuid)
+        else:
+            err = EpdExtractionError(
+                process_path=str(process_path),
+                stage="parse_reference_flow",
+                message=(
+                    f"No flow file found for uuid={row.ref_flow_uuid} "
+                    f"in {processes_dir.parent / 'flows'}"
+                ),
+                process_uuid=row.uuid,
+            )
+        failures.append(err.to_log_dict())
+
+    merged = merged[~unresolved].reset_index(drop=True)
+    for col in QUANTITIES:
+        merged[col] = merged[col] * merged["exchange_amount"]
+    stage_timer.lap("join")
+    _apply_range_checks(merged)
+    stage_timer.lap("range_checks")
+
+    processes_df = merged[
+        [
+            "uuid",
+            "loc",
+            "ref_flow_uuid",
+            "source_path",
+            *PROCESS_METADATA_COLUMNS,
+            *MATERIAL_COLUMNS,
+        ]
+    ]
+    return processes_df, failures
+
+
+def _lcia_records_to_frame(records: list[dict], uuids: set[str]) -> pd.DataFrame:
+    lcia_rows = []
+    for rec in records:
+        if rec.get("uuid") not in uuids:
+            continue
         for indicator, modules in rec.get("raw_lcia", {}).items():
             for module, value in modules.items():
                 if value is not None:
@@ -286,20 +627,20 @@ def _records_to_frames(records: list[dict]) -> tuple[pd.DataFrame, pd.DataFrame]
                             "value": float(value),
                         }
                     )
-
-    processes_df = pd.DataFrame(process_rows)
-    lcia_df = pd.DataFrame(lcia_rows)
-    return processes_df, lcia_df
+    return pd.DataFrame(lcia_rows)
 
 
 def _write_cache_artifacts(
     cache_dir: Path,
     epd_folder: Path,
     processes_df: pd.DataFrame,
+    flows_df: pd.DataFrame,
     lcia_df: pd.DataFrame,
+    fingerprints: dict[str, dict],
     *,
     console: Console | None,
     disable_progress: bool,
+    timings: dict | None = None,
 ) -> None:
     cache_dir.mkdir(parents=True, exist_ok=True)
     out = console or Console()
@@ -308,6 +649,10 @@ def _write_cache_artifacts(
         out.print("[dim]Writing processes.feather…[/dim]")
     processes_df.to_feather(cache_dir / PROCESSES_FEATHER)
 
+    if not disable_progress:
+        out.print("[dim]Writing flows.feather…[/dim]")
+    flows_df.to_feather(cache_dir / FLOWS_FEATHER)
+
     if not disable_progress:
         out.print("[dim]Writing lcia.feather…[/dim]")
     lcia_df.to_feather(cache_dir / LCIA_FEATHER)
@@ -316,29 +661,37 @@ def _write_cache_artifacts(
         "format_version": CACHE_FORMAT_VERSION,
         "created_at": datetime.now(timezone.utc).isoformat(),
         "source_dir": str(epd_folder.resolve()),
-        "files": _collect_source_fingerprints(epd_folder),
+        "files": fingerprints,
         "counts": {
             "processes": len(processes_df),
+            "flows": len(flows_df),
             "lcia_rows": len(lcia_df),
         },
     }
+    if timings is not None:
+        manifest["timings"] = timings
     if not disable_progress:
         out.print("[dim]Writing manifest.json…[/dim]")
     with open(cache_dir / MANIFEST_JSON, "w", encoding="utf-8") as f:
         json.dump(manifest, f, indent=2)
 
 
-def build_epd_cache(
-    epd_folder: Path,
-    cache_dir: Path,
-    *,
-    force: bool = False,
-    workers: int | None = None,
-    console: Console | None = None,
-    disable_progress: bool = False,
-    verbose: bool = False,
-) -> Path:
-    """Build or rebuild the Feather cache for an EPD folder."""
+@dataclass
+class ExtractedCorpus:
+    """Tables produced by one extraction run, before they are written."""
+
+    processes: pd.DataFrame
+    flows: pd.DataFrame
+    lcia: pd.DataFrame
+    failures: list[dict]
+    fingerprints: dict[str, dict] = field(default_factory=dict)
+    worker_startup: list[dict] = field(default_factory=list)
+    timing_summary: dict | None = None
+
+
+def _check_epd_source(epd_folder: Path) -> None:
+    if is_zip_source(epd_folder):
+        return
     processes_dir = epd_folder / "processes"
     flows_dir = epd_folder / "flows"
     if not processes_dir.is_dir():
@@ -346,59 +699,172 @@ def build_epd_cache(
     if not flows_dir.is_dir():
         raise CacheError(f"EPD flows folder not found: {flows_dir}")
 
-    if cache_exists(cache_dir) and not force and is_cache_valid(cache_dir, epd_folder):
-        logger.info("EPD cache is already up to date", cache_dir=str(cache_dir))
-        return cache_dir
 
-    process_paths = sorted(processes_dir.glob("*.xml"))
+def extract_epd_corpus(
+    epd_folder: Path,
+    *,
+    cache_dir: Path | None = None,
+    workers: int | None = None,
+    disable_progress: bool = False,
+    verbose: bool = False,
+    timings: bool = False,
+) -> ExtractedCorpus:
+    """
+    Extract processes, flows and LCIA tables from an EPD source in memory.
+
+    With a ``cache_dir`` the source is fingerprinted and unchanged flow rows
+    of the previous cache there are reused; nothing is written.
+    """
+    _check_epd_source(epd_folder)
+    processes_dir = epd_folder / "processes"
+    process_paths = _list_xml_sources(epd_folder, "processes")
     if not process_paths:
         raise CacheError(f"No process XML files found in {processes_dir}")
 
     worker_count = workers if workers is not None else (os.cpu_count() or 1)
-    flows_folder = str(flows_dir.resolve())
+    stage_timer = PhaseTimer(timings)
+    fingerprints: dict[str, dict] = {}
+    reusable_flows = None
+    if cache_dir is not None:
+        fingerprints = _collect_source_fingerprints(epd_folder)
+        reusable_flows = _load_reusable_flows(cache_dir, epd_folder, fingerprints)
+        stage_timer.lap("fingerprint")
+
+    worker_startup: list[dict] = []
+    process_records, failures = _extract_records(
+        [_worker_arg(p) for p in process_paths],
+        (
+            partial(extract_process_record, timings=True)
+            if timings
+            else extract_process_record
+        ),
+        worker_count,
+        description="Extracting EPDs",
+        disable_progress=disable_progress,
+        verbose=verbose,
+        worker_startup=worker_startup,
+    )
+    stage_timer.lap("extract_processes")
 
-    if _should_use_parallel(len(process_paths), worker_count):
-        records, failures = _extract_parallel(
-            process_paths,
-            flows_folder,
-            worker_count,
-            disable_progress=disable_progress,
-            verbose=verbose,
-        )
-    else:
-        records, failures = _extract_sequential(
-            process_paths,
-            flows_folder,
-            disable_progress=disable_progress,
-            verbose=verbose,
+    latest_flows = _index_latest_flows(epd_folder)
+    referenced = {rec["ref_flow_uuid"] for rec in process_records}
+    wanted_flows = {
+        uuid: path for uuid, path in latest_flows.items() if uuid in referenced
+    }
+    stage_timer.lap("flow_lookup")
+
+    file_timings: dict[str, dict[str, float]] | None = {} if timings else None
+    flows_df, flow_errors = _extract_flows(
+        wanted_flows,
+        reusable_flows,
+        worker_count,
+        disable_progress=disable_progress,
+        verbose=verbose,
+        timings=file_timings,
+        worker_startup=worker_startup,
+    )
+    stage_timer.lap("extract_flows")
+
+    processes_df, join_failures = _join_processes_to_flows(
+        process_records, flows_df, flow_errors, processes_dir, stage_timer
+    )
+    failures.extend(join_failures)
+
+    lcia_df = _lcia_records_to_frame(process_records, set(processes_df["uuid"]))
+    stage_timer.lap("lcia_frame")
+
+    timing_summary = None
+    if timings:
+        parsed_flows = len(file_timings)
+        for rec in process_records:
+            file_timings[f"processes/{rec['source_path']}"] = rec.get("timings", {})
+        timing_summary = summarize_extraction_timings(
+            file_timings,
+            stage_timer.phases,
+            {
+                "fingerprint": len(fingerprints),
+                "extract_processes": len(process_paths),
+                "flow_lookup": len(latest_flows),
+                "extract_flows": parsed_flows,
+                "join": len(process_records),
+                "range_checks": len(processes_df),
+            },
         )
+        timing_summary["workers"] = summarize_worker_startup(worker_startup)
+
+    return ExtractedCorpus(
+        processes=processes_df,
+        flows=flows_df,
+        lcia=lcia_df,
+        failures=failures,
+        fingerprints=fingerprints,
+        worker_startup=worker_startup,
+        timing_summary=timing_summary,
+    )
+
+
+def build_epd_cache(
+    epd_folder: Path,
+    cache_dir: Path,
+    *,
+    force: bool = False,
+    workers: int | None = None,
+    console: Console | None = None,
+    disable_progress: bool = False,
+    verbose: bool = False,
+    timings: bool = False,
+) -> Path:
+    """
+    Build or rebuild the Feather cache for an EPD folder or ILCD ZIP export.
+
+    With ``timings=True`` every file records per-phase durations; the
+    aggregated summary (percentiles, histograms, slowest files and stage
+    throughput) is printed and stored under ``"timings"`` in the manifest.
+    """
+    _check_epd_source(epd_folder)
+    if cache_exists(cache_dir) and not force and is_cache_valid(cache_dir, epd_folder):
+        logger.info("EPD cache is already up to date", cache_dir=str(cache_dir))
+        return cache_dir
 
-    _log_extraction_failures(failures)
+    corpus = extract_epd_corpus(
+        epd_folder,
+        cache_dir=cache_dir,
+        workers=workers,
+        disable_progress=disable_progress,
+        verbose=verbose,
+        timings=timings,
+    )
+    _log_extraction_failures(corpus.failures)
 
-    if not records:
+    if corpus.processes.empty:
         raise CacheError("No EPD records could be extracted from source folder.")
 
-    processes_df, lcia_df = _records_to_frames(records)
     _write_cache_artifacts(
         cache_dir,
         epd_folder,
-        processes_df,
-        lcia_df,
+        corpus.processes,
+        corpus.flows,
+        corpus.lcia,
+        corpus.fingerprints,
         console=console,
         disable_progress=disable_progress,
+        timings=corpus.timing_summary,
     )
+    if corpus.timing_summary is not None:
+        print_timing_report(corpus.timing_summary, console)
 
     logger.info(
         "EPD cache built",
         cache_dir=str(cache_dir),
-        processes=len(processes_df),
-        failures=len(failures),
+        processes=len(corpus.processes),
+        failures=len(corpus.failures),
+        worker_startup=summarize_worker_startup(corpus.worker_startup),
     )
     return cache_dir
 
 
-def load_epds_from_cache(cache_dir: Path, epd_folder: Path) -> list[IlcdProcess]:
-    """Load IlcdProcess instances from a validated Feather cache."""
+def load_epds_from_cache(cache_dir: Path, epd_folder: Path) -> EpdCorpus:
+    """Load the EPD corpus from a validated Feather cache."""
     if not is_cache_valid(cache_dir, epd_folder):
         raise CacheError(
             f"EPD cache at {cache_dir} is missing or stale for {epd_folder}"
@@ -406,26 +872,27 @@ def load_epds_from_cache(cache_dir: Path, epd_folder: Path) -> list[IlcdProcess]
 
     processes_df = pd.read_feather(cache_dir / PROCESSES_FEATHER)
     lcia_df = pd.read_feather(cache_dir / LCIA_FEATHER)
+    return EpdCorpus.from_frames(processes_df, lcia_df, epd_folder)
 
-    raw_lcia_by_uuid: dict[str, dict[str, dict[str, float | None]]] = {}
-    if not lcia_df.empty:
-        for row in lcia_df.itertuples(index=False):
-            by_indicator = raw_lcia_by_uuid.setdefault(row.uuid, {})
-            by_indicator.setdefault(row.indicator, {})[row.module] = row.value
-
-    epds: list[IlcdProcess] = []
-    for row in processes_df.itertuples(index=False):
-        material_kwargs = {col: getattr(row, col, None) for col in MATERIAL_COLUMNS}
-        epds.append(
-            IlcdProcess.from_cache_record(
-                uuid=row.uuid,
-                loc=row.loc,
-                ref_flow_uuid=row.ref_flow_uuid,
-                source_path=row.source_path,
-                material_kwargs=material_kwargs,
-                raw_lcia=raw_lcia_by_uuid.get(row.uuid, {}),
-                epd_folder=epd_folder,
-            )
-        )
 
-    return epds
+def load_epds_in_memory(
+    epd_folder: Path,
+    *,
+    workers: int | None = None,
+    disable_progress: bool = False,
+    verbose: bool = False,
+) -> EpdCorpus:
+    """
+    Extract the EPD corpus with the cache engine, without writing a cache.
+
+    The corpus is the same as one loaded from a cache built from the same
+    source; extraction failures are logged and skipped.
+    """
+    corpus = extract_epd_corpus(
+        epd_folder,
+        workers=workers,
+        disable_progress=disable_progress,
+        verbose=verbose,
+    )
+    _log_extraction_failures(corpus.failures)
+    return EpdCorpus.from_frames(corpus.processes, corpus.lcia, epd_folder)
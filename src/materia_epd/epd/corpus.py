@@ -0,0 +1,455 @@
+"""
+Column-backed EPD corpus.
+
+:class:`EpdCorpus` keeps one array per field instead of one object per EPD:
+identity and metadata columns, an ``(n, 11)`` material matrix (NaN where a
+field is not declared), a bitmask of the declared fields, the same matrix
+after rule propagation with per-row conflict flags, a bitmask of the
+accepted rescalings each row can satisfy and an
+``(n, indicators, modules)`` LCIA tensor. Pipeline code iterates it like a
+list and gets :class:`EpdRow` views that behave as cache-loaded
+:class:`~materia_epd.epd.models.IlcdProcess` objects.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+from materia_epd.core.constants import VARS
+from materia_epd.core.physics import Material, feasible_rescalings, propagate_rules
+from materia_epd.epd.models import RefFlowRef
+from materia_epd.resources import get_market_shares
+
+# bit i of ``EpdCorpus.known_bits`` is set when material field VARS[i] is declared
+FIELD_BITS: dict[str, int] = {name: 1 << i for i, name in enumerate(VARS)}
+
+
+def field_mask(fields: Iterable[str]) -> int:
+    """Bitmask of the given material fields."""
+    mask = 0
+    for name in fields:
+        if name not in FIELD_BITS:
+            raise ValueError(f"Unknown field: {name}")
+        mask |= FIELD_BITS[name]
+    return mask
+
+
+class EpdRow:
+    """
+    A view of one corpus row, duck-typed as a cache-loaded IlcdProcess.
+
+    Views are created on access and build their own Material on first use,
+    so rescaling an EPD in one pipeline run never leaks into another.
+    """
+
+    __slots__ = (
+        "corpus",
+        "row",
+        "_material",
+        "lcia_values",
+        "_lcia_results",
+        "hs_class",
+        "market",
+    )
+
+    root = None
+
+    def __init__(self, corpus: EpdCorpus, row: int) -> None:
+        self.corpus = corpus
+        self.row = row
+        self._material: Material | None = None
+        # scaled (indicators, modules) row of the corpus LCIA tensor, NaN = absent
+        self.lcia_values: np.ndarray | None = None
+        self._lcia_results: list[dict] | None = None
+        self.hs_class: str | None = None
+        self.market: dict | None = None
+
+    def __repr__(self) -> str:
+        return f"EpdRow(uuid={self.uuid!r}, loc={self.loc!r})"
+
+    @property
+    def uuid(self) -> str:
+        return self.corpus.uuids[self.row]
+
+    @property
+    def loc(self) -> str | None:
+        return self.corpus.locs[self.row]
+
+    @property
+    def path(self) -> Path:
+        return self.corpus.epd_folder / "processes" / self.corpus.source_paths[self.row]
+
+    @property
+    def ref_flow(self) -> RefFlowRef:
+        return RefFlowRef(uuid=self.corpus.ref_flow_uuids[self.row])
+
+    @property
+    def dec_unit(self) -> str | None:
+        return self.corpus.dec_units[self.row]
+
+    @property
+    def ref_flow_property(self) -> str | None:
+        return self.corpus.ref_flow_properties[self.row]
+
+    @property
+    def base_names(self) -> dict[str, str]:
+        return json.loads(self.corpus.base_names[self.row])
+
+    @property
+    def hs_classes(self) -> list[dict[str, str]]:
+        return json.loads(self.corpus.hs_classes[self.row])
+
+    @property
+    def known_bits(self) -> int:
+        return int(self.corpus.known_bits[self.row])
+
+    @property
+    def derived_bits(self) -> int:
+        if self._material is None:
+            return int(self.corpus.derived_bits[self.row])
+        return self._material.derived_bits()
+
+    @property
+    def rescalings(self) -> int:
+        """Mask of the accepted rescalings the current material may satisfy."""
+        if self._material is None:
+            return int(self.corpus.rescalings[self.row])
+        return feasible_rescalings(self._material.derived_bits())
+
+    @property
+    def material_kwargs(self) -> dict[str, float | None]:
+        values = self.corpus.material[self.row]
+        return {
+            name: None if np.isnan(value) else float(value)
+            for name, value in zip(VARS, values)
+        }
+
+    @property
+    def material(self) -> Material:
+        if self._material is None:
+            derived = self.corpus.derived[self.row]
+            self._material = Material.with_derivation(
+                [None if np.isnan(v) else float(v) for v in derived],
+                **self.material_kwargs,
+            )
+        return self._material
+
+    @material.setter
+    def material(self, value: Material) -> None:
+        self._material = value
+
+    @property
+    def raw_lcia(self) -> dict[str, dict[str, float]]:
+        """Unscaled LCIA values of this row, by indicator and module."""
+        corpus = self.corpus
+        values = corpus.lcia[self.row]
+        present = ~np.isnan(values)
+        return {
+            corpus.indicators[i]: {
+                corpus.modules[m]: float(values[i, m])
+                for m in np.flatnonzero(present[i])
+            }
+            for i in np.flatnonzero(present.any(axis=1))
+        }
+
+    def get_ref_flow(self) -> RefFlowRef:
+        return self.ref_flow
+
+    def get_declared_unit(self) -> str | None:
+        return self.dec_unit
+
+    @property
+    def lcia_results(self) -> list[dict] | None:
+        """``lcia_values`` as ``{"name", "values"}`` dicts, built on first access."""
+        if self._lcia_results is None and self.lcia_values is not None:
+            corpus = self.corpus
+            values = self.lcia_values
+            present = ~np.isnan(values)
+            self._lcia_results = [
+                {
+                    "name": corpus.indicators[i],
+                    "values": {
+                        corpus.modules[m]: float(values[i, m])
+                        for m in np.flatnonzero(present[i])
+                    },
+                }
+                for i in np.flatnonzero(present.any(axis=1))
+            ]
+        return self._lcia_results
+
+    def set_lcia_values(self, values: np.ndarray) -> None:
+        self.lcia_values = values
+        self._lcia_results = None
+
+    def get_lcia_results(self) -> list[dict]:
+        self.set_lcia_values(self.corpus.lcia[self.row] * self.material.scaling_factor)
+        return self.lcia_results
+
+    def get_hs_class(self) -> str | None:
+        self.hs_class = next(
+            (c["class_id"] or None for c in self.hs_classes if c["level"] == "2"),
+            None,
+        )
+        return self.hs_class
+
+    def get_market(self) -> dict:
+        self.market = get_market_shares(self.loc, self.hs_class)
+        return self.market
+
+
+def scale_lcia(epds: Iterable) -> None:
+    """
+    Set the scaled LCIA results of every EPD in ``epds``.
+
+    :class:`EpdRow` views get ``lcia_values`` from one multiply per corpus;
+    any other EPD falls back to its own ``get_lcia_results``.
+    """
+    by_corpus: dict[int, list[EpdRow]] = {}
+    for epd in epds:
+        if isinstance(epd, EpdRow):
+            by_corpus.setdefault(id(epd.corpus), []).append(epd)
+        else:
+            epd.get_lcia_results()
+
+    for views in by_corpus.values():
+        rows = np.fromiter((v.row for v in views), dtype=np.intp, count=len(views))
+        factors = np.fromiter(
+            (v.material.scaling_factor for v in views), dtype=float, count=len(views)
+        )
+        block = views[0].corpus.lcia[rows] * factors[:, None, None]
+        for view, values in zip(views, block):
+            view.set_lcia_values(values)
+
+
+def stacked_lcia(
+    epds: Sequence,
+) -> tuple[np.ndarray, tuple[str, ...], tuple[str, ...]] | None:
+    """
+    ``(values, indicators, modules)`` of ``epds`` stacked into one array.
+
+    Returns None unless every EPD is a scaled :class:`EpdRow` of one corpus.
+    """
+    if not epds or not all(
+        isinstance(e, EpdRow) and e.lcia_values is not None for e in epds
+    ):
+        return None
+    corpus = epds[0].corpus
+    if any(e.corpus is not corpus for e in epds):
+        return None
+    return np.stack([e.lcia_values for e in epds]), corpus.indicators, corpus.modules
+
+
+class EpdCorpus(Sequence):
+    """
+    An EPD corpus stored as column arrays with a uuid -> row index.
+
+    Indexing and iteration yield fresh :class:`EpdRow` views; the ``*_mask``
+    methods return boolean row masks and :meth:`select` / :meth:`take`
+    build sub-corpora sharing the same indicator and module axes.
+    """
+
+    def __init__(
+        self,
+        *,
+        uuids: np.ndarray,
+        locs: np.ndarray,
+        ref_flow_uuids: np.ndarray,
+        source_paths: np.ndarray,
+        material: np.ndarray,
+        indicators: tuple[str, ...],
+        modules: tuple[str, ...],
+        lcia: np.ndarray,
+        base_names: np.ndarray,
+        hs_classes: np.ndarray,
+        dec_units: np.ndarray,
+        ref_flow_properties: np.ndarray,
+        epd_folder: Path,
+        derived: np.ndarray | None = None,
+        conflicts: np.ndarray | None = None,
+        loc_codes: np.ndarray | None = None,
+        loc_values: tuple[str, ...] | None = None,
+    ) -> None:
+        self.uuids = uuids
+        self.locs = locs
+        self.ref_flow_uuids = ref_flow_uuids
+        self.source_paths = source_paths
+        self.material = material
+        self.indicators = indicators
+        self.modules = modules
+        self.lcia = lcia
+        self.base_names = base_names
+        self.hs_classes = hs_classes
+        self.dec_units = dec_units
+        self.ref_flow_properties = ref_flow_properties
+        self.epd_folder = Path(epd_folder)
+
+        weights = np.array(list(FIELD_BITS.values()), dtype=np.uint16)
+        self.known_bits: np.ndarray = (~np.isnan(material)).astype(np.uint16) @ weights
+        if derived is None or conflicts is None:
+            derived, conflicts = propagate_rules(material)
+        self.derived: np.ndarray = derived
+        self.conflicts: np.ndarray = conflicts
+        self.derived_bits: np.ndarray = (~np.isnan(derived)).astype(np.uint16) @ weights
+        # bit k is cleared when rescaling to ACCEPTED_RESCALINGS[k] must fail
+        self.rescalings: np.ndarray = feasible_rescalings(self.derived_bits).astype(
+            np.uint8
+        )
+        if loc_codes is None or loc_values is None:
+            # -1 where the location is unknown
+            loc_codes, uniques = pd.factorize(locs)
+            loc_values = tuple(uniques)
+        self.loc_codes: np.ndarray = loc_codes
+        self.loc_values: tuple[str, ...] = loc_values
+        self.index: dict[str, int] = {uuid: row for row, uuid in enumerate(uuids)}
+
+    @classmethod
+    def from_frames(
+        cls, processes_df: pd.DataFrame, lcia_df: pd.DataFrame, epd_folder: Path
+    ) -> EpdCorpus:
+        """Build a corpus from the ``processes`` and ``lcia`` cache tables."""
+        n = len(processes_df)
+        uuids = processes_df["uuid"].to_numpy(dtype=object)
+
+        if lcia_df.empty:
+            indicators: tuple[str, ...] = ()
+            modules: tuple[str, ...] = ()
+            lcia = np.full((n, 0, 0), np.nan)
+        else:
+            row_by_uuid = {uuid: row for row, uuid in enumerate(uuids)}
+            rows = lcia_df["uuid"].map(row_by_uuid).fillna(-1).to_numpy(dtype=np.intp)
+            known = rows >= 0
+            ind_codes, ind_values = pd.factorize(lcia_df["indicator"])
+            mod_codes, mod_values = pd.factorize(lcia_df["module"])
+            indicators = tuple(ind_values)
+            modules = tuple(mod_values)
+            lcia = np.full((n, len(indicators), len(modules)), np.nan)
+            lcia[rows[known], ind_codes[known], mod_codes[known]] = lcia_df[
+                "value"
+            ].to_numpy(dtype=float)[known]
+
+        def _column(name: str) -> np.ndarray:
+            return (
+                processes_df[name]
+                .astype(object)
+                .where(processes_df[name].notna(), None)
+                .to_numpy()
+            )
+
+        return cls(
+            uuids=uuids,
+            locs=_column("loc"),
+            ref_flow_uuids=_column("ref_flow_uuid"),
+            source_paths=_column("source_path"),
+            material=processes_df[list(VARS)].to_numpy(dtype=float),
+            indicators=indicators,
+            modules=modules,
+            lcia=lcia,
+            base_names=_column("base_names"),
+            hs_classes=_column("hs_classes"),
+            dec_units=_column("declared_unit"),
+            ref_flow_properties=_column("ref_flow_property"),
+            epd_folder=epd_folder,
+        )
+
+    def __len__(self) -> int:
+        return len(self.uuids)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.take(np.arange(len(self))[key])
+        row = int(key)
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("EpdCorpus index out of range")
+        return EpdRow(self, row)
+
+    def __iter__(self) -> Iterator[EpdRow]:
+        for row in range(len(self)):
+            yield EpdRow(self, row)
+
+    def __repr__(self) -> str:
+        return (
+            f"EpdCorpus({len(self)} EPDs, {len(self.indicators)} indicators, "
+            f"{len(self.modules)} modules)"
+        )
+
+    def get(self, uuid: str) -> EpdRow | None:
+        """Return a view of the EPD with ``uuid``, if present."""
+        row = self.index.get(uuid)
+        return None if row is None else EpdRow(self, row)
+
+    def rows_for(self, uuids: Iterable[str]) -> np.ndarray:
+        """Rows of the given uuids in request order; unknown uuids are skipped."""
+        rows = [self.index[u] for u in uuids if u in self.index]
+        return np.asarray(rows, dtype=np.intp)
+
+    def get_many(self, uuids: Iterable[str]) -> list[EpdRow]:
+        """Views of the given uuids in corpus order, once each; unknown are skipped."""
+        return [EpdRow(self, int(row)) for row in np.unique(self.rows_for(uuids))]
+
+    def uuid_mask(self, uuids: Iterable[str]) -> np.ndarray:
+        mask = np.zeros(len(self), dtype=bool)
+        mask[self.rows_for(uuids)] = True
+        return mask
+
+    def loc_mask(self, locations: Iterable[str | None]) -> np.ndarray:
+        wanted = set(locations)
+        codes = [code for code, loc in enumerate(self.loc_values) if loc in wanted]
+        if None in wanted:
+            codes.append(-1)
+        return np.isin(self.loc_codes, codes)
+
+    def known_mask(self, fields: Iterable[str]) -> np.ndarray:
+        """Rows declaring every field in ``fields``."""
+        bits = field_mask(fields)
+        return (self.known_bits & bits) == bits
+
+    def take(self, rows: Sequence[int] | np.ndarray) -> EpdCorpus:
+        """Sub-corpus of ``rows``, in the given order."""
+        rows = np.asarray(rows, dtype=np.intp)
+        return EpdCorpus(
+            uuids=self.uuids[rows],
+            locs=self.locs[rows],
+            ref_flow_uuids=self.ref_flow_uuids[rows],
+            source_paths=self.source_paths[rows],
+            material=self.material[rows],
+            indicators=self.indicators,
+            modules=self.modules,
+            lcia=self.lcia[rows],
+            base_names=self.base_names[rows],
+            hs_classes=self.hs_classes[rows],
+            dec_units=self.dec_units[rows],
+            ref_flow_properties=self.ref_flow_properties[rows],
+            epd_folder=self.epd_folder,
+            derived=self.derived[rows],
+            conflicts=self.conflicts[rows],
+            loc_codes=self.loc_codes[rows],
+            loc_values=self.loc_values,
+        )
+
+    def select(self, mask: np.ndarray) -> EpdCorpus:
+        """Sub-corpus of the rows where ``mask`` is true."""
+        return self.take(np.flatnonzero(mask))
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the numeric arrays (object columns not included)."""
+        return sum(
+            a.nbytes
+            for a in (
+                self.material,
+                self.derived,
+                self.conflicts,
+                self.lcia,
+                self.known_bits,
+                self.derived_bits,
+                self.rescalings,
+                self.loc_codes,
+            )
+        )
@@ -1,4 +1,8 @@
-"""Pure extraction helpers for EPD cache building (multiprocessing-safe)."""
+"""Pure extraction helpers for EPD cache building (multiprocessing-safe).
+
+Extraction workers import only this module: keep pandas, numpy, rich and
+matplotlib (and anything that pulls them in) off its import path.
+"""
 
 from __future__ import annotations
 
@@ -7,14 +11,18 @@ from pathlib import Path
 
 from materia_epd.core.constants import (
     ATTR,
-    FLOW_PROPERTY_MAPPING,
     NS,
     UNIT_PROPERTY_MAPPING,
     UNIT_QUANTITY_MAPPING,
     XP,
 )
-from materia_epd.core.physics import check_properties_ranges
-from materia_epd.core.utils import to_float
+from materia_epd.core.lookups import (
+    MATERIAL_FIELDS,
+    QUANTITY_FIELD_BY_FLOW_PROPERTY_UUID,
+    UNIT_BY_FLOW_PROPERTY_UUID,
+    canonical_indicator,
+)
+from materia_epd.core.utils import _extract_version, to_float
 from materia_epd.epd.extraction_errors import (
     EpdExtractionError,
     describe_element,
@@ -22,20 +30,26 @@ from materia_epd.epd.extraction_errors import (
     find_element_line,
     wrap_extraction_error,
 )
+from materia_epd.epd.extraction_timings import PhaseTimer
 from materia_epd.geo.locations import ilcd_to_iso_location
-from materia_epd.io.files import latest_flow_file
+from materia_epd.io.archives import XmlSource, as_xml_source, open_xml_source
+from materia_epd.io.files import flow_file_uuid, latest_flow_file
 from materia_epd.metrics.normalize import normalize_module_values
-from materia_epd.resources import get_indicator_synonyms
+
+
+def _parse_xml_source(source: XmlSource) -> ET.Element:
+    with open_xml_source(source) as fh:
+        return ET.parse(fh).getroot()
 
 
 def _raise_extraction_error(
-    process_path: Path,
+    process_path: XmlSource,
     stage: str,
     message: str,
     *,
     process_uuid: str | None = None,
     element: ET.Element | None = None,
-    flow_path: Path | None = None,
+    flow_path: XmlSource | None = None,
 ) -> None:
     raise EpdExtractionError(
         process_path=str(process_path),
@@ -61,12 +75,56 @@ def _parse_loc(root: ET.Element) -> str | None:
     return ilcd_to_iso_location(loc_code) if loc_code else None
 
 
-def _parse_material_kwargs(
+def parse_base_names(process_root: ET.Element) -> dict[str, str]:
+    """All non-empty base names keyed by lower-cased language ("und" if unset)."""
+    base_names: dict[str, str] = {}
+    for node in process_root.findall(XP.BASE_NAME, NS):
+        if not node.text or not node.text.strip():
+            continue
+        lang = node.attrib.get(ATTR.LANG, "").strip().lower() or "und"
+        base_names[lang] = node.text.strip()
+    return base_names
+
+
+def parse_hs_classes(process_root: ET.Element) -> list[dict[str, str]]:
+    """Levels of the HS classification as ``{"level", "class_id", "text"}``."""
+    hs_classes: list[dict[str, str]] = []
+    for classification in process_root.findall(XP.CLASSIFICATION, NS):
+        cname = (classification.attrib.get(ATTR.NAME) or "").strip().lower()
+        if cname != "hs classification":
+            continue
+        for cls in classification.findall(XP.CLASS, NS):
+            hs_classes.append(
+                {
+                    "level": (cls.attrib.get("level") or "").strip(),
+                    "class_id": (cls.attrib.get(ATTR.CLASS_ID) or "").strip(),
+                    "text": (cls.text or "").strip(),
+                }
+            )
+    return hs_classes
+
+
+def parse_reference_flow_property(
+    flow_root: ET.Element,
+) -> tuple[str | None, str | None]:
+    """Return the reference flow-property uuid and its declared-unit field."""
+    ref_id = flow_root.findtext(XP.REF_TO_REF_FLOW_PROP, namespaces=NS)
+    if ref_id is None:
+        return None, None
+    for fp in flow_root.findall(XP.FLOW_PROPERTY, NS):
+        if fp.get(ATTR.INTERNAL_ID) == ref_id.strip():
+            ref = fp.find(XP.REF_TO_FLOW_PROP, NS)
+            uuid = ref.get(ATTR.REF_OBJECT_ID) if ref is not None else None
+            unit_symbol = UNIT_BY_FLOW_PROPERTY_UUID.get(uuid)
+            return uuid, UNIT_QUANTITY_MAPPING.get(unit_symbol)
+    return None, None
+
+
+def _parse_reference_exchange(
     process_root: ET.Element,
-    process_path: Path,
-    flows_folder: Path,
+    process_path: XmlSource,
     uuid: str | None,
-) -> tuple[dict, str]:
+) -> tuple[str, float]:
     quant_ref_node = process_root.find(XP.QUANT_REF, NS)
     ref_flow_id = (
         quant_ref_node.text.strip()
@@ -111,21 +169,6 @@ def _parse_material_kwargs(
             element=ref_to_flow,
         )
 
-    try:
-        flow_file = latest_flow_file(flows_folder, ref_flow_uuid)
-    except FileNotFoundError as exc:
-        raise EpdExtractionError(
-            process_path=str(process_path),
-            stage="parse_reference_flow",
-            message=str(exc),
-            process_uuid=uuid,
-            xml_tag=describe_element(ref_to_flow),
-            xml_attributes=element_attributes(ref_to_flow),
-            xml_line=find_element_line(process_path, ref_to_flow),
-        ) from exc
-
-    flow_root = ET.parse(flow_file).getroot()
-
     mean_amount_node = ref_flow_exchange.find(XP.MEAN_AMOUNT, NS)
     exchange_amount = to_float(
         mean_amount_node.text if mean_amount_node is not None else None,
@@ -138,76 +181,104 @@ def _parse_material_kwargs(
             "proc:meanAmount is missing, empty, or not a positive number on reference exchange",
             process_uuid=uuid,
             element=mean_amount_node or ref_flow_exchange,
-            flow_path=flow_file,
         )
 
-    kwargs = {
-        v: None
-        for v in set(UNIT_QUANTITY_MAPPING.values()) | set(UNIT_PROPERTY_MAPPING.values())
-    }
+    return ref_flow_uuid, exchange_amount
+
 
+def _parse_flow_quantities(flow_root: ET.Element, flow_path: XmlSource) -> dict:
+    """Per-unit flow quantities keyed by material field (not yet scaled)."""
+    quantities: dict[str, float] = {}
     for prop in flow_root.findall(XP.FLOW_PROPERTY, NS):
         mean_value = prop.findtext(XP.MEAN_VALUE, namespaces=NS)
         ref = prop.find(XP.REF_TO_FLOW_PROP, NS)
         if mean_value and ref is not None:
             unit_uuid = ref.attrib.get(ATTR.REF_OBJECT_ID)
-            unit = next(
-                (
-                    symbol
-                    for symbol, mapped_uuid in FLOW_PROPERTY_MAPPING.items()
-                    if mapped_uuid == unit_uuid
-                ),
-                None,
-            )
-            field = UNIT_QUANTITY_MAPPING.get(unit)
+            field = QUANTITY_FIELD_BY_FLOW_PROPERTY_UUID.get(unit_uuid)
             amount = to_float(mean_value, positive=True)
             if field and amount is not None:
-                kwargs[field] = amount * exchange_amount
+                quantities[field] = amount
             elif field and mean_value:
                 _raise_extraction_error(
-                    process_path,
+                    flow_path,
                     "parse_flow_quantities",
-                    f"flow:meanValue is missing or invalid for unit {unit!r}",
-                    process_uuid=uuid,
+                    "flow:meanValue is missing or invalid for unit "
+                    f"{UNIT_BY_FLOW_PROPERTY_UUID.get(unit_uuid)!r}",
                     element=prop,
-                    flow_path=flow_file,
+                    flow_path=flow_path,
                 )
+    return quantities
+
 
+def _parse_flow_properties(flow_root: ET.Element, flow_path: XmlSource) -> dict:
+    """MatML material properties keyed by material field."""
+    properties: dict[str, float] = {}
     matml = flow_root.find(XP.MATML_DOC, NS)
-    if matml is not None:
-        amounts = {
-            pd.attrib.get(ATTR.PROPERTY): pd.findtext(XP.PROP_DATA, namespaces=NS)
-            for pd in matml.findall(XP.PROP_DATA, NS)
-            if pd.attrib.get(ATTR.PROPERTY) and pd.find(XP.PROP_DATA, NS) is not None
-        }
-        for detail in matml.findall(XP.PROPERTY_DETAILS, NS):
-            prop_id = detail.attrib.get(ATTR.ID)
-            unit = detail.find(XP.PROP_UNITS, NS)
-            unit_name = unit.attrib.get(ATTR.NAME) if unit is not None else None
-            amount_text = amounts.get(prop_id)
-            if unit_name and amount_text is not None:
-                field = UNIT_PROPERTY_MAPPING.get(unit_name)
-                amount = to_float(amount_text, positive=True)
-                if field and amount is not None:
-                    kwargs[field] = amount
-                elif field:
-                    _raise_extraction_error(
-                        process_path,
-                        "parse_flow_properties",
-                        f"mat:Data is missing or invalid for property {prop_id!r} ({unit_name})",
-                        process_uuid=uuid,
-                        element=detail,
-                        flow_path=flow_file,
-                    )
-
-    kwargs = check_properties_ranges(uuid, kwargs)
-    return kwargs, ref_flow_uuid
+    if matml is None:
+        return properties
+
+    amounts = {
+        pd.attrib.get(ATTR.PROPERTY): pd.findtext(XP.PROP_DATA, namespaces=NS)
+        for pd in matml.findall(XP.PROPERTY_DATA, NS)
+        if pd.attrib.get(ATTR.PROPERTY) and pd.find(XP.PROP_DATA, NS) is not None
+    }
+    for detail in matml.findall(XP.PROPERTY_DETAILS, NS):
+        prop_id = detail.attrib.get(ATTR.ID)
+        unit = detail.find(XP.PROP_UNITS, NS)
+        unit_name = unit.attrib.get(ATTR.NAME) if unit is not None else None
+        amount_text = amounts.get(prop_id)
+        if unit_name and amount_text is not None:
+            field = UNIT_PROPERTY_MAPPING.get(unit_name)
+            amount = to_float(amount_text, positive=True)
+            if field and amount is not None:
+                properties[field] = amount
+            elif field:
+                _raise_extraction_error(
+                    flow_path,
+                    "parse_flow_properties",
+                    f"mat:Data is missing or invalid for property {prop_id!r} ({unit_name})",
+                    element=detail,
+                    flow_path=flow_path,
+                )
+    return properties
+
+
+def material_kwargs_from_flow(
+    flow_record: dict, exchange_amount: float, uuid: str | None
+) -> dict:
+    """Scale per-unit flow quantities by the exchange amount and range-check."""
+    from materia_epd.core.physics import check_properties_ranges
+
+    kwargs = dict.fromkeys(MATERIAL_FIELDS)
+    for field, amount in flow_record["quantities"].items():
+        kwargs[field] = amount * exchange_amount
+    kwargs.update(flow_record["properties"])
+    return check_properties_ranges(uuid, kwargs)
+
+
+def flow_failure_for_process(
+    flow_error: EpdExtractionError,
+    process_path: XmlSource,
+    process_uuid: str | None,
+) -> EpdExtractionError:
+    """Re-attribute a flow extraction error to a process that references it."""
+    return EpdExtractionError(
+        process_path=str(process_path),
+        stage=flow_error.stage,
+        message=flow_error.message,
+        process_uuid=process_uuid,
+        xml_tag=flow_error.xml_tag,
+        xml_attributes=flow_error.xml_attributes,
+        xml_line=flow_error.xml_line,
+        xml_text=flow_error.xml_text,
+        flow_path=flow_error.flow_path or flow_error.process_path,
+        cause_type=flow_error.cause_type,
+    )
 
 
 def _parse_raw_lcia(
-    process_root: ET.Element, process_path: Path, uuid: str | None
+    process_root: ET.Element, process_path: XmlSource, uuid: str | None
 ) -> dict[str, dict[str, float | None]]:
-    synonyms = get_indicator_synonyms()
     raw_lcia: dict[str, dict[str, float | None]] = {}
 
     for lcia_result in process_root.findall(XP.LCIA_RESULT, NS):
@@ -232,34 +303,43 @@ def _parse_raw_lcia(
                 element=element,
             ) from exc
 
-        canon = next(
-            (c for c, aliases in synonyms.items() if name in aliases),
-            None,
-        )
+        canon = canonical_indicator(name)
         if canon:
             raw_lcia[canon] = values
 
     return raw_lcia
 
 
-def extract_epd_record(process_path: str, flows_folder: str) -> dict:
+def extract_process_record(
+    process_path: str | XmlSource, timings: bool = False
+) -> dict:
     """
-    Extract cacheable fields from one EPD process XML.
+    Extract cacheable fields from one EPD process XML, without its flow.
 
-    Module-level worker for ProcessPoolExecutor (str paths for Windows spawn).
+    Module-level worker for ProcessPoolExecutor (str paths for Windows spawn,
+    or a picklable :class:`~materia_epd.io.archives.ZipMember`).
+    With ``timings=True`` the record carries per-phase seconds under
+    ``"timings"`` (parse_xml, parse_reference_flow, parse_lcia,
+    parse_metadata).
     """
-    process_file = Path(process_path)
-    flows_dir = Path(flows_folder)
+    process_file = as_xml_source(process_path)
     uuid: str | None = None
+    timer = PhaseTimer(timings)
 
     try:
-        root = ET.parse(process_file).getroot()
+        root = _parse_xml_source(process_file)
+        timer.lap("parse_xml")
         uuid = _parse_uuid(root)
         loc = _parse_loc(root)
-        material_kwargs, ref_flow_uuid = _parse_material_kwargs(
-            root, process_file, flows_dir, uuid
+        ref_flow_uuid, exchange_amount = _parse_reference_exchange(
+            root, process_file, uuid
         )
+        timer.lap("parse_reference_flow")
         raw_lcia = _parse_raw_lcia(root, process_file, uuid)
+        timer.lap("parse_lcia")
+        base_names = parse_base_names(root)
+        hs_classes = parse_hs_classes(root)
+        timer.lap("parse_metadata")
     except EpdExtractionError:
         raise
     except ET.ParseError as exc:
@@ -278,11 +358,114 @@ def extract_epd_record(process_path: str, flows_folder: str) -> dict:
             process_uuid=uuid,
         ) from exc
 
-    return {
+    record = {
         "uuid": uuid,
         "loc": loc,
         "ref_flow_uuid": ref_flow_uuid,
+        "exchange_amount": exchange_amount,
         "source_path": process_file.name,
-        "material_kwargs": material_kwargs,
         "raw_lcia": raw_lcia,
+        "base_names": base_names,
+        "hs_classes": hs_classes,
     }
+    if timings:
+        record["timings"] = timer.phases
+    return record
+
+
+def extract_flow_record(flow_path: str | XmlSource, timings: bool = False) -> dict:
+    """
+    Extract per-unit quantities and MatML properties from one flow XML.
+
+    Module-level worker for ProcessPoolExecutor (str paths for Windows spawn,
+    or a picklable :class:`~materia_epd.io.archives.ZipMember`).
+    With ``timings=True`` the record carries per-phase seconds under
+    ``"timings"`` (parse_flow_xml, parse_flow_quantities, parse_flow_properties).
+    """
+    flow_file = as_xml_source(flow_path)
+    timer = PhaseTimer(timings)
+
+    try:
+        root = _parse_xml_source(flow_file)
+        timer.lap("parse_flow_xml")
+        quantities = _parse_flow_quantities(root, flow_file)
+        timer.lap("parse_flow_quantities")
+        properties = _parse_flow_properties(root, flow_file)
+        timer.lap("parse_flow_properties")
+        ref_flow_property, declared_unit = parse_reference_flow_property(root)
+    except EpdExtractionError:
+        raise
+    except ET.ParseError as exc:
+        raise EpdExtractionError(
+            process_path=str(flow_file),
+            stage="parse_flow_xml",
+            message=str(exc),
+            flow_path=str(flow_file),
+            cause_type=type(exc).__name__,
+        ) from exc
+    except Exception as exc:
+        raise wrap_extraction_error(
+            exc,
+            process_path=flow_file,
+            stage="extract_flow_record",
+            flow_path=flow_file,
+        ) from exc
+
+    version = _extract_version(flow_file.name)
+    record = {
+        "flow_uuid": flow_file_uuid(Path(flow_file.name)),
+        "version": ".".join(str(p) for p in version) if version else None,
+        "source_path": flow_file.name,
+        "quantities": quantities,
+        "properties": properties,
+        "ref_flow_property": ref_flow_property,
+        "declared_unit": declared_unit,
+    }
+    if timings:
+        record["timings"] = timer.phases
+    return record
+
+
+def extract_epd_record(
+    process_path: str, flows_folder: str, timings: bool = False
+) -> dict:
+    """
+    Extract one EPD process together with its reference flow material.
+
+    Convenience wrapper around :func:`extract_process_record` and
+    :func:`extract_flow_record`; cache building extracts flows separately.
+    With ``timings=True`` the process and flow phases are merged into
+    ``record["timings"]``, together with flow_lookup and range_checks.
+    """
+    record = extract_process_record(process_path, timings=timings)
+    process_file = Path(process_path)
+    uuid = record["uuid"]
+    timer = PhaseTimer(timings)
+
+    try:
+        flow_file = latest_flow_file(Path(flows_folder), record["ref_flow_uuid"])
+    except FileNotFoundError as exc:
+        raise EpdExtractionError(
+            process_path=str(process_file),
+            stage="parse_reference_flow",
+            message=str(exc),
+            process_uuid=uuid,
+        ) from exc
+
+    timer.lap("flow_lookup")
+
+    try:
+        flow_record = extract_flow_record(str(flow_file), timings=timings)
+    except EpdExtractionError as exc:
+        raise flow_failure_for_process(exc, process_file, uuid) from exc
+    timer.merge(flow_record.get("timings", {}))
+
+    record["material_kwargs"] = material_kwargs_from_flow(
+        flow_record, record["exchange_amount"], uuid
+    )
+    record["ref_flow_property"] = flow_record["ref_flow_property"]
+    record["declared_unit"] = flow_record["declared_unit"]
+    timer.lap("range_checks")
+    if timings:
+        record["timings"].update(timer.phases)
+    return record
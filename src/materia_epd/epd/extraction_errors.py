@@ -6,6 +6,8 @@ import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from materia_epd.io.archives import XmlSource, read_source_text
+
 
 @dataclass
 class EpdExtractionError(Exception):
@@ -92,7 +94,7 @@ def element_attributes(elem: ET.Element | None) -> dict[str, str]:
     }
 
 
-def find_element_line(xml_path: Path, elem: ET.Element | None) -> int | None:
+def find_element_line(xml_path: XmlSource, elem: ET.Element | None) -> int | None:
     """
     Best-effort line number lookup by scanning the source file for the element.
 
@@ -106,8 +108,8 @@ def find_element_line(xml_path: Path, elem: ET.Element | None) -> int | None:
     attrib_values = [v for v in elem.attrib.values() if v]
 
     try:
-        lines = xml_path.read_text(encoding="utf-8").splitlines()
-    except OSError:
+        lines = read_source_text(xml_path).splitlines()
+    except (OSError, KeyError, UnicodeDecodeError):
         return None
 
     candidates: list[int] = []
@@ -133,11 +135,11 @@ def find_element_line(xml_path: Path, elem: ET.Element | None) -> int | None:
 def wrap_extraction_error(
     exc: Exception,
     *,
-    process_path: Path,
+    process_path: XmlSource,
     stage: str,
     process_uuid: str | None = None,
     element: ET.Element | None = None,
-    flow_path: Path | None = None,
+    flow_path: XmlSource | None = None,
 ) -> EpdExtractionError:
     """Convert an unexpected exception into a structured extraction error."""
     if isinstance(exc, EpdExtractionError):
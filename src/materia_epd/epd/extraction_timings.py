@@ -0,0 +1,180 @@
+"""Per-phase timings for EPD cache extraction and their build summary.
+
+Imported by extraction workers, so numpy and rich are only imported by the
+summary and report helpers that run in the parent process.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    from rich.console import Console
+
+# Upper bucket edges in milliseconds; the last bucket collects everything above.
+HISTOGRAM_EDGES_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+PERCENTILES = (50, 90, 99)
+
+
+class PhaseTimer:
+    """Accumulate wall-clock seconds per named phase; a no-op when disabled."""
+
+    __slots__ = ("enabled", "phases", "_last")
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.phases: dict[str, float] = {}
+        self._last = time.perf_counter() if enabled else 0.0
+
+    def lap(self, phase: str) -> None:
+        """Charge the time since the previous lap to ``phase``."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def merge(self, phases: dict[str, float]) -> None:
+        """Add externally measured phase durations (e.g. from a flow record)."""
+        if not self.enabled:
+            return
+        for phase, seconds in phases.items():
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        self._last = time.perf_counter()
+
+
+def _histogram(values_ms: np.ndarray) -> list[dict]:
+    import numpy as np
+
+    edges = np.asarray(HISTOGRAM_EDGES_MS, dtype=float)
+    counts = np.bincount(
+        np.searchsorted(edges, values_ms, side="left"), minlength=len(edges) + 1
+    )
+    return [
+        {"le_ms": float(edge) if i < len(edges) else None, "count": int(count)}
+        for i, (edge, count) in enumerate(zip([*edges, None], counts))
+    ]
+
+
+def _phase_stats(values_s: list[float]) -> dict:
+    import numpy as np
+
+    values_ms = np.asarray(values_s, dtype=float) * 1e3
+    stats = {
+        "count": int(values_ms.size),
+        "total_s": round(float(values_ms.sum()) / 1e3, 6),
+        "mean_ms": round(float(values_ms.mean()), 4),
+        "max_ms": round(float(values_ms.max()), 4),
+    }
+    for pct, value in zip(PERCENTILES, np.percentile(values_ms, PERCENTILES)):
+        stats[f"p{pct}_ms"] = round(float(value), 4)
+    stats["histogram"] = _histogram(values_ms)
+    return stats
+
+
+def summarize_extraction_timings(
+    per_file: dict[str, dict[str, float]],
+    stages: dict[str, float] | None = None,
+    counts: dict[str, int] | None = None,
+    *,
+    slowest: int = 10,
+) -> dict:
+    """
+    Aggregate per-file phase timings into a JSON-serialisable summary.
+
+    ``per_file`` maps a source path (relative to the EPD folder) to its
+    phase durations in seconds; ``stages`` holds build-level wall-clock
+    seconds and ``counts`` the number of files handled by each stage, from
+    which throughput is derived.
+    """
+    by_phase: dict[str, list[float]] = {}
+    for phases in per_file.values():
+        for phase, seconds in phases.items():
+            by_phase.setdefault(phase, []).append(seconds)
+
+    totals = sorted(
+        ((sum(phases.values()), path) for path, phases in per_file.items()),
+        reverse=True,
+    )[:slowest]
+
+    stages = stages or {}
+    counts = counts or {}
+    return {
+        "files": len(per_file),
+        "phases": {phase: _phase_stats(values) for phase, values in by_phase.items()},
+        "slowest_files": [
+            {
+                "path": path,
+                "total_ms": round(total * 1e3, 4),
+                "phases_ms": {
+                    phase: round(seconds * 1e3, 4)
+                    for phase, seconds in per_file[path].items()
+                },
+            }
+            for total, path in totals
+        ],
+        "stages": {
+            stage: {
+                "seconds": round(seconds, 6),
+                **(
+                    {"files_per_s": round(counts[stage] / seconds, 2)}
+                    if counts.get(stage) and seconds > 0
+                    else {}
+                ),
+            }
+            for stage, seconds in stages.items()
+        },
+    }
+
+
+def print_timing_report(summary: dict, console: Console | None = None) -> None:
+    """Render a timing summary as rich tables."""
+    from rich.console import Console
+    from rich.table import Table
+
+    out = console or Console()
+
+    stages = Table(title="Build stages", box=None)
+    stages.add_column("stage")
+    stages.add_column("seconds", justify="right")
+    stages.add_column("files/s", justify="right")
+    for stage, stats in summary.get("stages", {}).items():
+        rate = stats.get("files_per_s")
+        stages.add_row(stage, f"{stats['seconds']:.3f}", f"{rate:.1f}" if rate else "-")
+    out.print(stages)
+
+    workers = summary.get("workers") or {}
+    if workers.get("count"):
+        out.print(
+            f"Worker start-up: {workers['count']} workers, "
+            f"mean {workers['mean_s']:.3f} s, max {workers['max_s']:.3f} s"
+        )
+
+    phases = Table(title="Per-file phases (ms)", box=None)
+    for column in ("phase", "count", "mean", "p50", "p90", "p99", "max"):
+        phases.add_column(column, justify="left" if column == "phase" else "right")
+    for phase, stats in summary.get("phases", {}).items():
+        phases.add_row(
+            phase,
+            str(stats["count"]),
+            *(
+                f"{stats[key]:.2f}"
+                for key in ("mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms")
+            ),
+        )
+    out.print(phases)
+
+    slowest = Table(title="Slowest files", box=None)
+    slowest.add_column("file")
+    slowest.add_column("total (ms)", justify="right")
+    slowest.add_column("slowest phase")
+    for entry in summary.get("slowest_files", []):
+        worst = max(entry["phases_ms"].items(), key=lambda kv: kv[1], default=None)
+        slowest.add_row(
+            entry["path"],
+            f"{entry['total_ms']:.2f}",
+            f"{worst[0]} ({worst[1]:.2f})" if worst else "-",
+        )
+    out.print(slowest)
@@ -1,11 +1,22 @@
 from __future__ import annotations
 
 import logging
+from enum import IntEnum
+from typing import Iterator, NamedTuple, Sequence
+
+import numpy as np
 import structlog
 
+from materia_epd.core.physics import (
+    Material,
+    missing_field_error,
+    rescale_many,
+    rescaling_index,
+)
+from materia_epd.epd.corpus import EpdCorpus, EpdRow
 from materia_epd.epd.models import IlcdProcess
 from materia_epd.core.errors import NoMatchingEPDError
-from materia_epd.geo.locations import escalate_location_set
+from materia_epd.geo.locations import escalate_locations
 
 structlog.configure(
     wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
@@ -13,29 +24,174 @@ structlog.configure(
 logger = structlog.wrap_logger(logging.getLogger(__name__))
 
 
+class Reason(IntEnum):
+    """Why a filter rejected an EPD; ``ACCEPTED`` for rows that passed."""
+
+    ACCEPTED = 0
+    UUID = 1
+    LOCATION = 2
+    UNIT = 3
+    OTHER = 4
+
+
+def _corpus_rows(epds) -> tuple[EpdCorpus, np.ndarray] | None:
+    """``(corpus, rows)`` backing ``epds``, or None for plain process objects."""
+    if isinstance(epds, EpdCorpus):
+        return epds, np.arange(len(epds))
+    if not epds or not isinstance(epds[0], EpdRow):
+        return None
+    corpus = epds[0].corpus
+    if not all(isinstance(e, EpdRow) and e.corpus is corpus for e in epds):
+        return None
+    return corpus, np.fromiter((e.row for e in epds), dtype=np.intp, count=len(epds))
+
+
+def _subset(epds, rows: np.ndarray):
+    if len(rows) == len(epds):
+        return epds
+    if isinstance(epds, EpdCorpus):
+        return epds.take(rows)
+    return [epds[i] for i in rows]
+
+
 class EPDFilter:
+    """
+    Accepts or rejects EPDs, one at a time through :meth:`matches` or over
+    a whole candidate sequence through :meth:`mask`.
+
+    Filters with ``columnar = True`` compute :meth:`mask` from corpus
+    columns; the others are evaluated object by object. ``&`` and ``|``
+    compose filters into :class:`AllOf` / :class:`AnyOf`.
+    """
+
+    reason = Reason.OTHER
+    columnar = False
+
+    def prepare(self, epds: list[IlcdProcess]) -> None:
+        """Hook run once over all candidates before ``matches``."""
+
     def matches(self, epd: IlcdProcess) -> bool:
         return True
 
+    def mask(self, epds: Sequence) -> np.ndarray:
+        """Boolean accept mask over ``epds``."""
+        return np.fromiter(
+            (self.matches(epd) for epd in epds), dtype=bool, count=len(epds)
+        )
+
+    def failure_text(self) -> str:
+        """Generic explanation of a rejection by this filter."""
+        return f"Failed filter {self.__class__.__name__}"
+
+    def __and__(self, other: EPDFilter) -> AllOf:
+        return AllOf(self, other)
+
+    def __or__(self, other: EPDFilter) -> AnyOf:
+        return AnyOf(self, other)
+
     def __repr__(self):
         return self.__class__.__name__
 
 
+class _Composite(EPDFilter):
+    def __init__(self, *filters: EPDFilter):
+        self.filters = tuple(
+            g for f in filters for g in (f.filters if type(f) is type(self) else (f,))
+        )
+
+    @property
+    def columnar(self) -> bool:
+        return all(f.columnar for f in self.filters)
+
+    def prepare(self, epds: list[IlcdProcess]) -> None:
+        for f in self.filters:
+            f.prepare(epds)
+
+
+class AllOf(_Composite):
+    """Accepts EPDs accepted by every filter, tried in order."""
+
+    def matches(self, epd: IlcdProcess) -> bool:
+        return all(f.matches(epd) for f in self.filters)
+
+    def __repr__(self):
+        return "(" + " & ".join(map(repr, self.filters)) + ")"
+
+
+class AnyOf(_Composite):
+    """Accepts EPDs accepted by at least one filter, tried in order."""
+
+    def matches(self, epd: IlcdProcess) -> bool:
+        return any(f.matches(epd) for f in self.filters)
+
+    def __repr__(self):
+        return "(" + " | ".join(map(repr, self.filters)) + ")"
+
+
 class UUIDFilter(EPDFilter):
+    reason = Reason.UUID
+    columnar = True
+
     def __init__(self, matches: dict):
         self.uuids = matches.get("uuids", matches)
 
     def matches(self, epd: IlcdProcess) -> bool:
         return epd.uuid in self.uuids
 
+    def mask(self, epds: Sequence) -> np.ndarray:
+        located = _corpus_rows(epds)
+        if located is not None:
+            corpus, rows = located
+            return corpus.uuid_mask(self.uuids)[rows]
+        wanted = set(self.uuids)
+        return np.fromiter(
+            (e.uuid in wanted for e in epds), dtype=bool, count=len(epds)
+        )
+
+    def failure_text(self) -> str:
+        return f"UUID does not match {self.uuids}."
+
     def __repr__(self):
         return f"{self.__class__.__name__}(uuids={self.uuids})"
 
 
 class UnitConformityFilter(EPDFilter):
+    reason = Reason.UNIT
+
     def __init__(self, target_kwargs):
         self.target_kwargs = target_kwargs
         self.last_failure = None
+        # bit of the target rescaling in the EPD rescaling masks
+        self.rescaling = rescaling_index(target_kwargs)
+
+    def missing_field(self, epd: IlcdProcess) -> str | None:
+        """
+        The rescale error ``epd`` is bound to hit because a target field is
+        not derivable, read from its field bits without rescaling.
+        """
+        if self.rescaling is None:
+            return None
+        if isinstance(epd, EpdRow):
+            if epd.rescalings >> self.rescaling & 1:
+                return None
+            bits = epd.derived_bits
+        elif isinstance(epd.material, Material):
+            bits = epd.material.derived_bits()
+        else:
+            return None
+        return missing_field_error(bits, self.target_kwargs)
+
+    def prepare(self, epds: list[IlcdProcess]) -> None:
+        """Rescale all candidate materials in one batch; ``matches`` reuses it."""
+        materials = []
+        for epd in epds:
+            try:
+                epd.get_ref_flow()
+            except Exception:
+                continue
+            if self.missing_field(epd) is None and isinstance(epd.material, Material):
+                materials.append(epd.material)
+        rescale_many(materials, self.target_kwargs)
 
     def matches(self, epd: IlcdProcess) -> bool:
         self.last_failure = None
@@ -58,6 +214,18 @@ class UnitConformityFilter(EPDFilter):
             )
             return False
 
+        missing = self.missing_field(epd)
+        if missing is not None:
+            self.last_failure = f"Flow XML could not be rescaled: {missing}"
+            logger.debug(
+                "Flow rescale skipped",
+                epd_uuid=epd.uuid,
+                flow_uuid=epd.ref_flow.uuid,
+                target_kwargs=self.target_kwargs,
+                reason=missing,
+            )
+            return False
+
         logger.debug(
             "Material before rescale",
             epd_uuid=epd.uuid,
@@ -73,7 +241,7 @@ class UnitConformityFilter(EPDFilter):
                 flow_uuid=epd.ref_flow.uuid,
                 target_kwargs=self.target_kwargs,
             )
-            epd.material.rescale(self.target_kwargs)
+            epd.material = epd.material.rescale(self.target_kwargs)
 
             logger.debug(
                 "Material after rescale",
@@ -106,17 +274,34 @@ class UnitConformityFilter(EPDFilter):
 
         return True
 
+    def failure_text(self) -> str:
+        return f"Unit conformity failed for {self.target_kwargs}."
+
     def __repr__(self):
         return f"{self.__class__.__name__}(target={self.target_kwargs})"
 
 
 class LocationFilter(EPDFilter):
+    reason = Reason.LOCATION
+    columnar = True
+
     def __init__(self, locations):
         self.locations = locations
 
     def matches(self, epd: IlcdProcess) -> bool:
         return epd.loc in self.locations
 
+    def mask(self, epds: Sequence) -> np.ndarray:
+        located = _corpus_rows(epds)
+        if located is not None:
+            corpus, rows = located
+            return corpus.loc_mask(self.locations)[rows]
+        wanted = set(self.locations)
+        return np.fromiter((e.loc in wanted for e in epds), dtype=bool, count=len(epds))
+
+    def failure_text(self) -> str:
+        return f"Location does not match {self.locations}."
+
     def __repr__(self):
         return f"{self.__class__.__name__}(code={self.locations})"
 
@@ -126,42 +311,209 @@ def filter_failure(epd, filter):
     if isinstance(filter, UnitConformityFilter) and filter.last_failure:
         return filter.last_failure
 
-    if isinstance(filter, UUIDFilter):
-        return f"UUID does not match {filter.uuids}."
-
-    if isinstance(filter, UnitConformityFilter):
-        return f"Unit conformity failed for {filter.target_kwargs}."
-
-    if isinstance(filter, LocationFilter):
-        return f"Location does not match {filter.locations}."
-
-    return f"Failed filter {filter.__class__.__name__}"
+    return filter.failure_text()
+
+
+class Rejection(NamedTuple):
+    uuid: str
+    reason: Reason
+    filter_id: int
+
+
+class RejectionLedger(Sequence):
+    """
+    Rejected EPDs stored as compact ``(uuid, reason, filter_id)`` entries.
+
+    ``filter_id`` indexes :attr:`filters`. The text of a rejection is only
+    built when an item is read: indexing and iteration yield
+    ``(uuid, text)`` pairs, like the lists the pipeline used to carry.
+    ``details`` keeps the per-EPD text of object-level filters by position.
+    """
+
+    __slots__ = ("uuids", "filter_ids", "filters", "details")
+
+    def __init__(
+        self,
+        uuids: np.ndarray | Sequence[str] = (),
+        filter_ids: np.ndarray | Sequence[int] = (),
+        filters: tuple[EPDFilter, ...] = (),
+        details: dict[int, str] | None = None,
+    ):
+        self.uuids = np.asarray(uuids, dtype=object)
+        self.filter_ids = np.asarray(filter_ids, dtype=np.intp)
+        self.filters = filters
+        self.details = details or {}
+
+    def __len__(self) -> int:
+        return len(self.uuids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        text = self.details.get(i)
+        if text is None:
+            text = self.filters[self.filter_ids[i]].failure_text()
+        return self.uuids[i], text
+
+    def __repr__(self) -> str:
+        return f"RejectionLedger({len(self)} rejected)"
+
+    @property
+    def codes(self) -> np.ndarray:
+        """:class:`Reason` code of every entry."""
+        reasons = np.array([f.reason for f in self.filters] or [0], np.uint8)
+        return reasons[self.filter_ids]
+
+    def entries(self) -> Iterator[Rejection]:
+        codes = self.codes
+        for i, uuid in enumerate(self.uuids):
+            yield Rejection(uuid, Reason(codes[i]), int(self.filter_ids[i]))
+
+
+class FilterResult(NamedTuple):
+    """
+    Outcome of :func:`evaluate`, as row positions in the candidate sequence.
+
+    ``culprits[k]`` indexes the leaf filter in ``leaves`` that rejected row
+    ``rejected[k]`` (for :class:`AnyOf`, the last alternative tried);
+    ``details`` holds the failure text of object-level filters by row.
+    """
+
+    accepted: np.ndarray
+    rejected: np.ndarray
+    culprits: np.ndarray
+    leaves: tuple[EPDFilter, ...]
+    details: dict[int, str]
+
+    @property
+    def codes(self) -> np.ndarray:
+        """:class:`Reason` code of every rejected row."""
+        reasons = np.array([leaf.reason for leaf in self.leaves] or [0], np.uint8)
+        return reasons[self.culprits]
+
+
+def evaluate(epds: Sequence, filter: EPDFilter) -> FilterResult:
+    """
+    Run ``filter`` over ``epds`` in one pass and return row positions.
+
+    Composite filters narrow the rows as they go: each :class:`AllOf` member
+    only sees the rows all earlier members accepted, each :class:`AnyOf`
+    member only the rows no earlier member accepted. Every leaf is prepared
+    and run once over its rows, columnar leaves as one mask.
+    """
+    leaves: list[EPDFilter] = []
+    details: dict[int, str] = {}
+    culprits = np.full(len(epds), -1, dtype=np.intp)
+
+    def run(f: EPDFilter, rows: np.ndarray) -> np.ndarray:
+        if isinstance(f, _Composite):
+            any_of = isinstance(f, AnyOf)
+            ok = np.full(len(rows), not any_of)
+            for child in f.filters:
+                todo = np.flatnonzero(ok != any_of)
+                if not len(todo):
+                    break
+                ok[todo] = run(child, rows[todo])
+            return ok
+
+        leaf = len(leaves)
+        leaves.append(f)
+        items = _subset(epds, rows)
+        f.prepare(items)
+        if f.columnar:
+            ok = np.asarray(f.mask(items), dtype=bool)
+            for row in rows[~ok] if details else ():
+                details.pop(int(row), None)
+        else:
+            ok = np.zeros(len(rows), dtype=bool)
+            for i, epd in enumerate(items):
+                ok[i] = f.matches(epd)
+                if not ok[i]:
+                    details[int(rows[i])] = filter_failure(epd, f)
+        culprits[rows[~ok]] = leaf
+        return ok
+
+    ok = run(filter, np.arange(len(epds)))
+    rejected = np.flatnonzero(~ok)
+    return FilterResult(
+        accepted=np.flatnonzero(ok),
+        rejected=rejected,
+        culprits=culprits[rejected],
+        leaves=tuple(leaves),
+        details={row: text for row, text in details.items() if not ok[row]},
+    )
 
 
 def get_filtered_epds(epds: list[IlcdProcess], filter: EPDFilter):
     """Filters out EPD objects that do not match and collects reason."""
-    accepted = []
-    rejected = []
-
-    for epd in epds:
-        if not filter.matches(epd):
-            rejected.append((epd.uuid, filter_failure(epd, filter)))
-        else:
-            accepted.append(epd)
-
-    return accepted, rejected
+    if isinstance(epds, EpdCorpus) and not filter.columnar:
+        # object-level filters update the views they check (rescaled material)
+        epds = list(epds)
+    result = evaluate(epds, filter)
+
+    accepted = [epds[i] for i in result.accepted]
+    located = _corpus_rows(epds)
+    if located is not None:
+        corpus, rows = located
+        uuids = corpus.uuids[rows[result.rejected]]
+    else:
+        uuids = [epds[i].uuid for i in result.rejected]
+    details = {}
+    if result.details:
+        positions = np.searchsorted(result.rejected, list(result.details))
+        details = dict(zip(positions.tolist(), result.details.values()))
+    return accepted, RejectionLedger(uuids, result.culprits, result.leaves, details)
+
+
+def select_by_uuid(
+    epds: Sequence[IlcdProcess], uuids: Sequence[str]
+) -> tuple[list[IlcdProcess], list[str]]:
+    """
+    EPDs whose uuid is requested, in corpus order, and the requested uuids
+    that are missing.
+
+    A corpus answers through its uuid index, so the cost depends on the
+    number of requested uuids, not on the corpus size.
+    """
+    if isinstance(epds, EpdCorpus):
+        matched = epds.get_many(uuids)
+    else:
+        wanted = set(uuids)
+        matched = [epd for epd in epds if epd.uuid in wanted]
+    found = {epd.uuid for epd in matched}
+    return matched, [uuid for uuid in uuids if uuid not in found]
+
+
+def location_buckets(epds: Sequence[IlcdProcess]) -> dict[str | None, list[int]]:
+    """Positions of ``epds`` grouped by location, each bucket in input order."""
+    buckets: dict[str | None, list[int]] = {}
+    for i, epd in enumerate(epds):
+        buckets.setdefault(epd.loc, []).append(i)
+    return buckets
 
 
 def get_locfiltered_epds(
-    epd_roots: list[IlcdProcess], filter: LocationFilter, max_attempts=4
+    epd_roots: list[IlcdProcess],
+    filter: LocationFilter,
+    max_attempts=4,
+    buckets: dict[str | None, list[int]] | None = None,
 ):
-    """Filters EPDS by location"""
+    """
+    Filters EPDS by location, escalating to the siblings of the wanted
+    locations (the children of their parents) while nothing matches.
+
+    ``buckets`` from :func:`location_buckets` can be shared across calls over
+    the same ``epd_roots``.
+    """
+    if buckets is None:
+        buckets = location_buckets(epd_roots)
     wanted_locations = set(filter.locations)
     for _ in range(max_attempts):
-        epds, _ = get_filtered_epds(epd_roots, filter)
-        if epds:
-            return epds
-        else:
-            wanted_locations = escalate_location_set(wanted_locations)
-            filter = LocationFilter(wanted_locations)
+        rows = [i for loc in wanted_locations & buckets.keys() for i in buckets[loc]]
+        if rows:
+            return [epd_roots[i] for i in sorted(rows)]
+        wanted_locations = escalate_locations(wanted_locations)
+        filter = LocationFilter(wanted_locations)
     raise NoMatchingEPDError(filter)
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from rich.progress import track
 import xml.etree.ElementTree as ET
 from pathlib import Path
@@ -9,9 +10,15 @@ from materia_epd.epd.cache import (
     cache_exists,
     is_cache_valid,
     load_epds_from_cache,
+    load_epds_in_memory,
     resolve_cache_dir,
 )
-from materia_epd.epd.models import IlcdProcess
+from materia_epd.epd.corpus import EpdCorpus
+from materia_epd.epd.models import GenericProcess, IlcdProcess
+
+# Generic processes prepared concurrently; preparation is mostly file and
+# network I/O (flow lookup, matches JSON, market shares).
+PREPARE_WORKERS = 8
 
 
 def gen_xml_objects(folder_path, logger):
@@ -45,6 +52,52 @@ def gen_epds(folder_path, logger):
     logger.info("XML processes files parsed")
 
 
+def _prepare_generic_process(
+    path: Path,
+) -> tuple[Path, GenericProcess | None, str | None]:
+    try:
+        process = GenericProcess.load(path, ET.parse(path).getroot())
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+    return path, process, None
+
+
+def load_generic_processes(
+    folder_path: Path, logger, *, workers: int = PREPARE_WORKERS
+) -> tuple[list[GenericProcess], list[tuple[Path, str]]]:
+    """
+    Prepare the matched generic processes of a folder on a thread pool.
+
+    At most ``workers`` products are prepared at once. Processes come back
+    sorted by file path whatever the completion order; products that fail
+    are returned as ``(path, reason)`` instead of aborting the run, and
+    products without a matches file are skipped.
+    """
+    folder = Path(folder_path)
+    if folder.is_file():
+        folder = folder.parent
+    elif not folder.is_dir():
+        e = ValueError("Not a file/folder path")
+        logger.error("Error", exec_info=e)
+        raise e
+
+    paths = sorted(folder.glob("*.xml"))
+    processes: list[GenericProcess] = []
+    failures: list[tuple[Path, str]] = []
+    with ThreadPoolExecutor(
+        max_workers=max(1, workers), thread_name_prefix="generic-prepare"
+    ) as pool:
+        for path, process, error in pool.map(_prepare_generic_process, paths):
+            if error is not None:
+                logger.warning(
+                    "Generic process preparation failed", path=str(path), error=error
+                )
+                failures.append((path, error))
+            elif process is not None:
+                processes.append(process)
+    return processes, failures
+
+
 def load_epd_corpus(
     epd_folder: Path,
     cache_dir: Path | None,
@@ -55,10 +108,18 @@ def load_epd_corpus(
     console: Console | None = None,
     verbose: bool = False,
     disable_progress: bool = False,
-) -> list[IlcdProcess]:
-    """Load source EPDs from cache (building if needed) or directly from XML."""
+) -> EpdCorpus:
+    """
+    Load source EPDs from cache (building if needed) or directly from XML.
+
+    ``epd_folder`` may also be an ILCD ZIP export; it is read in place.
+    Without the cache, EPDs are extracted in memory by the same engine.
+    """
     if not use_cache:
-        return list(gen_epds(epd_folder / "processes", logger))
+        logger.info("Extracting EPD corpus in memory (no cache)")
+        return load_epds_in_memory(
+            epd_folder, disable_progress=disable_progress, verbose=verbose
+        )
 
     resolved_cache = resolve_cache_dir(cache_dir)
     out = console or Console()
@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Union
 
@@ -15,12 +16,71 @@ from materia_epd.core.constants import (
     UNIT_QUANTITY_MAPPING,
     XP,
 )
+from materia_epd.core.lookups import (
+    MATERIAL_FIELDS,
+    PROPERTY_UNIT_BY_FIELD,
+    QUANTITY_UNIT_BY_FIELD,
+    UNIT_BY_FLOW_PROPERTY_UUID,
+    canonical_indicator,
+)
 from materia_epd.core.physics import Material, check_properties_ranges
 from materia_epd.core.utils import qn_uri, to_float
+from materia_epd.epd.extract import parse_base_names, parse_hs_classes
 from materia_epd.geo.locations import ilcd_to_iso_location
-from materia_epd.io.files import latest_flow_file, read_json_file, write_xml_root
+from materia_epd.io.files import (
+    indent_subtree,
+    latest_flow_file,
+    read_json_file,
+    write_xml_root,
+)
 from materia_epd.metrics.normalize import normalize_module_values
-from materia_epd.resources import get_indicator_synonyms, get_market_shares
+from materia_epd.resources import get_market_shares
+
+_MAT = {
+    name: qn_uri(NS["mat"], name)
+    for name in (
+        "Material",
+        "BulkDetails",
+        "Metadata",
+        "PropertyData",
+        "Data",
+        "PropertyDetails",
+        "Name",
+        "Units",
+        "Unit",
+    )
+}
+_FLOW = {
+    name: qn_uri(NS["flow"], name)
+    for name in ("flowProperty", "referenceToFlowPropertyDataSet", "meanValue")
+}
+_COMMON_SHORT_DESC = qn_uri(NS["common"], "shortDescription")
+_LCIA_RESULT_TAG = qn_uri(NS["proc"], "LCIAResult")
+_AMOUNT_TAG = qn_uri(NS["epd"], "amount")
+
+# Attribute names carrying the module of an ``epd:amount``, by priority.
+_AMOUNT_MODULE_ATTRS = ("module", "phase", "stageId", "lifecycleModule")
+
+
+@lru_cache(maxsize=None)
+def _module_attr_rank(key: str) -> int | None:
+    local = key.rsplit("}", 1)[-1]
+    if local in _AMOUNT_MODULE_ATTRS:
+        return _AMOUNT_MODULE_ATTRS.index(local)
+    return None
+
+
+def _amount_module(el: ET.Element) -> str | None:
+    """Module of an amount: the first non-empty attribute by priority."""
+    best, best_rank, seen = None, len(_AMOUNT_MODULE_ATTRS), 0
+    for key, value in el.attrib.items():
+        rank = _module_attr_rank(key)
+        if rank is None or seen & (1 << rank):
+            continue
+        seen |= 1 << rank
+        if value and rank < best_rank:
+            best, best_rank = value, rank
+    return best
 
 
 @dataclass
@@ -56,14 +116,7 @@ class IlcdFlow:
                     ),
                     None,
                 )
-                unit = next(
-                    (
-                        symbol
-                        for symbol, mapped_uuid in FLOW_PROPERTY_MAPPING.items()
-                        if mapped_uuid == uuid
-                    ),
-                    None,
-                )
+                unit = UNIT_BY_FLOW_PROPERTY_UUID.get(uuid)
 
                 self.units.append(
                     {
@@ -118,6 +171,10 @@ class IlcdProcess:
     loc: Union[None, str] = None
     ref_flow: Union[IlcdFlow, RefFlowRef, None] = None
     _raw_lcia: Union[dict[str, dict[str, float | None]], None] = None
+    base_names: Union[dict[str, str], None] = None
+    hs_classes: Union[list[dict[str, str]], None] = None
+    dec_unit: Union[str, None] = None
+    ref_flow_property: Union[str, None] = None
 
     def __post_init__(self):
         if self.root is not None:
@@ -148,9 +205,23 @@ class IlcdProcess:
         material_kwargs: dict,
         raw_lcia: dict[str, dict[str, float | None]],
         epd_folder: Path,
+        base_names: dict[str, str] | None = None,
+        hs_classes: list[dict[str, str]] | None = None,
+        dec_unit: str | None = None,
+        ref_flow_property: str | None = None,
     ) -> IlcdProcess:
         path = epd_folder / "processes" / source_path
-        proc = cls(root=None, path=path, uuid=uuid, loc=loc, _raw_lcia=raw_lcia)
+        proc = cls(
+            root=None,
+            path=path,
+            uuid=uuid,
+            loc=loc,
+            _raw_lcia=raw_lcia,
+            base_names=base_names,
+            hs_classes=hs_classes,
+            dec_unit=dec_unit,
+            ref_flow_property=ref_flow_property,
+        )
         proc.ref_flow = RefFlowRef(uuid=ref_flow_uuid)
         proc.material_kwargs = material_kwargs
         proc.material = Material(**material_kwargs)
@@ -180,11 +251,7 @@ class IlcdProcess:
         exchange_amount = to_float(
             ref_flow_exchange.findtext(XP.MEAN_AMOUNT, namespaces=NS), positive=True
         )
-        kwargs = {
-            v: None
-            for v in set(UNIT_QUANTITY_MAPPING.values())
-            | set(UNIT_PROPERTY_MAPPING.values())
-        }
+        kwargs = dict.fromkeys(MATERIAL_FIELDS)
 
         for u in self.ref_flow.units:
             field = UNIT_QUANTITY_MAPPING.get(u.get("Unit"))
@@ -202,6 +269,9 @@ class IlcdProcess:
         self.material = Material(**kwargs)
 
     def get_declared_unit(self) -> str | None:
+        if isinstance(self.ref_flow, RefFlowRef):
+            return self.dec_unit
+
         ref_id = self.ref_flow.root.find(XP.REF_TO_REF_FLOW_PROP, NS).text
 
         flow_props = self.ref_flow.root.find(XP.FLOW_PROPERTIES, NS)
@@ -213,10 +283,11 @@ class IlcdProcess:
         ref = ref_fp.find(XP.REF_TO_FLOW_PROP, NS)
         uuid = ref.get(ATTR.REF_OBJECT_ID)
 
-        uuid_to_unit = {v: k for k, v in FLOW_PROPERTY_MAPPING.items()}
-        unit_symbol = uuid_to_unit.get(uuid)
+        unit_symbol = UNIT_BY_FLOW_PROPERTY_UUID.get(uuid)
 
+        self.ref_flow_property = uuid
         self.dec_unit = UNIT_QUANTITY_MAPPING.get(unit_symbol)
+        return self.dec_unit
 
     def get_lcia_results(self) -> list[dict]:
         if self._raw_lcia is not None:
@@ -228,9 +299,7 @@ class IlcdProcess:
             results = []
             for name, modules in self._raw_lcia.items():
                 values = {
-                    mod: (
-                        val * scaling_factor if val is not None else None
-                    )
+                    mod: (val * scaling_factor if val is not None else None)
                     for mod, val in modules.items()
                 }
                 results.append({"name": name, "values": values})
@@ -259,23 +328,24 @@ class IlcdProcess:
                 amount_elems, scaling_factor=self.material.scaling_factor
             )
 
-            canon = next(
-                (
-                    c
-                    for c, aliases in get_indicator_synonyms().items()
-                    if name in aliases
-                ),
-                None,
-            )
+            canon = canonical_indicator(name)
             if canon:
                 results.append({"name": canon, "values": values})
 
         self.lcia_results = results
 
     def get_hs_class(self) -> str:
+        if self.root is None and self.hs_classes is not None:
+            self.hs_class = next(
+                (c["class_id"] or None for c in self.hs_classes if c["level"] == "2"),
+                None,
+            )
+            return self.hs_class
+
         hs_node = self.root.find(XP.HS_CLASSIFICATION, NS)
         top_class = hs_node.find(XP.CLASS_LEVEL_2, NS)
         self.hs_class = top_class.attrib.get(ATTR.CLASS_ID)
+        return self.hs_class
 
     def get_market(self) -> dict:
         self.market = get_market_shares(self.loc, self.hs_class)
@@ -286,43 +356,33 @@ class IlcdProcess:
         matches_path = os.path.join(MATCHES_FOLDER, f"{self.uuid}.json")
         self.matches = read_json_file(matches_path)
 
-    def write_process(
-        self, results: dict[str, dict[str, float]], out_path: Path
-    ) -> bool:
-        def _get_attr_local(el: ET.Element, local: str):
-            for k, v in el.attrib.items():
-                if k.rsplit("}", 1)[-1] == local:
-                    return v
-            return None
-
-        lcia_map = {
-            next(
+    def _lcia_amount_index(self) -> dict[str, dict[str, ET.Element]]:
+        """Map indicator name -> module -> ``epd:amount`` element in one pass."""
+        index = {}
+        for r in self.root.iter(_LCIA_RESULT_TAG):
+            name = next(
                 (
                     sd.text.strip()
-                    for sd in r.findall(f"{XP.REF_TO_LCIA_METHOD}/{XP.SHORT_DESC}", NS)
+                    for sd in r.iterfind(f"{XP.REF_TO_LCIA_METHOD}/{XP.SHORT_DESC}", NS)
                     if sd.attrib.get(ATTR.LANG) == "en"
                 ),
                 "Unknown",
-            ): r
-            for r in self.root.findall(XP.LCIA_RESULT, NS)
-        }
-
-        for ind, stages in results.items():
-            r = lcia_map.get(ind)
-            if r is None:
-                continue
-
+            )
             by_module = {}
-            for el in r.findall(XP.AMOUNT, NS):
-                mod = (
-                    _get_attr_local(el, "module")
-                    or _get_attr_local(el, "phase")
-                    or _get_attr_local(el, "stageId")
-                    or _get_attr_local(el, "lifecycleModule")
-                )
-                if mod:
+            for el in r.iter(_AMOUNT_TAG):
+                if mod := _amount_module(el):
                     by_module[mod] = el
+            index[name] = by_module
+        return index
 
+    def write_process(
+        self, results: dict[str, dict[str, float]], out_path: Path
+    ) -> bool:
+        amounts = self._lcia_amount_index()
+        for ind, stages in results.items():
+            by_module = amounts.get(ind)
+            if by_module is None:
+                continue
             for stage, val in stages.items():
                 el = by_module.get(stage)
                 if el is not None:
@@ -343,48 +403,40 @@ class IlcdProcess:
         for ch in list(flow_props):
             flow_props.remove(ch)
 
-        material = ET.SubElement(matml, qn_uri(NS.get("mat"), "Material"))
-        bulk = ET.SubElement(material, qn_uri(NS.get("mat"), "BulkDetails"))
-        meta = ET.SubElement(matml, qn_uri(NS.get("mat"), "Metadata"))
+        material = ET.SubElement(matml, _MAT["Material"])
+        bulk = ET.SubElement(material, _MAT["BulkDetails"])
+        meta = ET.SubElement(matml, _MAT["Metadata"])
 
         for prop, value in kwargs.items():
-            unit = {v: k for k, v in UNIT_PROPERTY_MAPPING.items()}.get(prop)
+            unit = PROPERTY_UNIT_BY_FIELD.get(prop)
             if unit is None or value is None:
                 continue
 
             pd = ET.SubElement(
                 bulk,
-                qn_uri(NS.get("mat"), "PropertyData"),
+                _MAT["PropertyData"],
                 {ATTR.PROPERTY: f"pr_{prop}"},
             )
-            ET.SubElement(
-                pd, qn_uri(NS.get("mat"), "Data"), {"format": "float"}
-            ).text = fmt(value)
+            ET.SubElement(pd, _MAT["Data"], {"format": "float"}).text = fmt(value)
 
-            det = ET.SubElement(
-                meta, qn_uri(NS.get("mat"), "PropertyDetails"), {ATTR.ID: f"pr_{prop}"}
-            )
-            ET.SubElement(det, qn_uri(NS.get("mat"), "Name")).text = prop.replace(
-                "_", " "
-            )
+            det = ET.SubElement(meta, _MAT["PropertyDetails"], {ATTR.ID: f"pr_{prop}"})
+            ET.SubElement(det, _MAT["Name"]).text = prop.replace("_", " ")
             units = ET.SubElement(
                 det,
-                qn_uri(NS.get("mat"), "Units"),
+                _MAT["Units"],
                 {ATTR.NAME: unit, "description": unit},
             )
             if "/" in unit:
                 num, den = unit.split("/", 1)
-                u1 = ET.SubElement(units, qn_uri(NS.get("mat"), "Unit"))
-                ET.SubElement(u1, qn_uri(NS.get("mat"), "Name")).text = num.strip()
+                u1 = ET.SubElement(units, _MAT["Unit"])
+                ET.SubElement(u1, _MAT["Name"]).text = num.strip()
                 base = den.strip().split("^")[0]
                 power = -int(den.strip().split("^")[1]) if "^" in den else -1
-                u2 = ET.SubElement(
-                    units, qn_uri(NS.get("mat"), "Unit"), {"power": str(power)}
-                )
-                ET.SubElement(u2, qn_uri(NS.get("mat"), "Name")).text = base
+                u2 = ET.SubElement(units, _MAT["Unit"], {"power": str(power)})
+                ET.SubElement(u2, _MAT["Name"]).text = base
             else:
-                u = ET.SubElement(units, qn_uri(NS.get("mat"), "Unit"))
-                ET.SubElement(u, qn_uri(NS.get("mat"), "Name")).text = unit
+                u = ET.SubElement(units, _MAT["Unit"])
+                ET.SubElement(u, _MAT["Name"]).text = unit
 
         quantity_list = [
             {
@@ -394,9 +446,7 @@ class IlcdProcess:
                 "uuid": FLOW_PROPERTY_MAPPING.get(u),
             }
             for k, v in kwargs.items()
-            if (u := {v: k for k, v in UNIT_QUANTITY_MAPPING.items()}.get(k))
-            is not None
-            and v is not None
+            if (u := QUANTITY_UNIT_BY_FIELD.get(k)) is not None and v is not None
         ]
 
         quantity_list = [
@@ -408,12 +458,12 @@ class IlcdProcess:
         for idx, item in enumerate(quantity_list):
             fp = ET.SubElement(
                 flow_props,
-                qn_uri(NS.get("flow"), "flowProperty"),
+                _FLOW["flowProperty"],
                 {"dataSetInternalID": str(idx)},
             )
             ref = ET.SubElement(
                 fp,
-                qn_uri(NS.get("flow"), "referenceToFlowPropertyDataSet"),
+                _FLOW["referenceToFlowPropertyDataSet"],
                 {
                     ATTR.REF_OBJECT_ID: item["uuid"],
                     "version": "00.00.000",  # TODO: make dynamic
@@ -421,15 +471,126 @@ class IlcdProcess:
                     "uri": f"../flowproperties/{item['uuid']}.xml",
                 },
             )
-            sd = ET.SubElement(
-                ref, qn_uri(NS.get("common"), "shortDescription"), {ATTR.LANG: "en"}
-            )
+            sd = ET.SubElement(ref, _COMMON_SHORT_DESC, {ATTR.LANG: "en"})
             sd.text = ILCD_QUANTITY_LABELS.get(
                 item["property"], item["property"].title()
             )
-            ET.SubElement(fp, qn_uri(NS.get("flow"), "meanValue")).text = fmt(
-                item["value"]
-            )
+            ET.SubElement(fp, _FLOW["meanValue"]).text = fmt(item["value"])
 
+        indent_subtree(self.ref_flow.root, matml)
+        indent_subtree(self.ref_flow.root, flow_props)
         file_path = out_path / "flows" / f"{self.ref_flow.uuid}.xml"
         return write_xml_root(self.ref_flow.root, file_path)
+
+
+class GenericProcess:
+    """
+    Compact record of a generic process, held for the whole run.
+
+    Only the metadata the pipeline reads is kept; the process and flow XML
+    trees are released once it is extracted; :meth:`reload` parses them
+    again, only for writing outputs.
+    """
+
+    __slots__ = (
+        "path",
+        "uuid",
+        "loc",
+        "ref_flow_uuid",
+        "material_kwargs",
+        "material",
+        "dec_unit",
+        "ref_flow_property",
+        "hs_class",
+        "base_names",
+        "hs_classes",
+        "market",
+        "matches",
+        "lcia_results",
+    )
+
+    root = None
+
+    def __init__(
+        self,
+        *,
+        path: Path,
+        uuid: str | None,
+        loc: str | None,
+        ref_flow_uuid: str | None,
+        material_kwargs: dict,
+        dec_unit: str | None,
+        ref_flow_property: str | None,
+        hs_class: str | None,
+        base_names: dict[str, str],
+        hs_classes: list[dict[str, str]],
+        market: dict | None,
+        matches: dict | None,
+        lcia_results: list[dict],
+    ) -> None:
+        self.path = path
+        self.uuid = uuid
+        self.loc = loc
+        self.ref_flow_uuid = ref_flow_uuid
+        self.material_kwargs = material_kwargs
+        self.material = Material(**material_kwargs)
+        self.dec_unit = dec_unit
+        self.ref_flow_property = ref_flow_property
+        self.hs_class = hs_class
+        self.base_names = base_names
+        self.hs_classes = hs_classes
+        self.market = market
+        self.matches = matches
+        self.lcia_results = lcia_results
+
+    def __repr__(self) -> str:
+        return f"GenericProcess(uuid={self.uuid!r}, loc={self.loc!r})"
+
+    @classmethod
+    def from_process(cls, process: IlcdProcess) -> GenericProcess:
+        """Extract the record from a fully loaded (matched) IlcdProcess."""
+        process.get_lcia_results()
+        return cls(
+            path=process.path,
+            uuid=process.uuid,
+            loc=process.loc,
+            ref_flow_uuid=process.ref_flow.uuid,
+            material_kwargs=process.material_kwargs,
+            dec_unit=process.dec_unit,
+            ref_flow_property=process.ref_flow_property,
+            hs_class=process.hs_class,
+            base_names=parse_base_names(process.root),
+            hs_classes=parse_hs_classes(process.root),
+            market=process.market,
+            matches=process.matches,
+            lcia_results=process.lcia_results,
+        )
+
+    @classmethod
+    def load(cls, path: Path, root: ET.Element) -> GenericProcess | None:
+        """
+        Load a generic process, or None when it has no matches file.
+
+        The matches file is checked first so unmatched products are never
+        resolved further.
+        """
+        process = IlcdProcess(root=root, path=path)
+        process.get_matches()
+        if not process.matches:
+            return None
+        process.get_ref_flow()
+        process.get_declared_unit()
+        process.get_hs_class()
+        process.get_market()
+        return cls.from_process(process)
+
+    def get_lcia_results(self) -> list[dict]:
+        return self.lcia_results
+
+    def reload(self) -> IlcdProcess:
+        """Parse the process and reference flow XML again, e.g. to write them."""
+        process = IlcdProcess(root=ET.parse(self.path).getroot(), path=self.path)
+        process.get_ref_flow()
+        process.dec_unit = self.dec_unit
+        process.ref_flow_property = self.ref_flow_property
+        return process
@@ -0,0 +1,63 @@
+"""Process-pool worker setup for EPD extraction.
+
+Referenced by the pool as ``initializer``; under spawn it is the first
+materia_epd module a worker imports, so it must stay import-light.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+
+def warm_extraction_tables() -> None:
+    """Load the lookup tables extraction needs, once per process."""
+    from materia_epd.core.lookups import INDICATOR_BY_ALIAS  # noqa: F401
+    from materia_epd.resources import get_ilcd_location_table
+
+    get_ilcd_location_table()
+
+
+def init_extraction_worker(startup_queue=None, pool_started_at: float | None = None):
+    """
+    Import the extraction module and warm its tables before the first task.
+
+    When ``startup_queue`` is given, report ``{"pid", "spawn_s", "import_s",
+    "warm_s"}``; ``spawn_s`` is measured against the parent's wall clock
+    ``pool_started_at`` and covers interpreter start-up under spawn.
+    """
+    started = time.perf_counter()
+    spawn_s = time.time() - pool_started_at if pool_started_at is not None else None
+
+    import materia_epd.epd.extract  # noqa: F401
+
+    imported = time.perf_counter()
+    warm_extraction_tables()
+    warmed = time.perf_counter()
+
+    if startup_queue is not None:
+        startup_queue.put(
+            {
+                "pid": os.getpid(),
+                "spawn_s": spawn_s,
+                "import_s": imported - started,
+                "warm_s": warmed - imported,
+            }
+        )
+
+
+def summarize_worker_startup(entries: list[dict]) -> dict:
+    """Aggregate the start-up reports of all extraction workers."""
+    if not entries:
+        return {"count": 0}
+    totals = [(e.get("spawn_s") or 0.0) + e["import_s"] + e["warm_s"] for e in entries]
+    summary = {
+        "count": len(entries),
+        "mean_s": round(sum(totals) / len(totals), 6),
+        "max_s": round(max(totals), 6),
+    }
+    for key in ("spawn_s", "import_s", "warm_s"):
+        values = [e[key] for e in entries if e.get(key) is not None]
+        if values:
+            summary[f"{key[:-2]}_max_s"] = round(max(values), 6)
+    return summary
@@ -1,19 +1,61 @@
-import pycountry
+from functools import lru_cache
 
+from materia_epd.resources import get_ilcd_location_table
 from materia_epd.resources import get_location_data
 from materia_epd.resources import get_regions_mapping
+from materia_epd.resources import iter_json_from_package_folder
 
+# Imported lazily: only codes missing from the packaged table need pycountry.
+pycountry = None
 
-def ilcd_to_iso_location(ilcd_code):
-    """Convert an ILCD location code to an ISO-compliant location code."""
+_DIRECT_ILCD_LOCATIONS = {"GLO": "GLO", "UK": "GBR"}
+
+
+def _get_pycountry():
+    global pycountry
+    if pycountry is None:
+        import pycountry as _pycountry
+
+        pycountry = _pycountry
+    return pycountry
+
+
+def _translate_ilcd_location(ilcd_code):
+    """Resolve an ILCD code through the direct map, regions and pycountry."""
+    countries = _get_pycountry()
     return (
-        {"GLO": "GLO", "UK": "GBR"}.get(ilcd_code)
+        _DIRECT_ILCD_LOCATIONS.get(ilcd_code)
         or (get_regions_mapping().get(ilcd_code) or {}).get("Regions")
-        or getattr(pycountry.countries.get(alpha_2=ilcd_code), "alpha_3", None)
-        or getattr(pycountry.historic_countries.get(alpha_2=ilcd_code), "alpha_3", None)
+        or getattr(countries.countries.get(alpha_2=ilcd_code), "alpha_3", None)
+        or getattr(countries.historic_countries.get(alpha_2=ilcd_code), "alpha_3", None)
     )
 
 
+def build_ilcd_location_table() -> dict[str, str]:
+    """Build the ILCD -> ISO table shipped as ``data/ilcd_locations.json``.
+
+    Covers every code the runtime chain can resolve: the direct overrides,
+    the regions mapping and all current and historic pycountry alpha-2 codes.
+    """
+    countries = _get_pycountry()
+    codes = {
+        *_DIRECT_ILCD_LOCATIONS,
+        *get_regions_mapping(),
+        *(c.alpha_2 for c in countries.countries),
+        *(c.alpha_2 for c in countries.historic_countries if hasattr(c, "alpha_2")),
+    }
+    table = {code: _translate_ilcd_location(code) for code in sorted(codes)}
+    return {code: iso for code, iso in table.items() if iso}
+
+
+def ilcd_to_iso_location(ilcd_code):
+    """Convert an ILCD location code to an ISO-compliant location code."""
+    iso_code = get_ilcd_location_table().get(ilcd_code)
+    if iso_code is not None:
+        return iso_code
+    return _translate_ilcd_location(ilcd_code)
+
+
 def get_location_attribute(location_code: str, attribute: str):
     """Returns a specific attribute from a location JSON file."""
     location_data = get_location_data(location_code)  # .get(attribute)
@@ -29,6 +71,33 @@ def escalate_location_set(location_set):
     }
 
 
+@lru_cache(maxsize=1)
+def get_location_hierarchy() -> dict[str, frozenset[str]]:
+    """
+    One escalation step for every packaged location: the children of its
+    parent, read from the location files once instead of per lookup.
+    """
+    data = {
+        path.stem: location
+        for path, location in iter_json_from_package_folder("locations")
+    }
+    return {
+        code: frozenset(data[location["Parent"]].get("Children") or [])
+        for code, location in data.items()
+        if location.get("Parent") in data
+    }
+
+
+def escalate_locations(location_set) -> set[str]:
+    """:func:`escalate_location_set` through the precomputed hierarchy."""
+    hierarchy = get_location_hierarchy()
+    unknown = {loc for loc in location_set if loc not in hierarchy}
+    return set().union(
+        *(hierarchy[loc] for loc in location_set if loc in hierarchy),
+        escalate_location_set(unknown) if unknown else (),
+    )
+
+
 def get_location_color(location_code: str):
     """Return color metadata (hex + rgba) for a location, if available."""
     location_data = get_location_data(location_code) or {}
@@ -48,7 +117,9 @@ def get_transport_impact_per_kg(
         return {}
 
     impact = (
-        (source_data.get("TransportImpactPerKgByTarget") or {}).get(target_location_code)
+        (source_data.get("TransportImpactPerKgByTarget") or {}).get(
+            target_location_code
+        )
         if target_location_code
         else None
     ) or (source_data.get("TransportImpactPerKgByTarget") or {}).get("default")
@@ -65,7 +136,9 @@ def get_transport_impact_per_kg(
         return {}
 
     impact = (
-        (parent_data.get("TransportImpactPerKgByTarget") or {}).get(target_location_code)
+        (parent_data.get("TransportImpactPerKgByTarget") or {}).get(
+            target_location_code
+        )
         if target_location_code
         else None
     ) or (parent_data.get("TransportImpactPerKgByTarget") or {}).get("default")
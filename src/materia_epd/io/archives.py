@@ -0,0 +1,219 @@
+"""
+XML sources for extraction: files on disk and ILCD ZIP members.
+
+ZIP exports are read in place, without unpacking; :class:`XmlPrefetcher`
+overlaps reads of upcoming sources with parsing of the current one.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import IO, Iterable, Iterator, NamedTuple, Union
+
+from materia_epd.core.utils import _extract_version
+from materia_epd.io.files import flow_file_uuid
+
+ILCD_FOLDERS = ("processes", "flows")
+
+
+class ZipMember(NamedTuple):
+    """A picklable reference to one XML member of an ILCD ZIP export."""
+
+    archive: str
+    member: str
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.member).name
+
+    @property
+    def rel(self) -> str:
+        """Path relative to the ILCD root, e.g. ``processes/<uuid>.xml``."""
+        parts = PurePosixPath(self.member).parts
+        return "/".join(parts[-2:])
+
+    def __str__(self) -> str:
+        return f"{self.archive}/{self.member}"
+
+    def open(self) -> IO[bytes]:
+        return open_archive(self.archive).open(self.member)
+
+    def read_bytes(self) -> bytes:
+        return open_archive(self.archive).read(self.member)
+
+
+# A plain file on disk or a member of an ILCD ZIP export.
+XmlSource = Union[Path, ZipMember]
+
+
+def is_zip_source(path: Path) -> bool:
+    return Path(path).is_file() and zipfile.is_zipfile(path)
+
+
+@lru_cache(maxsize=None)
+def _open_archive(archive: str, pid: int) -> zipfile.ZipFile:
+    return zipfile.ZipFile(archive)
+
+
+def open_archive(archive: str) -> zipfile.ZipFile:
+    """
+    Return this process's shared handle on ``archive``.
+
+    Handles are keyed by pid so forked workers never reuse (and race on the
+    file offset of) a descriptor inherited from their parent; each worker
+    opens the archive once and keeps it for every member it reads.
+    """
+    return _open_archive(str(archive), os.getpid())
+
+
+def _ilcd_folder(info: zipfile.ZipInfo) -> str | None:
+    parts = PurePosixPath(info.filename).parts
+    if info.is_dir() or len(parts) < 2 or not parts[-1].lower().endswith(".xml"):
+        return None
+    return parts[-2] if parts[-2] in ILCD_FOLDERS else None
+
+
+def _xml_infos(archive: Path, folder: str | None = None) -> list[zipfile.ZipInfo]:
+    with zipfile.ZipFile(archive) as zf:
+        infos = zf.infolist()
+    return [
+        info
+        for info in infos
+        if (found := _ilcd_folder(info)) and (folder is None or found == folder)
+    ]
+
+
+def list_xml_members(archive: Path, folder: str) -> list[ZipMember]:
+    """Members of ``<folder>/*.xml`` in an ILCD export, at any prefix depth."""
+    archive_str = str(Path(archive).resolve())
+    return sorted(
+        (ZipMember(archive_str, info.filename) for info in _xml_infos(archive, folder)),
+        key=lambda m: m.rel,
+    )
+
+
+def zip_fingerprints(archive: Path) -> dict[str, dict]:
+    """Fingerprint every ILCD XML member by CRC-32 and uncompressed size."""
+    infos = sorted(_xml_infos(archive), key=lambda i: i.filename)
+    return {
+        "/".join(PurePosixPath(info.filename).parts[-2:]): {
+            "crc": info.CRC,
+            "size": info.file_size,
+        }
+        for info in infos
+    }
+
+
+def index_latest_flow_members(archive: Path) -> dict[str, ZipMember]:
+    """Map each flow uuid in an archive to the member with the latest version."""
+    archive_str = str(Path(archive).resolve())
+    candidates: dict[str, list[zipfile.ZipInfo]] = {}
+    for info in _xml_infos(archive, "flows"):
+        name = PurePosixPath(info.filename).name
+        candidates.setdefault(flow_file_uuid(Path(name)), []).append(info)
+
+    def _key(info: zipfile.ZipInfo):
+        version = _extract_version(PurePosixPath(info.filename).name)
+        return (version is not None, version or tuple(), info.date_time)
+
+    return {
+        uuid: ZipMember(archive_str, max(infos, key=_key).filename)
+        for uuid, infos in candidates.items()
+    }
+
+
+# (source key, bytes) already read by an XmlPrefetcher for the current worker call
+_PREFETCHED: ContextVar[tuple[str, bytes] | None] = ContextVar(
+    "materia_epd_prefetched_xml", default=None
+)
+
+
+def open_xml_source(source: XmlSource | str) -> IO[bytes]:
+    """Open a file path or ZIP member for binary reading."""
+    prefetched = _PREFETCHED.get()
+    if prefetched is not None and prefetched[0] == str(source):
+        return io.BytesIO(prefetched[1])
+    if isinstance(source, ZipMember):
+        return source.open()
+    return open(source, "rb")
+
+
+def read_source_bytes(source: XmlSource | str) -> bytes:
+    if isinstance(source, ZipMember):
+        return source.read_bytes()
+    return Path(source).read_bytes()
+
+
+@contextmanager
+def serve_prefetched(source: XmlSource | str, data: bytes | None) -> Iterator[None]:
+    """Make :func:`open_xml_source` return ``data`` for ``source`` in this block."""
+    token = _PREFETCHED.set((str(source), data) if data is not None else None)
+    try:
+        yield
+    finally:
+        _PREFETCHED.reset(token)
+
+
+class XmlPrefetcher:
+    """
+    Read upcoming sources on a small thread pool while the caller parses.
+
+    Iterating yields ``(source, data)`` in input order, keeping at most
+    ``read_ahead`` reads in flight. ``data`` is None when the read failed;
+    the caller then opens the source itself and gets the real error.
+    """
+
+    def __init__(
+        self,
+        sources: Iterable[XmlSource | str],
+        *,
+        threads: int = 4,
+        read_ahead: int = 16,
+    ) -> None:
+        self.sources = list(sources)
+        self.threads = max(1, threads)
+        self.read_ahead = max(1, read_ahead)
+
+    @staticmethod
+    def _read(source: XmlSource | str) -> bytes | None:
+        try:
+            return read_source_bytes(source)
+        except (OSError, KeyError):
+            return None
+
+    def __iter__(self) -> Iterator[tuple[XmlSource | str, bytes | None]]:
+        pending: deque[tuple[XmlSource | str, Future]] = deque()
+        upcoming = iter(self.sources)
+        with ThreadPoolExecutor(
+            max_workers=self.threads, thread_name_prefix="xml-prefetch"
+        ) as pool:
+            for source in upcoming:
+                pending.append((source, pool.submit(self._read, source)))
+                if len(pending) >= self.read_ahead:
+                    break
+            while pending:
+                source, future = pending.popleft()
+                data = future.result()
+                next_source = next(upcoming, None)
+                if next_source is not None:
+                    pending.append((next_source, pool.submit(self._read, next_source)))
+                yield source, data
+
+
+def read_source_text(source: XmlSource | str) -> str:
+    if isinstance(source, ZipMember):
+        return source.read_bytes().decode("utf-8")
+    return Path(source).read_text(encoding="utf-8")
+
+
+def as_xml_source(source: XmlSource | str) -> XmlSource:
+    """Normalise a worker argument (str path or ZipMember) to an XmlSource."""
+    return source if isinstance(source, ZipMember) else Path(source)
@@ -31,18 +31,154 @@ def read_xml_root(path: Path | str):
         return None
 
 
+XML_WRITE_BUFFER = 1 << 16
+_XML_DECLARATION = b"<?xml version='1.0' encoding='utf-8'?>\n"
+_TEXT_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+_ATTR_ESCAPES = str.maketrans(
+    {
+        "&": "&amp;",
+        "<": "&lt;",
+        ">": "&gt;",
+        '"': "&quot;",
+        "\r": "&#13;",
+        "\n": "&#10;",
+        "\t": "&#09;",
+    }
+)
+_ATTR_SPECIALS = frozenset('&<>"\r\n\t')
+
+
+def _escape_text(text: str) -> str:
+    if "&" in text or "<" in text or ">" in text:
+        return text.translate(_TEXT_ESCAPES)
+    return text
+
+
+def _escape_attrib(value: str) -> str:
+    if _ATTR_SPECIALS.isdisjoint(value):
+        return value
+    return value.translate(_ATTR_ESCAPES)
+
+
+def _qualified_names(root: ET.Element) -> tuple[dict, dict]:
+    """
+    Prefix every tag and attribute name like ``ElementTree.write`` does.
+
+    Returns ``({"{uri}local": "prefix:local"}, {uri: prefix})``. Raises
+    TypeError for trees the fast path does not handle (QName objects,
+    ``None`` tags), so callers can fall back to ElementTree.
+    """
+    qnames, namespaces = {}, {}
+    registered = ET._namespace_map
+
+    def add(qname):
+        if not isinstance(qname, str):
+            raise TypeError(f"unsupported name {qname!r}")
+        if qname[:1] == "{":
+            uri, local = qname[1:].rsplit("}", 1)
+            prefix = namespaces.get(uri)
+            if prefix is None:
+                prefix = registered.get(uri) or f"ns{len(namespaces)}"
+                if prefix != "xml":
+                    namespaces[uri] = prefix
+            qnames[qname] = f"{prefix}:{local}" if prefix else local
+        else:
+            qnames[qname] = qname
+
+    for elem in root.iter():
+        tag = elem.tag
+        if tag not in qnames and tag is not ET.Comment and tag is not ET.PI:
+            add(tag)
+        for key, value in elem.attrib.items():
+            if isinstance(value, ET.QName):
+                raise TypeError("QName attribute values")
+            if key not in qnames:
+                add(key)
+        if isinstance(elem.text, ET.QName):
+            raise TypeError("QName text")
+    return qnames, namespaces
+
+
+def _stream_xml(root: ET.Element, f, flush_every: int = 4096) -> None:
+    """Serialize ``root`` to the binary file ``f`` in utf-8 chunks."""
+    qnames, namespaces = _qualified_names(root)
+    chunk = []
+    out = chunk.append
+
+    def flush():
+        f.write("".join(chunk).encode("utf-8", "xmlcharrefreplace"))
+        chunk.clear()
+
+    def emit(elem, xmlns):
+        tag, text = elem.tag, elem.text
+        if tag is ET.Comment:
+            out(f"<!--{text}-->")
+        elif tag is ET.PI:
+            out(f"<?{text}?>")
+        else:
+            name = qnames[tag]
+            out("<" + name)
+            for uri, prefix in xmlns:
+                out(f' xmlns:{prefix}="{_escape_attrib(uri)}"')
+            for key, value in elem.attrib.items():
+                out(f' {qnames[key]}="{_escape_attrib(value)}"')
+            if text or len(elem):
+                out(">")
+                if text:
+                    out(_escape_text(text))
+                for child in elem:
+                    emit(child, ())
+                out(f"</{name}>")
+            else:
+                out(" />")
+        if elem.tail:
+            out(_escape_text(elem.tail))
+        if len(chunk) >= flush_every:
+            flush()
+
+    f.write(_XML_DECLARATION)
+    emit(root, sorted(namespaces.items(), key=lambda item: item[1]))
+    flush()
+
+
 def write_xml_root(root: ET.Element, path: Path | str) -> bool:
-    """Write XML root to file. Returns True if successful."""
+    """
+    Stream an XML root to file. Returns True if successful.
+
+    The tree is written as is (output matches ``ElementTree.write``): parsed
+    inputs keep their layout and rebuilt subtrees are expected to be
+    indented with :func:`indent_subtree`.
+    """
     try:
-        tree = ET.ElementTree(root)
-        ET.indent(tree, space="  ", level=0)
         Path(path).parent.mkdir(parents=True, exist_ok=True)
-        tree.write(path, encoding="utf-8", xml_declaration=True)
+        with open(path, "wb", buffering=XML_WRITE_BUFFER) as f:
+            try:
+                _stream_xml(root, f)
+            except TypeError:
+                f.seek(0)
+                f.truncate()
+                ET.ElementTree(root).write(f, encoding="utf-8", xml_declaration=True)
         return True
     except Exception:
         return False
 
 
+def element_depth(root: ET.Element, target: ET.Element) -> int:
+    """Nesting level of ``target`` below ``root`` (0 for the root itself)."""
+    stack = [(root, 0)]
+    while stack:
+        elem, depth = stack.pop()
+        if elem is target:
+            return depth
+        stack.extend((child, depth + 1) for child in elem)
+    raise ValueError("element is not part of the tree")
+
+
+def indent_subtree(root: ET.Element, elem: ET.Element, space: str = "  ") -> None:
+    """Indent ``elem`` in place at its own depth, leaving the rest of the tree."""
+    ET.indent(elem, space=space, level=element_depth(root, elem))
+
+
 def gen_json_objects(folder_path):
     """Yield (file, data) for valid JSON files in folder."""
     for file in Path(folder_path).glob("*.json"):
@@ -69,3 +205,20 @@ def latest_flow_file(flows_folder: Path, uuid: str) -> Path:
         raise FileNotFoundError(f"No flow file found for uuid={uuid} in {flows_folder}")
 
     return max(candidates, key=sort_key)
+
+
+def flow_file_uuid(path: Path) -> str:
+    """Return the flow uuid encoded in a flow file name ({uuid}[_version...].xml)."""
+    return Path(path).stem.split("_", 1)[0]
+
+
+def index_latest_flow_files(flows_folder: Path) -> dict[str, Path]:
+    """
+    Map each flow uuid in a folder to its most recent flow file.
+
+    Scans the folder once; picks versions like :func:`latest_flow_file`.
+    """
+    candidates: dict[str, list[Path]] = {}
+    for file in Path(flows_folder).glob("*.xml"):
+        candidates.setdefault(flow_file_uuid(file), []).append(file)
+    return {uuid: max(files, key=sort_key) for uuid, files in candidates.items()}
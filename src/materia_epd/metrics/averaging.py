@@ -1,3 +1,5 @@
+import numpy as np
+
 from materia_epd.core.utils import to_float
 
 
@@ -46,6 +48,28 @@ def average_impacts(impacts_list, decimals=6) -> dict[str, dict[str, float | Non
     }
 
 
+def average_impact_array(
+    values: np.ndarray,
+    indicators: tuple[str, ...],
+    modules: tuple[str, ...],
+    decimals: int = 6,
+) -> dict[str, dict[str, float]]:
+    """Same as :func:`average_impacts` for an ``(epds, indicators, modules)``
+    array with NaN where a module is absent."""
+    present = ~np.isnan(values)
+    counts = present.sum(axis=0)
+    # rows are added in order, so sums match the per-dict loop exactly
+    sums = np.where(present, values, 0.0).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = (sums / counts).tolist()
+    return {
+        indicators[i]: {
+            modules[m]: round(means[i][m], decimals) for m in np.flatnonzero(counts[i])
+        }
+        for i in np.flatnonzero(counts.any(axis=1))
+    }
+
+
 def market_weighted_impacts(
     market_shares: dict[str, float],
     results_by_country: dict[str, dict[str, dict[str, float | None]]],
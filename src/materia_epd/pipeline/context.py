@@ -1,18 +1,18 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any
+from dataclasses import dataclass, field, replace
+from typing import Any, Sequence
 
 
 @dataclass
 class EpdPipelineContext:
     process: Any | None = None
     matches: dict[str, Any] | None = None
-    all_epds: list[Any] = field(default_factory=list)
+    all_epds: Sequence[Any] = field(default_factory=list)
 
     matched_epds: list[Any] = field(default_factory=list)
     filtered_epds: list[Any] = field(default_factory=list)
-    rejected_epds: list[tuple[str, str]] = field(default_factory=list)
+    rejected_epds: Sequence[tuple[str, str]] = field(default_factory=list)
     missing_epds: list[tuple[str, str]] = field(default_factory=list)
     unmatched_epds: list[tuple[str, str]] = field(default_factory=list)
 
@@ -50,3 +50,21 @@ class EpdPipelineContext:
     def stop(self, success: bool = False) -> None:
         self.stopped = True
         self.success = success
+
+    def detached(self) -> EpdPipelineContext:
+        """
+        Copy without the process, corpus and results registry, with EPDs
+        replaced by their uuids, to pickle back from a worker process.
+        """
+        return replace(
+            self,
+            process=None,
+            all_epds=[],
+            matched_epds=[epd.uuid for epd in self.matched_epds],
+            filtered_epds=[epd.uuid for epd in self.filtered_epds],
+            market_epds={
+                country: [epd.uuid for epd in epds]
+                for country, epds in self.market_epds.items()
+            },
+            results_registry={},
+        )
@@ -0,0 +1,64 @@
+import multiprocessing
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Iterator, Sequence
+
+# Base products run on this many processes; 1 runs them one after another.
+JOBS = 1
+
+# (run, items) of the running map, inherited by the forked workers so that
+# neither the corpus nor the products are pickled; only indices and results
+# cross the process boundary.
+_shared: tuple[Callable[[Any], Any], Sequence[Any]] | None = None
+
+
+def _run_shared(index: int) -> Any:
+    run, items = _shared
+    return run(items[index])
+
+
+def can_fork() -> bool:
+    # before 3.11 the pool forks one worker per submit, after its manager and
+    # queue feeder threads are running, which can deadlock the child
+    if sys.version_info < (3, 11):
+        return False
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def map_in_order(
+    run: Callable[[Any], Any],
+    items: Sequence[Any],
+    *,
+    jobs: int = JOBS,
+    weights: Sequence[int] | None = None,
+) -> Iterator[Any]:
+    """
+    Yield ``run(item)`` for every item, in ``items`` order.
+
+    With ``jobs > 1`` the items run on forked processes that share the
+    parent's memory copy-on-write, heaviest ``weights`` first so that the
+    largest items do not finish last. Results are pickled back and yielded
+    as soon as every earlier item has completed. Without ``fork`` (Windows,
+    macOS spawn-only builds) or before Python 3.11 items run in this process.
+    """
+    global _shared
+    if jobs <= 1 or len(items) <= 1 or not can_fork():
+        for item in items:
+            yield run(item)
+        return
+
+    order = sorted(range(len(items)), key=lambda i: -weights[i] if weights else 0)
+    _shared = (run, items)
+    pool = ProcessPoolExecutor(
+        max_workers=min(jobs, len(items)),
+        mp_context=multiprocessing.get_context("fork"),
+    )
+    try:
+        # on 3.11+ a fork pool starts every worker on the first submit,
+        # before its own manager thread and before the caller starts any
+        futures: dict[int, Future] = {i: pool.submit(_run_shared, i) for i in order}
+        for i in range(len(items)):
+            yield futures[i].result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        _shared = None
@@ -16,7 +16,7 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
 
-from materia_epd.core.constants import NS
+from materia_epd.epd.extract import parse_base_names, parse_hs_classes
 from materia_epd.epd.models import IlcdProcess
 from materia_epd.geo.locations import get_location_attribute, get_location_color
 
@@ -36,17 +36,13 @@ def fit_image_in_box(reader, x0, y0, box_w, box_h):
 def extract_product_metadata(
     process: IlcdProcess,
 ) -> tuple[str, dict[str, str], list[dict[str, str]]]:
-    root = process.root
-
-    XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
-
-    # all base names by language
-    base_names: dict[str, str] = {}
-    for node in root.findall(".//ns0:name/ns0:baseName", NS):
-        if node is None or not node.text or not node.text.strip():
-            continue
-        lang = node.attrib.get(XML_LANG, "").strip().lower() or "und"
-        base_names[lang] = node.text.strip()
+    # cached EPDs carry the metadata extracted at build time
+    if process.root is None:
+        base_names = dict(process.base_names or {})
+        hs_classes = list(process.hs_classes or [])
+    else:
+        base_names = parse_base_names(process.root)
+        hs_classes = parse_hs_classes(process.root)
 
     # preferred single name
     name = next(
@@ -54,23 +50,7 @@ def extract_product_metadata(
         None,
     ) or next(iter(base_names.values()), "Unknown product")
 
-    # HS classification only
-    hs_classes: list[dict[str, str]] = []
-    for classification in root.findall(".//common:classification", NS):
-        cname = (classification.attrib.get("name") or "").strip().lower()
-        if cname != "hs classification":
-            continue
-
-        for cls in classification.findall("common:class", NS):
-            hs_classes.append(
-                {
-                    "level": (cls.attrib.get("level") or "").strip(),
-                    "class_id": (cls.attrib.get("classId") or "").strip(),
-                    "text": (cls.text or "").strip(),
-                }
-            )
-
-    return name, dict(base_names), hs_classes
+    return name, base_names, hs_classes
 
 
 def flatten_impacts(impacts: list[dict]) -> dict:
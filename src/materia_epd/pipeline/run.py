@@ -1,18 +1,24 @@
 import logging
 import structlog
+from dataclasses import replace
 from pathlib import Path
 
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 
-from materia_epd.epd.generators import gen_xml_objects, load_epd_corpus
-from materia_epd.epd.models import IlcdProcess
+from materia_epd.epd.generators import (
+    PREPARE_WORKERS,
+    load_epd_corpus,
+    load_generic_processes,
+)
+from materia_epd.epd.models import GenericProcess
 from materia_epd.core.physics import Material
-from materia_epd.pipeline.report import write_report, draw_report
 from materia_epd.pipeline.pipeline import Pipeline
 from materia_epd.pipeline.recipes import RecipeFactory
 from materia_epd.pipeline.context import EpdPipelineContext
+from materia_epd.pipeline.parallel import JOBS, map_in_order
+from materia_epd.pipeline.writer import WRITERS, OutputWriter
 
 logger = structlog.wrap_logger(logging.getLogger(__name__))
 console = Console()
@@ -84,6 +90,9 @@ def run_materia(
     epd_cache_dir: Path | None = None,
     use_epd_cache: bool = True,
     verbose: bool = False,
+    prepare_workers: int = PREPARE_WORKERS,
+    writers: int | None = None,
+    jobs: int | None = None,
 ) -> None:
     epds = load_epd_corpus(
         path_to_epd_folder,
@@ -95,18 +104,23 @@ def run_materia(
     )
     logger.info("Loaded EPD corpus", count=len(epds))
     results_registry: dict[str, dict] = {}
-    processes = []
-    for path, root in gen_xml_objects(path_to_gen_folder / "processes", logger):
-        process = IlcdProcess(root=root, path=path)
-        process.get_ref_flow()
-        process.get_declared_unit()
-        process.get_hs_class()
-        process.get_market()
-        process.get_matches()
-        if process.matches:
-            processes.append(process)
-
-    def _run_process(process: IlcdProcess) -> EpdPipelineContext:
+    processes, failures = load_generic_processes(
+        path_to_gen_folder / "processes", logger, workers=prepare_workers
+    )
+    logger.info(
+        "Prepared generic processes", count=len(processes), failed=len(failures)
+    )
+    if failures:
+        console.print(
+            f"[yellow]{len(failures)} generic process(es) could not be prepared "
+            "and are skipped:[/yellow]"
+        )
+        for path, reason in failures:
+            console.print(f"  [yellow]{path.name}[/yellow]: {reason}")
+
+    writer = OutputWriter(output_path, workers=WRITERS if writers is None else writers)
+
+    def _run_pipeline(process: GenericProcess) -> EpdPipelineContext:
         ctx = EpdPipelineContext(
             process=process,
             matches=process.matches,
@@ -118,7 +132,10 @@ def run_materia(
         )
 
         pipeline = Pipeline(RecipeFactory().build(ctx))
-        ctx = pipeline.run(ctx)
+        return pipeline.run(ctx)
+
+    def _finish(ctx: EpdPipelineContext) -> EpdPipelineContext:
+        process = ctx.process
         print_pipeline_summary(ctx)
         # log_pipeline_diagnostics(logger, ctx)
 
@@ -129,12 +146,15 @@ def run_materia(
                 "report": ctx.report,
             }
             process.material = Material(**ctx.avg_properties)
-            process.write_process(ctx.avg_gwps, output_path)
-            process.write_flow(ctx.avg_properties, output_path)
-            write_report(ctx.report, output_path, process.uuid)
-            draw_report(ctx.report, output_path, process.uuid)
+            writer.submit(process, ctx.avg_gwps, ctx.avg_properties, ctx.report)
         return ctx
 
+    def _run_process(process: GenericProcess) -> EpdPipelineContext:
+        return _finish(_run_pipeline(process))
+
+    def _run_detached(process: GenericProcess) -> EpdPipelineContext:
+        return _run_pipeline(process).detached()
+
     base_processes = [
         p for p in processes if p.matches.get("type") != "assembled"
     ]
@@ -142,37 +162,72 @@ def run_materia(
         p for p in processes if p.matches.get("type") == "assembled"
     ]
 
-    for process in base_processes:
-        _run_process(process)
+    jobs = JOBS if jobs is None else jobs
+    try:
+        if jobs > 1:
+            # base products only read the corpus; the assembled ones below
+            # need their results in the registry first
+            weights = [
+                len(epds.rows_for(p.matches.get("uuids", []))) for p in base_processes
+            ]
+            results = map_in_order(
+                _run_detached, base_processes, jobs=jobs, weights=weights
+            )
+            for process, ctx in zip(base_processes, results):
+                _finish(
+                    replace(
+                        ctx,
+                        process=process,
+                        all_epds=epds,
+                        results_registry=results_registry,
+                    )
+                )
+        else:
+            for process in base_processes:
+                _run_process(process)
+
+        while assembled_queue:
+            progressed = False
+            deferred = []
+            for process in assembled_queue:
+                ctx = _run_process(process)
+                if pipeline_has_outputs(ctx):
+                    progressed = True
+                    continue
+
+                missing_dependency_error = any(
+                    d.get("stage") == "resolve-component-results"
+                    and d.get("kind") == "error"
+                    for d in ctx.diagnostics
+                )
+                if missing_dependency_error:
+                    deferred.append(process)
+                    continue
 
-    while assembled_queue:
-        progressed = False
-        deferred = []
-        for process in assembled_queue:
-            ctx = _run_process(process)
-            if pipeline_has_outputs(ctx):
                 progressed = True
-                continue
 
-            missing_dependency_error = any(
-                d.get("stage") == "resolve-component-results" and d.get("kind") == "error"
-                for d in ctx.diagnostics
-            )
-            if missing_dependency_error:
-                deferred.append(process)
-                continue
+            if not deferred:
+                break
 
-            progressed = True
+            if not progressed:
+                unresolved = [p.uuid for p in deferred]
+                logger.warning(
+                    "Assembled processes unresolved due to missing component outputs.",
+                    processes=unresolved,
+                )
+                break
 
-        if not deferred:
-            break
+            assembled_queue = deferred
+    finally:
+        write_failures = writer.close()
 
-        if not progressed:
-            unresolved = [p.uuid for p in deferred]
-            logger.warning(
-                "Assembled processes unresolved due to missing component outputs.",
-                processes=unresolved,
+    if write_failures:
+        console.print(
+            f"[yellow]{len(write_failures)} output(s) could not be written:[/yellow]"
+        )
+        for failure in write_failures:
+            logger.warning("Output write failed", **failure._asdict())
+            console.print(
+                f"  [yellow]{failure.uuid}[/yellow] ({failure.output}): "
+                f"{failure.error}"
             )
-            break
-
-        assembled_queue = deferred
@@ -4,15 +4,18 @@ from collections import defaultdict
 from materia_epd.pipeline.context import EpdPipelineContext
 from materia_epd.core.constants import _TOL_ABS
 from materia_epd.epd.filters import (
-    UUIDFilter,
     UnitConformityFilter,
     LocationFilter,
     get_filtered_epds,
     get_locfiltered_epds,
+    location_buckets,
+    select_by_uuid,
 )
 from materia_epd.core.constants import MASS_KWARGS
 from materia_epd.core.physics import Material
+from materia_epd.epd.corpus import scale_lcia, stacked_lcia
 from materia_epd.metrics.averaging import (
+    average_impact_array,
     average_impacts,
     average_material_properties,
     market_weighted_impacts,
@@ -21,6 +24,13 @@ from materia_epd.geo.locations import get_transport_impact_per_kg
 from materia_epd.geo.locations import get_location_attribute
 
 
+def _average_epd_impacts(epds: list) -> dict[str, dict[str, float | None]]:
+    stacked = stacked_lcia(epds)
+    if stacked is None:
+        return average_impacts([epd.lcia_results for epd in epds])
+    return average_impact_array(*stacked)
+
+
 class PipelineStage(Protocol):
     name: str
 
@@ -32,16 +42,13 @@ class PrefilterByUuidStage:
     name = "prefilter-by-uuid"
 
     def run(self, ctx: EpdPipelineContext) -> None:
-        matched_epds, _ = get_filtered_epds(
-            ctx.all_epds, UUIDFilter(ctx.process.matches)
+        matched_epds, missing = select_by_uuid(
+            ctx.all_epds, ctx.process.matches["uuids"]
         )
 
         ctx.matched_epds = matched_epds
-
-        matched_uuids = {epd.uuid for epd in matched_epds}
-        for uuid in ctx.process.matches["uuids"]:
-            if uuid not in matched_uuids:
-                ctx.missing_epds.append((uuid, "EPD was not found in provided folder."))
+        for uuid in missing:
+            ctx.missing_epds.append((uuid, "EPD was not found in provided folder."))
 
         ctx.add_diagnostic(
             kind="info",
@@ -147,12 +154,10 @@ class ComputeAveragePropertiesStage:
     name = "compute-average-properties"
 
     def run(self, ctx: EpdPipelineContext) -> None:
-        for epd in ctx.filtered_epds:
-            epd.get_lcia_results()
+        scale_lcia(ctx.filtered_epds)
 
         avg_properties = average_material_properties(ctx.filtered_epds)
-        mat = Material(**avg_properties)
-        mat.rescale(ctx.active_material_kwargs)
+        mat = Material(**avg_properties).rescale(ctx.active_material_kwargs)
         ctx.avg_properties = mat.to_dict()
 
         ctx.add_diagnostic(
@@ -211,7 +216,7 @@ class ComputeAverageImpactsStage:
     name = "compute-average-impacts"
 
     def run(self, ctx: EpdPipelineContext) -> None:
-        ctx.avg_gwps = average_impacts([epd.lcia_results for epd in ctx.filtered_epds])
+        ctx.avg_gwps = _average_epd_impacts(ctx.filtered_epds)
         ctx.unmatched_epds = []
 
         ctx.add_diagnostic(
@@ -228,9 +233,10 @@ class ComputeMarketAverageImpactsStage:
     name = "compute-market-average-impacts"
 
     def run(self, ctx: EpdPipelineContext) -> None:
+        buckets = location_buckets(ctx.filtered_epds)
         market_epds = {
-            country: list(
-                get_locfiltered_epds(ctx.filtered_epds, LocationFilter({country}))
+            country: get_locfiltered_epds(
+                ctx.filtered_epds, LocationFilter({country}), buckets=buckets
             )
             for country in ctx.process.market
         }
@@ -248,7 +254,7 @@ class ComputeMarketAverageImpactsStage:
                 )
 
         ctx.market_impacts = {
-            country: average_impacts([epd.lcia_results for epd in country_epds])
+            country: _average_epd_impacts(country_epds)
             for country, country_epds in market_epds.items()
         }
 
@@ -602,7 +608,11 @@ class BuildReportStage:
             avg_physical=ctx.avg_properties,
             initial_epds=initial_candidates,
             selected_epds=len(ctx.filtered_epds) or len(ctx.assembled_components),
-            rejected_epds=ctx.rejected_epds + ctx.missing_epds + ctx.unmatched_epds,
+            rejected_epds=[
+                *ctx.rejected_epds,
+                *ctx.missing_epds,
+                *ctx.unmatched_epds,
+            ],
         )
 
         ctx.add_diagnostic(
@@ -0,0 +1,165 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from materia_epd.epd.models import GenericProcess
+from materia_epd.pipeline.report import draw_report, write_report
+
+# Background writers; XML and JSON outputs are written on this many threads
+# and PDF reports drawn on this many processes (matplotlib is not thread-safe).
+WRITERS = 4
+
+
+class WriteFailure(NamedTuple):
+    uuid: str
+    output: str
+    error: str
+
+
+def _reason(exc: BaseException) -> str:
+    return f"{type(exc).__name__}: {exc}"
+
+
+def write_process_outputs(
+    process: GenericProcess,
+    avg_gwps: dict,
+    avg_properties: dict,
+    report: dict[str, Any],
+    output_path: Path,
+) -> list[WriteFailure]:
+    """Write the process/flow XML and JSON report of one aggregated process."""
+    failures = []
+    try:
+        xml_process = process.reload()
+        if not xml_process.write_process(avg_gwps, output_path):
+            failures.append(WriteFailure(process.uuid, "process", "write failed"))
+        if not xml_process.write_flow(avg_properties, output_path):
+            failures.append(WriteFailure(process.uuid, "flow", "write failed"))
+    except Exception as e:
+        failures.append(WriteFailure(process.uuid, "xml", _reason(e)))
+    try:
+        write_report(report, output_path, process.uuid)
+    except Exception as e:
+        failures.append(WriteFailure(process.uuid, "report", _reason(e)))
+    return failures
+
+
+class OutputWriter:
+    """
+    Write pipeline outputs in the background while the next process computes.
+
+    :meth:`submit` hands one finished process over and returns at once
+    unless ``max_pending`` jobs are already queued, in which case it blocks
+    until a writer frees a slot, so finished results never pile up in
+    memory. :meth:`close` waits for every job and returns the collected
+    :class:`WriteFailure` records; a failed write never stops the run.
+
+    With ``workers=0`` everything is written inline, as before; with
+    ``pdf_processes=False`` PDFs are drawn on the writer threads instead.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        *,
+        workers: int = WRITERS,
+        max_pending: int | None = None,
+        pdf_processes: bool = True,
+    ):
+        self.output_path = output_path
+        self.workers = max(0, workers)
+        self.failures: list[WriteFailure] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(
+            max_pending or 2 * max(1, self.workers)
+        )
+        self._threads = self._pdfs = None
+        if self.workers:
+            self._threads = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="output-writer"
+            )
+            # spawn, not fork: the writer threads may hold locks at fork time
+            self._pdfs = (
+                ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                if pdf_processes
+                else self._threads
+            )
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _record(self, failures: list[WriteFailure]) -> None:
+        if failures:
+            with self._lock:
+                self.failures.extend(failures)
+
+    def _submit(self, executor, output: str, uuid: str, fn, *args) -> None:
+        self._slots.acquire()
+        try:
+            future = executor.submit(fn, *args)
+        except Exception as e:
+            self._slots.release()
+            self._record([WriteFailure(uuid, output, _reason(e))])
+            return
+
+        def _done(f: Future) -> None:
+            try:
+                exc = f.exception()
+                if exc is not None:
+                    self._record([WriteFailure(uuid, output, _reason(exc))])
+                elif output == "files":
+                    self._record(f.result())
+            finally:
+                self._slots.release()
+
+        future.add_done_callback(_done)
+
+    def submit(
+        self,
+        process: GenericProcess,
+        avg_gwps: dict,
+        avg_properties: dict,
+        report: dict[str, Any],
+    ) -> None:
+        """Queue the XML, JSON and PDF outputs of one aggregated process."""
+        uuid, out = process.uuid, self.output_path
+        if not self.workers:
+            self._record(
+                write_process_outputs(process, avg_gwps, avg_properties, report, out)
+            )
+            try:
+                draw_report(report, out, uuid)
+            except Exception as e:
+                self._record([WriteFailure(uuid, "pdf", _reason(e))])
+            return
+
+        self._submit(
+            self._threads,
+            "files",
+            uuid,
+            write_process_outputs,
+            process,
+            avg_gwps,
+            avg_properties,
+            report,
+            out,
+        )
+        self._submit(self._pdfs, "pdf", uuid, draw_report, report, out, uuid)
+
+    def close(self) -> list[WriteFailure]:
+        """Flush every queued job and return the failures, in uuid order."""
+        for executor in {self._threads, self._pdfs} - {None}:
+            executor.shutdown(wait=True)
+        self._threads = self._pdfs = None
+        self.workers = 0
+        with self._lock:
+            self.failures.sort()
+            return list(self.failures)
@@ -1,12 +1,24 @@
 # src/materia/resources.py
 from __future__ import annotations
 
+import threading
 from functools import lru_cache
 from importlib.resources import as_file, files
 
 from materia_epd.io import files as io_files
 from materia_epd.io.paths import USER_DATA_DIR
 
+# Generic processes are prepared on threads: market generation runs once per
+# (location, HS code) and the API key is asked for at most once.
+_MARKET_LOCKS: dict[tuple[str, str], threading.Lock] = {}
+_MARKET_LOCKS_GUARD = threading.Lock()
+_API_KEY_LOCK = threading.Lock()
+
+
+def _market_lock(loc_code: str, hs_code: str) -> threading.Lock:
+    with _MARKET_LOCKS_GUARD:
+        return _MARKET_LOCKS.setdefault((loc_code, hs_code), threading.Lock())
+
 
 @lru_cache(maxsize=None)
 def load_json_from_package(*path_parts):
@@ -31,6 +43,11 @@ def get_regions_mapping():
     return load_json_from_package("regions_mapping.json")
 
 
+@lru_cache(maxsize=1)
+def get_ilcd_location_table():
+    return load_json_from_package("ilcd_locations.json")
+
+
 @lru_cache(maxsize=1)
 def get_indicator_synonyms():
     return load_json_from_package("indicator_synonyms.json")
@@ -49,21 +66,27 @@ def get_market_shares(loc_code: str, hs_code: str):
                 return data
 
     user_file = USER_DATA_DIR / subfolder / filename
-    if user_file.exists():
-        data = io_files.read_json_file(user_file)
-        if data is not None:
-            return data
+    with _market_lock(loc_code, hs_code):
+        if user_file.exists():
+            data = io_files.read_json_file(user_file)
+            if data is not None:
+                return data
 
-    from materia_epd.market.market import generate_market
+        from materia_epd.market.market import generate_market
 
-    data = generate_market(loc_code, hs_code)
-    user_file.parent.mkdir(parents=True, exist_ok=True)
-    io_files.write_json_file(user_file, data)
+        data = generate_market(loc_code, hs_code)
+        user_file.parent.mkdir(parents=True, exist_ok=True)
+        io_files.write_json_file(user_file, data)
     print(f"Market share for imports of {hs_code} to {loc_code} stored in {user_file}.")
     return data
 
 
 def get_comtrade_api_key():
+    with _API_KEY_LOCK:
+        return _get_comtrade_api_key()
+
+
+def _get_comtrade_api_key():
     api_file = USER_DATA_DIR / "comtrade_api_key.json"
     if api_file.exists():
         data = io_files.read_json_file(api_file)
@@ -0,0 +1,102 @@
+# tests/unit/test_archives.py
+import os
+import pickle
+import zipfile
+
+from materia_epd.io import archives
+
+
+def _make_archive(tmp_path):
+    archive = tmp_path / "export.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("ILCD/processes/p1.xml", "<process/>")
+        zf.writestr("ILCD/flows/f1.xml", "<flow/>")
+        zf.writestr("ILCD/flows/f1_version01.00.001.xml", "<flow v='1'/>")
+        zf.writestr("ILCD/flows/f1_version00.01.000.xml", "<flow v='0'/>")
+        zf.writestr("ILCD/sources/s1.xml", "<source/>")
+        zf.writestr("ILCD/flows/readme.txt", "not xml")
+    return archive
+
+
+def test_list_members_and_fingerprints(tmp_path):
+    archive = _make_archive(tmp_path)
+    assert archives.is_zip_source(archive)
+    assert not archives.is_zip_source(tmp_path)
+
+    [member] = archives.list_xml_members(archive, "processes")
+    assert member.rel == "processes/p1.xml"
+    assert member.name == "p1.xml"
+    assert member.read_bytes() == b"<process/>"
+    with archives.open_xml_source(member) as fh:
+        assert fh.read() == b"<process/>"
+
+    fingerprints = archives.zip_fingerprints(archive)
+    assert sorted(fingerprints) == [
+        "flows/f1.xml",
+        "flows/f1_version00.01.000.xml",
+        "flows/f1_version01.00.001.xml",
+        "processes/p1.xml",
+    ]
+    assert fingerprints["processes/p1.xml"] == {
+        "crc": zipfile.crc32(b"<process/>"),
+        "size": 10,
+    }
+
+
+def test_index_latest_flow_members_prefers_highest_version(tmp_path):
+    archive = _make_archive(tmp_path)
+    index = archives.index_latest_flow_members(archive)
+    assert index["f1"].name == "f1_version01.00.001.xml"
+
+
+def test_members_pickle_and_share_one_handle_per_process(tmp_path):
+    archive = _make_archive(tmp_path)
+    member = archives.list_xml_members(archive, "processes")[0]
+    assert pickle.loads(pickle.dumps(member)) == member
+    assert archives.open_archive(member.archive) is archives.open_archive(
+        member.archive
+    )
+    assert archives.open_archive(member.archive) is archives._open_archive(
+        member.archive, os.getpid()
+    )
+
+
+def test_prefetcher_keeps_order_and_bounds_read_ahead(tmp_path, monkeypatch):
+    import threading
+    import time
+
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_read(source):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return str(source).encode()
+
+    monkeypatch.setattr(archives, "read_source_bytes", slow_read)
+    sources = [f"file-{i}.xml" for i in range(12)]
+    prefetcher = archives.XmlPrefetcher(sources, threads=8, read_ahead=3)
+
+    assert list(prefetcher) == [(s, s.encode()) for s in sources]
+    assert peak <= 3
+
+
+def test_serve_prefetched_only_matches_its_source(tmp_path):
+    on_disk = tmp_path / "a.xml"
+    on_disk.write_bytes(b"<disk/>")
+
+    with archives.serve_prefetched(on_disk, b"<prefetched/>"):
+        with archives.open_xml_source(on_disk) as fh:
+            assert fh.read() == b"<prefetched/>"
+        other = tmp_path / "b.xml"
+        other.write_bytes(b"<other/>")
+        with archives.open_xml_source(other) as fh:
+            assert fh.read() == b"<other/>"
+    with archives.open_xml_source(on_disk) as fh:
+        assert fh.read() == b"<disk/>"
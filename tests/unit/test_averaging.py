@@ -21,3 +21,34 @@ class DummyEpd:
 def test_average_material_properties_handles_empty():
     epds = [DummyEpd({"non_numeric": "x"}), DummyEpd({})]
     assert avg.average_material_properties(epds) == {}
+
+
+# ----------------------------- average_impact_array --------------------------
+
+
+def test_average_impact_array_matches_dict_average():
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(40, 3, 4)) * 1e3
+    values[rng.random(values.shape) < 0.3] = np.nan
+    values[:, 2, :] = np.nan  # indicator never declared
+    indicators, modules = ("GWP", "AP", "ODP"), ("A1-A3", "C3", "C4", "D")
+    as_dicts = [
+        [
+            {
+                "name": indicators[i],
+                "values": {
+                    modules[m]: float(row[i, m])
+                    for m in range(4)
+                    if not np.isnan(row[i, m])
+                },
+            }
+            for i in range(2)
+        ]
+        for row in values
+    ]
+
+    result = avg.average_impact_array(values, indicators, modules)
+    assert result == avg.average_impacts(as_dicts)
+    assert "ODP" not in result
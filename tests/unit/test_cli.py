@@ -71,6 +71,45 @@ def test_no_epd_cache_flag(monkeypatch, tmp_path):
     assert called["kwargs"]["use_epd_cache"] is False
 
 
+def test_writers_option(monkeypatch, tmp_path):
+    runner = CliRunner()
+    gen, epd = _setup_dirs(tmp_path)
+    called = {}
+
+    def fake_run_materia(a, b, c, **kwargs):
+        called["kwargs"] = kwargs
+
+    monkeypatch.setattr(cli, "run_materia", fake_run_materia, raising=True)
+
+    result = runner.invoke(cli.aggregate, [str(gen), str(epd), "--writers", "0"])
+    assert result.exit_code == 0
+    assert called["kwargs"]["writers"] == 0
+
+    result = runner.invoke(cli.aggregate, [str(gen), str(epd), "--writers", "-1"])
+    assert result.exit_code != 0
+
+
+def test_jobs_option(monkeypatch, tmp_path):
+    runner = CliRunner()
+    gen, epd = _setup_dirs(tmp_path)
+    called = {}
+
+    def fake_run_materia(a, b, c, **kwargs):
+        called["kwargs"] = kwargs
+
+    monkeypatch.setattr(cli, "run_materia", fake_run_materia, raising=True)
+
+    result = runner.invoke(cli.aggregate, [str(gen), str(epd), "-j", "8"])
+    assert result.exit_code == 0
+    assert called["kwargs"]["jobs"] == 8
+
+    result = runner.invoke(cli.aggregate, [str(gen), str(epd)])
+    assert called["kwargs"]["jobs"] is None
+
+    result = runner.invoke(cli.aggregate, [str(gen), str(epd), "--jobs", "0"])
+    assert result.exit_code != 0
+
+
 def test_build_cache_command(monkeypatch, tmp_path):
     runner = CliRunner()
     epd = tmp_path / "epds"
@@ -86,11 +125,12 @@ def test_build_cache_command(monkeypatch, tmp_path):
 
     result = runner.invoke(
         cli.build_cache_cmd,
-        [str(epd), "-o", str(cache_out), "--force"],
+        [str(epd), "-o", str(cache_out), "--force", "--timings"],
     )
     assert result.exit_code == 0
     assert called["args"][0] == epd
     assert called["kwargs"]["force"] is True
+    assert called["kwargs"]["timings"] is True
 
 
 def test_main_dispatches_build_cache(monkeypatch, tmp_path):
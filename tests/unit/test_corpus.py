@@ -0,0 +1,211 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from materia_epd.core.constants import VARS
+from materia_epd.epd.corpus import (
+    EpdCorpus,
+    EpdRow,
+    field_mask,
+    scale_lcia,
+    stacked_lcia,
+)
+from materia_epd.epd.models import IlcdProcess
+
+
+def _frames():
+    processes = pd.DataFrame(
+        [
+            {
+                "uuid": "a",
+                "loc": "FR",
+                "ref_flow_uuid": "flow-a",
+                "source_path": "a.xml",
+                "base_names": json.dumps({"en": "Brick"}),
+                "hs_classes": json.dumps([{"level": "2", "class_id": "6904"}]),
+                "ref_flow_property": "fp-mass",
+                "declared_unit": "mass",
+                "mass": 1.0,
+                "volume": 0.5,
+            },
+            {
+                "uuid": "b",
+                "loc": None,
+                "ref_flow_uuid": "flow-b",
+                "source_path": "b.xml",
+                "base_names": json.dumps({}),
+                "hs_classes": json.dumps([]),
+                "ref_flow_property": None,
+                "declared_unit": None,
+                "mass": 2.0,
+                "gross_density": 800.0,
+            },
+            {
+                "uuid": "c",
+                "loc": "DE",
+                "ref_flow_uuid": "flow-c",
+                "source_path": "c.xml",
+                "base_names": json.dumps({}),
+                "hs_classes": json.dumps([]),
+                "ref_flow_property": None,
+                "declared_unit": "volume",
+                "volume": 1.0,
+            },
+        ]
+    )
+    for name in VARS:
+        processes[name] = processes.get(name, pd.Series(np.nan, index=processes.index))
+    lcia = pd.DataFrame(
+        [
+            ("a", "Climate change-Total", "A1-A3", 10.0),
+            ("a", "Climate change-Total", "D", -1.0),
+            ("b", "Climate change-Total", "A1-A3", 20.0),
+            ("b", "Acidification", "C4", 0.5),
+        ],
+        columns=["uuid", "indicator", "module", "value"],
+    )
+    return processes, lcia
+
+
+@pytest.fixture
+def corpus():
+    processes, lcia = _frames()
+    return EpdCorpus.from_frames(processes, lcia, Path("/epds"))
+
+
+def test_rows_match_cache_loaded_processes(corpus):
+    epd = corpus[0]
+    reference = IlcdProcess.from_cache_record(
+        uuid="a",
+        loc="FR",
+        ref_flow_uuid="flow-a",
+        source_path="a.xml",
+        material_kwargs={**dict.fromkeys(VARS), "mass": 1.0, "volume": 0.5},
+        raw_lcia={"Climate change-Total": {"A1-A3": 10.0, "D": -1.0}},
+        epd_folder=Path("/epds"),
+        base_names={"en": "Brick"},
+        hs_classes=[{"level": "2", "class_id": "6904"}],
+        dec_unit="mass",
+        ref_flow_property="fp-mass",
+    )
+
+    assert isinstance(epd, EpdRow)
+    assert epd.root is None
+    assert (epd.uuid, epd.loc, epd.path) == (reference.uuid, "FR", reference.path)
+    assert epd.get_ref_flow().uuid == "flow-a"
+    assert epd.material_kwargs == reference.material_kwargs
+    assert epd.get_declared_unit() == "mass"
+    assert epd.get_hs_class() == reference.get_hs_class() == "6904"
+    assert epd.base_names == {"en": "Brick"}
+
+    epd.material = epd.material.rescale({"mass": 2.0})
+    reference.material = reference.material.rescale({"mass": 2.0})
+    assert epd.get_lcia_results() == reference.get_lcia_results()
+    assert epd.lcia_results[0]["values"] == {"A1-A3": 20.0, "D": -2.0}
+
+
+def test_views_are_fresh(corpus):
+    first = corpus.get("a")
+    first.material = first.material.rescale({"mass": 3.0})
+
+    again = corpus.get("a")
+    assert again.material.mass == 1.0
+    assert again.material.scaling_factor == 1.0
+
+
+def test_sequence_protocol(corpus):
+    assert len(corpus) == 3
+    assert [e.uuid for e in corpus] == ["a", "b", "c"]
+    assert corpus[-1].uuid == "c"
+    assert [e.uuid for e in corpus[1:]] == ["b", "c"]
+    assert corpus.get("missing") is None
+    with pytest.raises(IndexError):
+        corpus[3]
+
+
+def test_lcia_tensor_keeps_missing_modules_absent(corpus):
+    assert corpus.lcia.shape == (3, 2, 3)
+    assert corpus.get("b").raw_lcia == {
+        "Climate change-Total": {"A1-A3": 20.0},
+        "Acidification": {"C4": 0.5},
+    }
+    assert corpus.get("c").get_lcia_results() == []
+
+
+def test_known_bits_and_masks(corpus):
+    assert corpus.get("a").known_bits == field_mask(["mass", "volume"])
+    assert corpus.known_mask(["mass"]).tolist() == [True, True, False]
+    assert corpus.known_mask(["mass", "gross_density"]).tolist() == [
+        False,
+        True,
+        False,
+    ]
+    assert corpus.loc_mask({"FR", "DE"}).tolist() == [True, False, True]
+    assert corpus.uuid_mask(["c", "zzz"]).tolist() == [False, False, True]
+    with pytest.raises(ValueError):
+        field_mask(["colour"])
+
+
+def test_rule_propagation_columns(corpus):
+    gross_density = list(VARS).index("gross_density")
+    assert corpus.derived[:, gross_density].tolist()[:2] == [2.0, 800.0]
+    assert corpus.conflicts.tolist() == [False, False, False]
+    assert corpus.take([1]).derived[0, gross_density] == 800.0
+    assert corpus.get("a").material.rescale({"mass": 2.0}).volume == 1.0
+
+
+def test_scale_lcia_vectorized_with_lazy_dict_view(corpus):
+    a, b = corpus.get("a"), corpus.get("b")
+    a.material = a.material.rescale({"mass": 2.0})
+    assert a.lcia_results is None
+
+    scale_lcia([a, b])
+
+    assert a.lcia_values.shape == (2, 3)
+    assert a._lcia_results is None
+    assert a.lcia_results == [
+        {"name": "Climate change-Total", "values": {"A1-A3": 20.0, "D": -2.0}}
+    ]
+    values, indicators, modules = stacked_lcia([a, b])
+    assert values.shape == (2, 2, 3)
+    assert (indicators, modules) == (corpus.indicators, corpus.modules)
+    assert stacked_lcia([a, corpus.take([0])[0]]) is None
+    assert stacked_lcia([]) is None
+
+
+def test_take_and_select(corpus):
+    assert corpus.rows_for(["c", "zzz", "a"]).tolist() == [2, 0]
+    assert [e.uuid for e in corpus.get_many(["c", "zzz", "a", "c"])] == ["a", "c"]
+    assert corpus.get_many([]) == []
+
+    sub = corpus.take(corpus.rows_for(["c", "a"]))
+    assert [e.uuid for e in sub] == ["c", "a"]
+    assert sub.index == {"c": 0, "a": 1}
+    assert sub.indicators == corpus.indicators
+    assert sub.get("a").raw_lcia == corpus.get("a").raw_lcia
+
+    located = corpus.select(corpus.loc_mask({"DE"}))
+    assert [e.uuid for e in located] == ["c"]
+
+
+def test_empty_lcia_frame():
+    processes, _ = _frames()
+    corpus = EpdCorpus.from_frames(processes, pd.DataFrame(), Path("/epds"))
+    assert corpus.lcia.shape == (3, 0, 0)
+    assert corpus[0].get_lcia_results() == []
+
+
+def test_rescaling_masks_follow_derivable_fields(corpus):
+    from materia_epd.core.constants import ACCEPTED_RESCALINGS
+
+    mass, volume = (ACCEPTED_RESCALINGS.index({name}) for name in ("mass", "volume"))
+    assert [r >> mass & 1 for r in corpus.rescalings] == [1, 1, 0]
+    assert [r >> volume & 1 for r in corpus.rescalings] == [1, 1, 1]
+    for epd in corpus:
+        assert epd.rescalings == corpus.rescalings[epd.row]
+        epd.material = epd.material.rescale({"volume": 2.0})
+        assert epd.rescalings == corpus.rescalings[epd.row]
+        assert epd.derived_bits == epd.material.derived_bits()
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import json
+import zipfile
 from pathlib import Path
 
+import pandas as pd
 import pytest
 
 from materia_epd.core.constants import FLOW_PROPERTY_MAPPING
@@ -42,6 +45,14 @@ def _process_xml(
                         xmlns:proc="http://lca.jrc.it/ILCD/Process"
                         xmlns:epd="http://www.iai.kit.edu/EPD/2013">
   <common:UUID>{process_uuid}</common:UUID>
+  <proc:name>
+    <proc:baseName xml:lang="en">Product {process_uuid}</proc:baseName>
+    <proc:baseName xml:lang="fr">Produit {process_uuid}</proc:baseName>
+  </proc:name>
+  <common:classification name="HS Classification">
+    <common:class level="0" classId="72">Iron and steel</common:class>
+    <common:class level="2" classId="7208">Flat-rolled products</common:class>
+  </common:classification>
   <proc:locationOfOperationSupplyOrProduction location="{loc}" />
   <proc:quantitativeReference>
     <proc:referenceToReferenceFlow>0</proc:referenceToReferenceFlow>
@@ -68,6 +79,13 @@ def _process_xml(
 </process>"""
 
 
+def _zip_epd_folder(epd_root: Path, archive: Path, prefix: str = "ILCD/") -> Path:
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        for xml_file in sorted(epd_root.rglob("*.xml")):
+            zf.write(xml_file, prefix + xml_file.relative_to(epd_root).as_posix())
+    return archive
+
+
 def _make_epd_folder(tmp_path: Path, specs: list[dict]) -> Path:
     epd_root = tmp_path / "epds"
     flows = epd_root / "flows"
@@ -150,7 +168,7 @@ def test_cached_lcia_scales_with_rescale(epd_folder, tmp_path):
     )
     epd = cache.load_epds_from_cache(cache_dir, epd_folder)[0]
     epd.get_ref_flow()
-    epd.material.rescale({"mass": 2.0})
+    epd.material = epd.material.rescale({"mass": 2.0})
     epd.get_lcia_results()
     values = epd.lcia_results[0]["values"]
     assert values["A1-A3"] == pytest.approx(200.0)
@@ -186,22 +204,35 @@ def test_load_epd_corpus_auto_builds(epd_folder, tmp_path, monkeypatch):
     assert cache.cache_exists(cache_dir)
 
 
-def test_load_epd_corpus_no_cache_uses_xml(epd_folder):
-    class FakeLogger:
-        def info(self, *args, **kwargs):
-            pass
+class _QuietLogger:
+    def info(self, *args, **kwargs):
+        pass
+
+    def error(self, *args, **kwargs):
+        pass
 
-        def error(self, *args, **kwargs):
-            pass
 
+def test_load_epd_corpus_no_cache_extracts_in_memory(epd_folder, tmp_path):
+    cache_dir = tmp_path / "cache"
     epds = load_epd_corpus(
         epd_folder,
-        None,
-        FakeLogger(),
+        cache_dir,
+        _QuietLogger(),
         use_cache=False,
+        disable_progress=True,
     )
     assert len(epds) == 2
-    assert all(e.root is not None for e in epds)
+    assert all(e.root is None for e in epds)
+    assert not cache_dir.exists()
+
+    built_dir = tmp_path / "built"
+    cache.build_epd_cache(epd_folder, built_dir, workers=1, disable_progress=True)
+    by_uuid = {e.uuid: e for e in cache.load_epds_from_cache(built_dir, epd_folder)}
+    for epd in epds:
+        twin = by_uuid[epd.uuid]
+        assert epd.material.to_dict() == twin.material.to_dict()
+        assert epd.get_lcia_results() == twin.get_lcia_results()
+        assert epd.base_names == twin.base_names
 
 
 def test_parallel_build_workers_two(epd_folder, tmp_path):
@@ -220,13 +251,12 @@ def test_parallel_build_workers_two(epd_folder, tmp_path):
 def test_retry_paths_sequential_after_pool_failure(epd_folder, monkeypatch):
     process_path = epd_folder / "processes" / "epd-1.xml"
     path_str = str(process_path.resolve())
-    flows_folder = str((epd_folder / "flows").resolve())
     records: list[dict] = []
     failures: list[dict] = []
 
     cache._retry_paths_sequential(
         [path_str],
-        flows_folder,
+        extract.extract_process_record,
         records,
         failures,
         reason="test pool crash",
@@ -301,3 +331,342 @@ def test_build_logs_detailed_extraction_failure(epd_folder, tmp_path, monkeypatc
     assert "meanAmount" in logged[0]["error"]
     assert logged[0]["xml_line"] is not None
     assert "meanAmount" in logged[0]["detail"]
+
+
+def test_build_writes_flows_table_with_shared_flow(tmp_path):
+    epd_folder = _make_epd_folder(
+        tmp_path,
+        [
+            {"process_uuid": "epd-1", "flow_uuid": "flow-1", "mean_kg": 2.0},
+            {"process_uuid": "epd-2", "flow_uuid": "flow-2"},
+        ],
+    )
+    (epd_folder / "processes" / "epd-3.xml").write_text(
+        _process_xml("epd-3", "flow-1"), encoding="utf-8"
+    )
+    cache_dir = tmp_path / "cache"
+    cache.build_epd_cache(
+        epd_folder, cache_dir, force=True, workers=1, disable_progress=True
+    )
+
+    flows_df = pd.read_feather(cache_dir / cache.FLOWS_FEATHER)
+    assert sorted(flows_df["flow_uuid"]) == ["flow-1", "flow-2"]
+    assert flows_df.set_index("flow_uuid").loc["flow-1", "mass"] == 2.0
+
+    epds = {e.uuid: e for e in cache.load_epds_from_cache(cache_dir, epd_folder)}
+    assert epds["epd-3"].material.mass == 2.0
+    assert epds["epd-3"].material.volume is None
+
+
+def test_rebuild_reuses_unchanged_flows(epd_folder, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    cache.build_epd_cache(
+        epd_folder, cache_dir, force=True, workers=1, disable_progress=True
+    )
+
+    parsed: list[str] = []
+
+    def counting_extract_flow_record(path):
+        parsed.append(Path(path).name)
+        return extract.extract_flow_record(path)
+
+    monkeypatch.setattr(cache, "extract_flow_record", counting_extract_flow_record)
+
+    process_file = epd_folder / "processes" / "epd-1.xml"
+    process_file.write_text(process_file.read_text() + "\n", encoding="utf-8")
+    cache.build_epd_cache(
+        epd_folder, cache_dir, force=True, workers=1, disable_progress=True
+    )
+    assert parsed == []
+
+    flow_file = epd_folder / "flows" / "flow-2.xml"
+    flow_file.write_text(_flow_xml("flow-2", 3.0), encoding="utf-8")
+    cache.build_epd_cache(
+        epd_folder, cache_dir, force=True, workers=1, disable_progress=True
+    )
+    assert parsed == ["flow-2.xml"]
+    epds = {e.uuid: e for e in cache.load_epds_from_cache(cache_dir, epd_folder)}
+    assert epds["epd-2"].material.mass == 3.0
+
+
+def test_reusable_flows_match_backslash_manifest_keys(epd_folder, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache.build_epd_cache(
+        epd_folder, cache_dir, force=True, workers=1, disable_progress=True
+    )
+    fingerprints = cache._collect_source_fingerprints(epd_folder)
+    assert "flows/flow-2.xml" in fingerprints
+
+    # a manifest written on Windows by str(relative_to(...))
+    manifest = cache._read_manifest(cache_dir)
+    manifest["files"] = {
+        rel.replace("/", "\\"): fp for rel, fp in manifest["files"].items()
+    }
+    (cache_dir / cache.MANIFEST_JSON).write_text(json.dumps(manifest))
+
+    reusable = cache._load_reusable_flows(cache_dir, epd_folder, fingerprints)
+    flows = pd.read_feather(cache_dir / cache.FLOWS_FEATHER)
+    assert sorted(reusable["source_path"]) == sorted(flows["source_path"])
+    assert not reusable.empty
+
+
+def test_extract_flow_record_reads_matml_properties(tmp_path):
+    flow_path = tmp_path / "flow-1_version1.2.xml"
+    flow_path.write_text(
+        _flow_xml("flow-1").replace(
+            "</flow>",
+            """  <mat:MatML_Doc>
+    <mat:Material><mat:BulkDetails>
+      <mat:PropertyData property="pr_gross_density">
+        <mat:Data format="float">2400</mat:Data>
+      </mat:PropertyData>
+    </mat:BulkDetails></mat:Material>
+    <mat:Metadata>
+      <mat:PropertyDetails id="pr_gross_density">
+        <mat:Name>gross density</mat:Name>
+        <mat:Units name="kg/m^3" />
+      </mat:PropertyDetails>
+    </mat:Metadata>
+  </mat:MatML_Doc>
+</flow>""",
+        ),
+        encoding="utf-8",
+    )
+    record = extract.extract_flow_record(str(flow_path))
+    assert record["flow_uuid"] == "flow-1"
+    assert record["version"] == "1.2"
+    assert record["quantities"] == {"mass": 1.0}
+    assert record["properties"] == {"gross_density": 2400.0}
+
+
+def test_build_reports_process_with_missing_flow(epd_folder, tmp_path, monkeypatch):
+    (epd_folder / "flows" / "flow-2.xml").unlink()
+    logged: list[dict] = []
+    monkeypatch.setattr(
+        cache.logger, "warning", lambda _event, **kwargs: logged.append(kwargs)
+    )
+
+    cache_dir = tmp_path / "cache"
+    cache.build_epd_cache(
+        epd_folder, cache_dir, force=True, workers=1, disable_progress=True
+    )
+
+    assert [entry["file"] for entry in logged] == ["epd-2.xml"]
+    assert logged[0]["stage"] == "parse_reference_flow"
+    epds = cache.load_epds_from_cache(cache_dir, epd_folder)
+    assert [e.uuid for e in epds] == ["epd-1"]
+
+
+def test_extract_epd_record_with_timings(epd_folder):
+    record = extract.extract_epd_record(
+        str((epd_folder / "processes" / "epd-1.xml").resolve()),
+        str((epd_folder / "flows").resolve()),
+        timings=True,
+    )
+    assert set(record["timings"]) == {
+        "parse_xml",
+        "parse_reference_flow",
+        "parse_lcia",
+        "parse_metadata",
+        "flow_lookup",
+        "parse_flow_xml",
+        "parse_flow_quantities",
+        "parse_flow_properties",
+        "range_checks",
+    }
+    assert all(seconds >= 0 for seconds in record["timings"].values())
+    assert "timings" not in extract.extract_process_record(
+        str((epd_folder / "processes" / "epd-1.xml").resolve())
+    )
+
+
+def test_build_stores_timing_summary_in_manifest(epd_folder, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache.build_epd_cache(
+        epd_folder,
+        cache_dir,
+        force=True,
+        workers=1,
+        disable_progress=True,
+        timings=True,
+    )
+
+    summary = cache._read_manifest(cache_dir)["timings"]
+    assert summary["files"] == 4
+    assert summary["phases"]["parse_xml"]["count"] == 2
+    assert summary["phases"]["parse_flow_xml"]["count"] == 2
+    stats = summary["phases"]["parse_lcia"]
+    assert stats["p50_ms"] <= stats["p90_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+    assert sum(b["count"] for b in stats["histogram"]) == 2
+    assert len(summary["slowest_files"]) == 4
+    assert summary["stages"]["extract_processes"]["seconds"] >= 0
+    assert "range_checks" in summary["stages"]
+
+    cache.build_epd_cache(
+        epd_folder, cache_dir, force=True, workers=1, disable_progress=True
+    )
+    assert "timings" not in cache._read_manifest(cache_dir)
+
+
+def test_cached_epds_serve_product_metadata_without_xml(epd_folder, tmp_path):
+    import xml.etree.ElementTree as ET
+
+    from materia_epd.epd.models import IlcdProcess
+    from materia_epd.pipeline.report import extract_product_metadata
+
+    cache_dir = tmp_path / "cache"
+    cache.build_epd_cache(
+        epd_folder, cache_dir, force=True, workers=1, disable_progress=True
+    )
+    epd = next(
+        e
+        for e in cache.load_epds_from_cache(cache_dir, epd_folder)
+        if e.uuid == "epd-1"
+    )
+    assert epd.root is None
+
+    process_path = epd_folder / "processes" / "epd-1.xml"
+    parsed = IlcdProcess(root=ET.parse(process_path).getroot(), path=process_path)
+    assert extract_product_metadata(epd) == extract_product_metadata(parsed)
+    name, base_names, hs_classes = extract_product_metadata(epd)
+    assert name == "Produit epd-1"
+    assert base_names == {"en": "Product epd-1", "fr": "Produit epd-1"}
+    assert [c["class_id"] for c in hs_classes] == ["72", "7208"]
+
+    assert epd.get_hs_class() == "7208"
+    assert epd.get_declared_unit() == "mass"
+    assert epd.ref_flow_property == KG_UUID
+
+
+def _processes_frame(cache_dir: Path) -> pd.DataFrame:
+    df = pd.read_feather(cache_dir / cache.PROCESSES_FEATHER)
+    return df.sort_values("uuid").reset_index(drop=True)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_build_from_zip_matches_directory_build(tmp_path, workers):
+    epd_folder = _make_epd_folder(
+        tmp_path,
+        [
+            {"process_uuid": f"epd-{i}", "flow_uuid": f"flow-{i}", "mean_kg": i}
+            for i in range(1, 5)
+        ],
+    )
+    archive = _zip_epd_folder(epd_folder, tmp_path / "export.zip")
+
+    cache.build_epd_cache(
+        epd_folder, tmp_path / "dir-cache", force=True, workers=1, disable_progress=True
+    )
+    cache.build_epd_cache(
+        archive,
+        tmp_path / "zip-cache",
+        force=True,
+        workers=workers,
+        disable_progress=True,
+    )
+
+    pd.testing.assert_frame_equal(
+        _processes_frame(tmp_path / "zip-cache"),
+        _processes_frame(tmp_path / "dir-cache"),
+    )
+    assert cache.is_cache_valid(tmp_path / "zip-cache", archive)
+    manifest = cache._read_manifest(tmp_path / "zip-cache")
+    assert set(manifest["files"]["processes/epd-1.xml"]) == {"crc", "size"}
+
+    epds = cache.load_epds_from_cache(tmp_path / "zip-cache", archive)
+    assert sorted(e.material.mass for e in epds) == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_zip_cache_goes_stale_when_member_changes(epd_folder, tmp_path):
+    archive = _zip_epd_folder(epd_folder, tmp_path / "export.zip")
+    cache_dir = tmp_path / "cache"
+    cache.build_epd_cache(
+        archive, cache_dir, force=True, workers=1, disable_progress=True
+    )
+    assert cache.is_cache_valid(cache_dir, archive)
+
+    (epd_folder / "flows" / "flow-1.xml").write_text(
+        _flow_xml("flow-1", 5.0), encoding="utf-8"
+    )
+    _zip_epd_folder(epd_folder, archive)
+    assert not cache.is_cache_valid(cache_dir, archive)
+
+
+def test_zip_extraction_error_reports_member_and_line(tmp_path):
+    epd_folder = _make_epd_folder(
+        tmp_path, [{"process_uuid": "epd-1", "flow_uuid": "flow-1"}]
+    )
+    process_file = epd_folder / "processes" / "epd-1.xml"
+    process_file.write_text(
+        process_file.read_text().replace("<proc:meanAmount>1<", "<proc:meanAmount>-1<"),
+        encoding="utf-8",
+    )
+    archive = _zip_epd_folder(epd_folder, tmp_path / "export.zip")
+    member = cache.list_xml_members(archive, "processes")[0]
+
+    with pytest.raises(EpdExtractionError) as info:
+        extract.extract_process_record(member)
+    assert info.value.stage == "parse_reference_flow"
+    assert info.value.process_path.endswith("ILCD/processes/epd-1.xml")
+    assert info.value.xml_line is not None
+
+
+def test_load_epd_corpus_from_zip_without_cache(epd_folder, tmp_path):
+    archive = _zip_epd_folder(epd_folder, tmp_path / "export.zip")
+    epds = load_epd_corpus(
+        archive, None, _QuietLogger(), use_cache=False, disable_progress=True
+    )
+    assert sorted(e.uuid for e in epds) == sorted(
+        p.stem for p in (epd_folder / "processes").glob("*.xml")
+    )
+
+
+def test_sequential_extraction_parses_prefetched_bytes(epd_folder, monkeypatch):
+    from materia_epd.io import archives
+
+    def read_with_new_gwp(source):
+        return Path(source).read_bytes().replace(b">100.0<", b">42.0<")
+
+    monkeypatch.setattr(archives, "read_source_bytes", read_with_new_gwp)
+    paths = sorted(str(p.resolve()) for p in (epd_folder / "processes").glob("*.xml"))
+
+    records, failures = cache._extract_sequential(
+        paths,
+        extract.extract_process_record,
+        description="Extracting EPDs",
+        disable_progress=True,
+        verbose=False,
+        read_ahead=1,
+    )
+    assert failures == []
+    gwp = {r["uuid"]: r["raw_lcia"]["Climate change-Total"]["A1-A3"] for r in records}
+    assert gwp == {"epd-1": 42.0, "epd-2": 200.0}
+
+    records, _ = cache._extract_sequential(
+        paths,
+        extract.extract_process_record,
+        description="Extracting EPDs",
+        disable_progress=True,
+        verbose=False,
+        read_ahead=0,
+    )
+    assert records[0]["raw_lcia"]["Climate change-Total"]["A1-A3"] == 100.0
+
+
+def test_parallel_build_reports_worker_startup(tmp_path):
+    epd_folder = _make_epd_folder(
+        tmp_path,
+        [{"process_uuid": f"epd-{i}", "flow_uuid": f"flow-{i}"} for i in range(4)],
+    )
+    cache_dir = tmp_path / "cache"
+    cache.build_epd_cache(
+        epd_folder,
+        cache_dir,
+        force=True,
+        workers=2,
+        disable_progress=True,
+        timings=True,
+    )
+    startup = cache._read_manifest(cache_dir)["timings"]["workers"]
+    assert 1 <= startup["count"] <= 4
+    assert startup["max_s"] >= startup["mean_s"] > 0
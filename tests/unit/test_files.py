@@ -67,6 +67,43 @@ def test_write_xml_root_ok_and_failure(tmp_path):
     assert mod.write_xml_root(ET.Element("x"), blocker / "child.xml") is False
 
 
+def test_write_xml_root_matches_elementtree_output(tmp_path):
+    root = ET.fromstring(
+        '<p:a xmlns:p="urn:p" xmlns:q="urn:q" q:k="x &amp; &quot;y&quot;&#10;">'
+        '<p:b>1 &lt; 2</p:b><q:c/><!--note--><d k="" />tail</p:a>'
+    )
+    root.append(ET.Comment(" kept "))
+    root.set("{http://www.w3.org/XML/1998/namespace}lang", "en")
+
+    out = tmp_path / "fast.xml"
+    assert mod.write_xml_root(root, out) is True
+    reference = tmp_path / "reference.xml"
+    ET.ElementTree(root).write(reference, encoding="utf-8", xml_declaration=True)
+    assert out.read_bytes() == reference.read_bytes()
+
+    # QName values are left to ElementTree
+    root.set("type", ET.QName("urn:q", "t"))
+    assert mod.write_xml_root(root, out) is True
+    ET.ElementTree(root).write(reference, encoding="utf-8", xml_declaration=True)
+    assert out.read_bytes() == reference.read_bytes()
+
+
+def test_indent_subtree_matches_full_indent():
+    root = ET.fromstring("<a><b><c/></b><d/></a>")
+    ET.indent(root, space="  ")
+    c = root.find("b/c")
+    c.extend([ET.Element("e"), ET.Element("f")])
+
+    assert mod.element_depth(root, c) == 2
+    mod.indent_subtree(root, c)
+    reindented = ET.fromstring(ET.tostring(root))
+    ET.indent(reindented, space="  ")
+    assert ET.tostring(root) == ET.tostring(reindented)
+
+    with pytest.raises(ValueError):
+        mod.element_depth(root, ET.Element("z"))
+
+
 # ---------- generators ----------
 def test_gen_json_objects_filters_only_valid_json(tmp_path):
     folder = tmp_path / "jsons"
@@ -65,3 +65,208 @@ def test_locationfilter_matches_and_repr():
     assert f.matches(FakeProcess(loc="FR")) is True
     assert f.matches(FakeProcess(loc="IT")) is False
     assert "code=" in repr(f)
+
+
+def test_get_filtered_epds_prepares_unit_filter_in_batch():
+    from materia_epd.core.physics import Material, _rescale_cached
+    from materia_epd.epd.filters import UnitConformityFilter, get_filtered_epds
+
+    _rescale_cached.cache_clear()
+    epds = [
+        FakeProcess(uuid="a", material=Material(mass=2.0, volume=1.0)),
+        FakeProcess(uuid="b", material=Material(volume=1.0)),
+    ]
+    accepted, rejected = get_filtered_epds(epds, UnitConformityFilter({"mass": 4.0}))
+
+    assert [e.uuid for e in accepted] == ["a"]
+    assert accepted[0].material.mass == 4.0
+    assert rejected[0] == (
+        "b",
+        "Flow XML could not be rescaled: Cannot scale: 'mass' is None",
+    )
+    # "b" cannot derive a mass, so it is screened out and never rescaled
+    assert _rescale_cached.cache_info()[:2] == (1, 1)
+
+
+def test_unit_filter_screen_reports_the_rescale_error():
+    import pytest
+
+    from materia_epd.core.physics import Material
+    from materia_epd.epd.filters import UnitConformityFilter
+
+    material = Material(mass=5.0)
+    for targets in (
+        {"surface": 1.0, "layer_thickness": 0.1},
+        {"layer_thickness": 0.1, "surface": 1.0},
+    ):
+        f = UnitConformityFilter(targets)
+        with pytest.raises(ValueError) as exc:
+            material.rescale(targets)
+
+        assert f.missing_field(FakeProcess(material=material)) == str(exc.value)
+        assert f.matches(FakeProcess(material=material)) is False
+        assert f.last_failure == f"Flow XML could not be rescaled: {exc.value}"
+
+
+def _corpus():
+    from pathlib import Path
+
+    import numpy as np
+    import pandas as pd
+
+    from materia_epd.core.constants import VARS
+    from materia_epd.epd.corpus import EpdCorpus
+
+    locs = ["FR", None, "DE", "FR", "IT"]
+    processes = pd.DataFrame(
+        {
+            "uuid": [f"u-{i}" for i in range(5)],
+            "loc": locs,
+            **{c: None for c in ("ref_flow_uuid", "source_path", "base_names")},
+            **{c: None for c in ("hs_classes", "ref_flow_property", "declared_unit")},
+            **{name: np.nan for name in VARS},
+        }
+    )
+    processes["mass"] = [1.0, 2.0, np.nan, 4.0, 5.0]
+    return EpdCorpus.from_frames(processes, pd.DataFrame(), Path("/epds"))
+
+
+def test_columnar_masks_match_per_epd_filters():
+    corpus = _corpus()
+    rows = [corpus[3], corpus[1], corpus[0]]
+    objects = [FakeProcess(uuid=e.uuid, loc=e.loc) for e in rows]
+    for f in (
+        UUIDFilter({"uuids": ["u-0", "u-1", "zzz"]}),
+        LocationFilter({"FR", None}),
+        LocationFilter(set()),
+    ):
+        assert f.mask(corpus).tolist() == [f.matches(e) for e in corpus]
+        assert f.mask(rows).tolist() == [f.matches(e) for e in rows]
+        assert f.mask(objects).tolist() == [f.matches(e) for e in rows]
+    assert corpus.take([4, 0]).loc_mask({"IT"}).tolist() == [True, False]
+
+
+def test_evaluate_composes_filters_with_reason_codes():
+    from materia_epd.epd.filters import (
+        AllOf,
+        AnyOf,
+        Reason,
+        UnitConformityFilter,
+        evaluate,
+        get_filtered_epds,
+    )
+
+    corpus = _corpus()
+    located = UUIDFilter({"uuids": ["u-0", "u-2", "u-3", "u-4"]}) & (
+        LocationFilter({"FR"}) | LocationFilter({"DE"})
+    )
+    assert isinstance(located, AllOf) and isinstance(located.filters[1], AnyOf)
+    assert located.columnar
+
+    result = evaluate(corpus, located)
+    assert result.accepted.tolist() == [0, 2, 3]
+    assert result.rejected.tolist() == [1, 4]
+    assert result.codes.tolist() == [Reason.UUID, Reason.LOCATION]
+    assert repr(result.leaves[result.culprits[1]]) == "LocationFilter(code={'DE'})"
+
+    # object-level leaves only see the rows the columnar ones accepted
+    accepted, rejected = get_filtered_epds(
+        corpus, located & UnitConformityFilter({"mass": 2.0})
+    )
+    assert [e.uuid for e in accepted] == ["u-0", "u-3"]
+    assert accepted[0].material.mass == 2.0
+    assert [u for u, _ in rejected] == ["u-1", "u-2", "u-4"]
+    assert "could not be rescaled" in rejected[1][1]
+    assert rejected[2][1] == "Location does not match {'DE'}."
+
+
+def test_select_by_uuid_uses_the_corpus_index(monkeypatch):
+    from materia_epd.epd.corpus import EpdCorpus
+    from materia_epd.epd.filters import select_by_uuid
+
+    corpus = _corpus()
+    requested = ["u-3", "missing", "u-0", "u-3"]
+    expected = [e.uuid for e in corpus if e.uuid in requested]
+
+    objects = [FakeProcess(uuid=e.uuid) for e in corpus]
+    matched, missing = select_by_uuid(objects, requested)
+    assert [e.uuid for e in matched] == expected == ["u-0", "u-3"]
+    assert missing == ["missing"]
+
+    def _no_scan(self):
+        raise AssertionError("corpus scanned")
+
+    monkeypatch.setattr(EpdCorpus, "__iter__", _no_scan)
+    matched, missing = select_by_uuid(corpus, requested)
+    assert [e.uuid for e in matched] == expected
+    assert matched[0].corpus is corpus
+    assert missing == ["missing"]
+
+
+def test_rejections_are_rendered_on_access():
+    from materia_epd.epd.filters import (
+        Reason,
+        Rejection,
+        RejectionLedger,
+        get_filtered_epds,
+    )
+
+    corpus = _corpus()
+    uuid_filter = UUIDFilter({"uuids": ["u-0", "u-4"]})
+    calls = []
+    uuid_filter.failure_text = lambda: calls.append(1) or "no uuid"
+
+    accepted, rejected = get_filtered_epds(corpus, uuid_filter & LocationFilter({"FR"}))
+    assert [e.uuid for e in accepted] == ["u-0"]
+    assert isinstance(rejected, RejectionLedger) and len(rejected) == 4
+    assert list(rejected.entries()) == [
+        Rejection("u-1", Reason.UUID, 0),
+        Rejection("u-2", Reason.UUID, 0),
+        Rejection("u-3", Reason.UUID, 0),
+        Rejection("u-4", Reason.LOCATION, 1),
+    ]
+    assert calls == []
+
+    assert rejected[-1] == ("u-4", "Location does not match {'FR'}.")
+    assert [text for _, text in rejected[:3]] == ["no uuid"] * 3
+    assert len(calls) == 3
+
+
+def test_locfiltered_epds_escalate_over_shared_buckets(monkeypatch):
+    import pytest
+
+    from materia_epd.core.errors import NoMatchingEPDError
+    from materia_epd.epd import filters
+
+    siblings = {"FR": {"BE", "DE"}, "BE": {"BE", "DE"}, "DE": {"BE", "DE"}}
+    monkeypatch.setattr(
+        filters,
+        "escalate_locations",
+        lambda locs: set().union(*(siblings.get(loc, set()) for loc in locs)),
+    )
+    locations = ["DE", "BE", "DE", None]
+    epds = [FakeProcess(uuid=f"u-{i}", loc=loc) for i, loc in enumerate(locations)]
+    buckets = filters.location_buckets(epds)
+    assert buckets == {"DE": [0, 2], "BE": [1], None: [3]}
+
+    direct = filters.get_locfiltered_epds(epds, LocationFilter({"BE"}), buckets=buckets)
+    assert direct == [epds[1]]
+    escalated = filters.get_locfiltered_epds(epds, LocationFilter({"FR"}))
+    assert escalated == epds[:3]
+
+    with pytest.raises(NoMatchingEPDError) as exc:
+        filters.get_locfiltered_epds(epds, LocationFilter({"IT"}), buckets=buckets)
+    assert repr(exc.value.args[0]) == "LocationFilter(code=set())"
+
+
+def test_unit_filter_screens_corpus_rows_without_building_materials():
+    from materia_epd.epd.filters import UnitConformityFilter, get_filtered_epds
+
+    rows = list(_corpus())
+    accepted, rejected = get_filtered_epds(rows, UnitConformityFilter({"mass": 2.0}))
+
+    assert [e.uuid for e in accepted] == ["u-0", "u-1", "u-3", "u-4"]
+    assert list(rejected) == [
+        ("u-2", "Flow XML could not be rescaled: Cannot scale: 'mass' is None")
+    ]
+    assert rows[2]._material is None
@@ -0,0 +1,184 @@
+"""Tests for the compact generic-process records used by run_materia."""
+
+from __future__ import annotations
+
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+from materia_epd.core.constants import FLOW_PROPERTY_MAPPING, NS, XP
+from materia_epd.epd import models
+from materia_epd.epd.models import GenericProcess, IlcdProcess
+
+KG_UUID = FLOW_PROPERTY_MAPPING["kg"]
+
+FLOW_XML = f"""<flow xmlns:flow="http://lca.jrc.it/ILCD/Flow"
+             xmlns:common="http://lca.jrc.it/ILCD/Common"
+             xmlns:mat="http://www.matml.org/">
+  <common:UUID>gen-flow</common:UUID>
+  <flow:flowProperties>
+    <flow:flowProperty dataSetInternalID="0">
+      <flow:referenceToFlowPropertyDataSet refObjectId="{KG_UUID}">
+        <common:shortDescription xml:lang="en">Mass</common:shortDescription>
+      </flow:referenceToFlowPropertyDataSet>
+      <flow:meanValue>2.0</flow:meanValue>
+    </flow:flowProperty>
+  </flow:flowProperties>
+  <flow:referenceToReferenceFlowProperty>0</flow:referenceToReferenceFlowProperty>
+  <mat:MatML_Doc />
+</flow>"""
+
+PROCESS_XML = """<process xmlns:common="http://lca.jrc.it/ILCD/Common"
+                    xmlns:proc="http://lca.jrc.it/ILCD/Process"
+                    xmlns:epd="http://www.iai.kit.edu/EPD/2013">
+  <common:UUID>gen-1</common:UUID>
+  <proc:name>
+    <proc:baseName xml:lang="en">Generic steel</proc:baseName>
+  </proc:name>
+  <common:classification name="HS Classification">
+    <common:class level="2" classId="7208">Flat-rolled products</common:class>
+  </common:classification>
+  <proc:locationOfOperationSupplyOrProduction location="FR" />
+  <proc:quantitativeReference>
+    <proc:referenceToReferenceFlow>0</proc:referenceToReferenceFlow>
+  </proc:quantitativeReference>
+  <proc:exchanges>
+    <proc:exchange dataSetInternalID="0">
+      <proc:meanAmount>1</proc:meanAmount>
+      <proc:referenceToFlowDataSet refObjectId="gen-flow" />
+    </proc:exchange>
+  </proc:exchanges>
+  <proc:LCIAResults>
+    <proc:LCIAResult>
+      <proc:referenceToLCIAMethodDataSet>
+        <common:shortDescription xml:lang="en">Global Warming Potential total (GWP-total)</common:shortDescription>
+      </proc:referenceToLCIAMethodDataSet>
+      <epd:amount epd:module="A1-A3">10.0</epd:amount>
+    </proc:LCIAResult>
+  </proc:LCIAResults>
+</process>"""  # noqa: E501
+
+
+@pytest.fixture
+def gen_folder(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(models, "get_market_shares", lambda loc, hs: {"FR": 1.0})
+    root = tmp_path / "gen"
+    for sub in ("processes", "flows", "matches"):
+        (root / sub).mkdir(parents=True)
+    (root / "flows" / "gen-flow.xml").write_text(FLOW_XML, encoding="utf-8")
+    (root / "processes" / "gen-1.xml").write_text(PROCESS_XML, encoding="utf-8")
+    (root / "matches" / "gen-1.json").write_text(
+        json.dumps({"uuids": ["epd-1"]}), encoding="utf-8"
+    )
+    return root
+
+
+def _load(gen_folder: Path) -> GenericProcess | None:
+    path = gen_folder / "processes" / "gen-1.xml"
+    return GenericProcess.load(path, ET.parse(path).getroot())
+
+
+def test_load_keeps_metadata_without_xml(gen_folder):
+    process = _load(gen_folder)
+
+    assert process.root is None
+    assert not hasattr(process, "__dict__")
+    assert (process.uuid, process.loc, process.ref_flow_uuid) == (
+        "gen-1",
+        "FRA",
+        "gen-flow",
+    )
+    assert process.material_kwargs["mass"] == 2.0
+    assert process.dec_unit == "mass"
+    assert process.hs_class == "7208"
+    assert process.base_names == {"en": "Generic steel"}
+    assert process.matches == {"uuids": ["epd-1"]}
+    assert process.market == {"FR": 1.0}
+    [gwp] = process.get_lcia_results()
+    assert gwp["name"] == "Climate change-Total"
+    assert gwp["values"]["A1-A3"] == 10.0
+
+
+def test_load_skips_processes_without_matches(gen_folder):
+    (gen_folder / "matches" / "gen-1.json").unlink()
+    (gen_folder / "flows" / "gen-flow.xml").unlink()
+
+    assert _load(gen_folder) is None
+
+
+def test_reload_writes_outputs(gen_folder, tmp_path):
+    process = _load(gen_folder)
+    out = tmp_path / "out"
+
+    xml_process = process.reload()
+    assert isinstance(xml_process, IlcdProcess)
+    xml_process.write_process(
+        {"Global Warming Potential total (GWP-total)": {"A1-A3": 42.0}}, out
+    )
+    xml_process.write_flow({"mass": 3.0, "gross_density": 7850.0}, out)
+
+    written = ET.parse(out / "processes" / "gen-1.xml").getroot()
+    assert written.find(XP.AMOUNT, NS).text == "42.0"
+    flow = ET.parse(out / "flows" / "gen-flow.xml").getroot()
+    assert flow.find(f"{XP.FLOW_PROPERTY}/{XP.MEAN_VALUE}", NS).text == "3"
+
+
+class _Logger:
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, event, **kw):
+        self.warnings.append((event, kw))
+
+    def error(self, event, **kw):
+        raise AssertionError(event)
+
+
+def test_load_generic_processes_in_order_with_failures(gen_folder):
+    from materia_epd.epd.generators import load_generic_processes
+
+    processes_dir = gen_folder / "processes"
+    for uuid in ("gen-3", "gen-0", "gen-2"):
+        (processes_dir / f"{uuid}.xml").write_text(
+            PROCESS_XML.replace("gen-1", uuid), encoding="utf-8"
+        )
+        (gen_folder / "matches" / f"{uuid}.json").write_text(
+            json.dumps({"uuids": [uuid]}), encoding="utf-8"
+        )
+    # gen-2 points at a missing flow, gen-4 has no matches file
+    (processes_dir / "gen-2.xml").write_text(
+        PROCESS_XML.replace("gen-1", "gen-2").replace("gen-flow", "no-flow"),
+        encoding="utf-8",
+    )
+    (processes_dir / "gen-4.xml").write_text(
+        PROCESS_XML.replace("gen-1", "gen-4"), encoding="utf-8"
+    )
+    logger = _Logger()
+
+    processes, failures = load_generic_processes(processes_dir, logger, workers=3)
+
+    assert [p.uuid for p in processes] == ["gen-0", "gen-1", "gen-3"]
+    assert [p.matches["uuids"] for p in processes][0] == ["gen-0"]
+    [(path, reason)] = failures
+    assert path.name == "gen-2.xml"
+    assert "FileNotFoundError" in reason
+    assert logger.warnings[0][1]["path"] == str(path)
+
+
+def test_outputs_match_fully_indented_trees(gen_folder, tmp_path):
+    process = _load(gen_folder).reload()
+    out = tmp_path / "out"
+    process.write_process(
+        {"Global Warming Potential total (GWP-total)": {"A1-A3": 42.0}}, out
+    )
+    process.write_flow({"mass": 3.0, "gross_density": 7850.0}, out)
+
+    for root, path in (
+        (process.root, out / "processes" / "gen-1.xml"),
+        (process.ref_flow.root, out / "flows" / "gen-flow.xml"),
+    ):
+        ET.indent(root, space="  ")
+        expected = ET.canonicalize(ET.tostring(root), strip_text=True)
+        assert ET.canonicalize(from_file=path, strip_text=True) == expected
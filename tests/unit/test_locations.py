@@ -51,6 +51,33 @@ def test_locations_full_coverage(monkeypatch):
     assert loc.escalate_location_set({"A", "B", "C"}) == {"Achild", "Bchild"}
 
 
+def test_ilcd_table_is_single_lookup_with_pycountry_fallback(monkeypatch):
+    def _fail(code):
+        raise AssertionError(f"fallback used for {code}")
+
+    monkeypatch.setattr(loc, "get_ilcd_location_table", lambda: {"DE": "DEU"})
+    monkeypatch.setattr(loc, "_translate_ilcd_location", _fail)
+    assert loc.ilcd_to_iso_location("DE") == "DEU"
+
+    monkeypatch.setattr(loc, "_translate_ilcd_location", lambda code: "NEW")
+    assert loc.ilcd_to_iso_location("QQ") == "NEW"
+
+
+def test_packaged_ilcd_table_matches_builder():
+    import pycountry
+    from materia_epd.resources import (
+        get_ilcd_location_table,
+        get_regions_mapping,
+    )
+
+    loc.pycountry = pycountry
+    loc.get_regions_mapping = get_regions_mapping
+    table = get_ilcd_location_table()
+    assert table == loc.build_ilcd_location_table()
+    assert table["UK"] == "GBR" and table["GLO"] == "GLO"
+    assert table["RER"] == "Europe"
+
+
 def test_get_location_color(monkeypatch):
     loc.get_location_data = lambda code: {
         "ColorHex": "#112233",
@@ -82,3 +109,21 @@ def test_get_transport_impact_per_kg():
 
     from_parent = loc.get_transport_impact_per_kg("FRA", "LUX")
     assert from_parent == {"Climate change-Total": 0.0434}
+
+
+def test_location_hierarchy_matches_location_files(monkeypatch):
+    from materia_epd import resources
+
+    hierarchy = loc.get_location_hierarchy()
+    assert hierarchy["FRA"] == frozenset(
+        resources.get_location_data("Western Europe")["Children"]
+    )
+    assert "DEU" in hierarchy["FRA"] and "GLO" in hierarchy
+
+    monkeypatch.setattr(
+        loc, "escalate_location_set", lambda codes: {f"{c}-up" for c in codes}
+    )
+    assert loc.escalate_locations({"LUX", "Nowhere"}) == {
+        *hierarchy["LUX"],
+        "Nowhere-up",
+    }
@@ -0,0 +1,44 @@
+# tests/unit/test_lookups.py
+from materia_epd.core import lookups
+from materia_epd.core.constants import (
+    FLOW_PROPERTY_MAPPING,
+    UNIT_PROPERTY_MAPPING,
+    UNIT_QUANTITY_MAPPING,
+)
+from materia_epd.resources import get_indicator_synonyms
+
+
+def test_reverse_unit_indexes_match_mappings():
+    for unit, uuid in FLOW_PROPERTY_MAPPING.items():
+        assert lookups.UNIT_BY_FLOW_PROPERTY_UUID[uuid] == unit
+        assert (
+            lookups.QUANTITY_FIELD_BY_FLOW_PROPERTY_UUID[uuid]
+            == UNIT_QUANTITY_MAPPING[unit]
+        )
+    for unit, field in UNIT_QUANTITY_MAPPING.items():
+        assert lookups.QUANTITY_UNIT_BY_FIELD[field] == unit
+    for unit, field in UNIT_PROPERTY_MAPPING.items():
+        assert lookups.PROPERTY_UNIT_BY_FIELD[field] == unit
+    assert len(lookups.MATERIAL_FIELDS) == 11
+
+
+def test_canonical_indicator_matches_linear_scan():
+    synonyms = get_indicator_synonyms()
+    for canonical, aliases in synonyms.items():
+        for alias in aliases:
+            expected = next(c for c, al in synonyms.items() if alias in al)
+            assert lookups.canonical_indicator(alias) == expected
+    assert lookups.canonical_indicator("Unknown") is None
+    assert lookups.canonical_indicator(None) is None
+
+
+def test_canonical_indicator_normalizes_case_and_whitespace():
+    assert (
+        lookups.canonical_indicator("  global warming   potential TOTAL (GWP-total)")
+        == "Climate change-Total"
+    )
+
+
+def test_build_indicator_index_first_canonical_wins():
+    index = lookups.build_indicator_index({"A": ["x"], "B": ["X", "y"]})
+    assert index == {"x": "A", "y": "B"}
@@ -3,6 +3,7 @@ import xml.etree.ElementTree as ET
 from pathlib import Path
 
 from materia_epd.core import constants as real_constants
+from materia_epd.core import lookups as real_lookups
 from materia_epd.epd import models
 
 
@@ -14,11 +15,14 @@ def _restore_module_constants():
     models.FLOW_PROPERTY_MAPPING = real_constants.FLOW_PROPERTY_MAPPING
     models.UNIT_QUANTITY_MAPPING = real_constants.UNIT_QUANTITY_MAPPING
     models.UNIT_PROPERTY_MAPPING = real_constants.UNIT_PROPERTY_MAPPING
+    models.UNIT_BY_FLOW_PROPERTY_UUID = real_lookups.UNIT_BY_FLOW_PROPERTY_UUID
+    models.canonical_indicator = real_lookups.canonical_indicator
 
 
 def test_models_full_coverage(tmp_path):
     # -------- Patch minimal constants & helpers (no namespaces) --------
     models.FLOW_PROPERTY_MAPPING = {"kg": "UUID-MASS"}
+    models.UNIT_BY_FLOW_PROPERTY_UUID = {"UUID-MASS": "kg"}
     models.UNIT_QUANTITY_MAPPING = {"kg": "mass"}
     models.UNIT_PROPERTY_MAPPING = {"g/cm3": "gross_density"}
     models.NS = {}
@@ -72,7 +76,12 @@ def test_models_full_coverage(tmp_path):
 
     models.Material = Material
     models.normalize_module_values = lambda elems, scaling_factor=1.0: [10, 20, 30]
-    models.get_indicator_synonyms = lambda: {"GWP": ["Global Warming Potential"]}
+    indicator_index = real_lookups.build_indicator_index(
+        {"GWP": ["Global Warming Potential"]}
+    )
+    models.canonical_indicator = lambda name: indicator_index.get(
+        real_lookups.normalize_alias(name)
+    )
     models.get_market_shares = lambda _loc, _hs: {"EU": 0.7}
     models.read_json_file = lambda _p: {"match": True}
     models.MATCHES_FOLDER = str(tmp_path)
@@ -310,6 +319,19 @@ def test_write_process_attr_lookup_returns_none_when_no_known_attr(
     assert [a.text for a in amounts] == ["0", "0"]
 
 
+def test_amount_module_attribute_priority():
+    epd = "{http://www.iai.kit.edu/EPD/2013}"
+    cases = [
+        ({"module": "A1", "phase": "B1"}, "A1"),
+        ({f"{epd}phase": "B1", "stageId": "C1"}, "B1"),
+        ({"module": "", "lifecycleModule": "D"}, "D"),
+        ({"module": "", f"{epd}module": "A2", "stageId": "C1"}, "C1"),
+        ({"other": "X"}, None),
+    ]
+    for attrib, expected in cases:
+        assert models._amount_module(ET.Element("amount", attrib)) == expected
+
+
 # #
 # # -------------------- write_flow tests --------------------
 # # These tests were generated with Opus4.5. The logic has not been reviewed.
@@ -0,0 +1,187 @@
+"""Tests for running independent base products on forked processes."""
+
+from __future__ import annotations
+
+import os
+import pickle
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from materia_epd.pipeline import parallel
+from materia_epd.pipeline.context import EpdPipelineContext
+from materia_epd.pipeline.parallel import map_in_order
+
+needs_fork = pytest.mark.skipif(not parallel.can_fork(), reason="needs fork")
+
+
+@needs_fork
+def test_forked_map_keeps_input_order_without_pickling_inputs():
+    # a lock cannot be pickled: items and run must reach the workers by fork
+    lock = threading.Lock()
+    items = [(lock, i) for i in range(6)]
+
+    results = list(map_in_order(lambda item: (item[1], os.getpid()), items, jobs=3))
+
+    assert [i for i, _ in results] == list(range(6))
+    assert os.getpid() not in {pid for _, pid in results}
+    assert parallel._shared is None
+
+
+def test_heaviest_items_are_submitted_first(monkeypatch):
+    submitted = []
+
+    class _Pool:
+        def __init__(self, max_workers, mp_context):
+            self.max_workers = max_workers
+
+        def submit(self, fn, index):
+            submitted.append(index)
+            future = Future()
+            future.set_result(fn(index))
+            return future
+
+        def shutdown(self, wait, cancel_futures):
+            pass
+
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", _Pool)
+    monkeypatch.setattr(parallel, "can_fork", lambda: True)
+    items = ["a", "b", "c", "d"]
+
+    results = list(map_in_order(str.upper, items, jobs=2, weights=[1, 5, 1, 3]))
+
+    assert results == ["A", "B", "C", "D"]
+    assert submitted == [1, 3, 0, 2]
+
+
+def test_runs_inline_before_python_311(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("no process pool before 3.11")
+
+    monkeypatch.setattr(parallel.sys, "version_info", (3, 10, 14))
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", no_pool)
+
+    assert not parallel.can_fork()
+    pids = list(map_in_order(lambda _: os.getpid(), [1, 2, 3], jobs=3))
+    assert pids == [os.getpid()] * 3
+
+
+def test_single_job_runs_inline():
+    pids = list(map_in_order(lambda _: os.getpid(), [1, 2], jobs=1))
+    assert pids == [os.getpid()] * 2
+
+
+def test_detached_context_drops_corpus_and_keeps_counts():
+    from pathlib import Path
+
+    import numpy as np
+    import pandas as pd
+
+    from materia_epd.core.constants import VARS
+    from materia_epd.epd.corpus import EpdCorpus
+    from materia_epd.epd.filters import LocationFilter, get_filtered_epds
+
+    processes = pd.DataFrame(
+        {
+            "uuid": [f"u-{i}" for i in range(5)],
+            "loc": ["FR", None, "DE", "FR", "IT"],
+            **{c: None for c in ("ref_flow_uuid", "source_path", "base_names")},
+            **{c: None for c in ("hs_classes", "ref_flow_property", "declared_unit")},
+            **{name: np.nan for name in VARS},
+        }
+    )
+    corpus = EpdCorpus.from_frames(processes, pd.DataFrame(), Path("/epds"))
+    filtered, rejected = get_filtered_epds(corpus, LocationFilter({"FR"}))
+    ctx = EpdPipelineContext(
+        process=object(),
+        matches={"uuids": list(corpus.uuids)},
+        all_epds=corpus,
+        matched_epds=list(corpus),
+        filtered_epds=filtered,
+        rejected_epds=rejected,
+        market_epds={"FR": filtered},
+        results_registry={"other": {}},
+    )
+
+    detached = pickle.loads(pickle.dumps(ctx.detached()))
+
+    assert detached.process is None and len(detached.all_epds) == 0
+    assert detached.filtered_epds == ["u-0", "u-3"]
+    assert detached.market_epds == {"FR": ["u-0", "u-3"]}
+    assert len(detached.matched_epds) == 5
+    assert list(detached.rejected_epds) == list(rejected)
+    assert detached.results_registry == {}
+
+
+class _Product:
+    def __init__(self, uuid, matches):
+        self.uuid, self.matches = uuid, matches
+        self.material_kwargs, self.dec_unit = {"mass": 1.0}, "mass"
+
+
+@pytest.mark.parametrize("jobs", [1, pytest.param(3, marks=needs_fork)])
+def test_run_materia_merges_base_results_before_assembled(monkeypatch, tmp_path, jobs):
+    from types import SimpleNamespace
+
+    from materia_epd.pipeline import run
+
+    products = [
+        _Product("kit", {"type": "assembled", "components": ["b", "a"]}),
+        _Product("a", {"type": "average", "uuids": ["e-1"]}),
+        _Product("b", {"type": "market-average", "uuids": ["e-1", "e-2"]}),
+        _Product("c", {"type": "average", "uuids": []}),
+    ]
+
+    class _Corpus(list):
+        def rows_for(self, uuids):
+            return list(uuids)
+
+    corpus = _Corpus()
+    monkeypatch.setattr(run, "load_epd_corpus", lambda *a, **kw: corpus)
+    monkeypatch.setattr(run, "load_generic_processes", lambda *a, **kw: (products, []))
+
+    class _Pipeline:
+        def __init__(self, stages):
+            pass
+
+        def run(self, ctx):
+            if ctx.recipe_type == "assembled":
+                seen = sorted(ctx.results_registry)
+            else:
+                seen = os.getpid()
+            ctx.avg_properties = {"mass": 1.0}
+            ctx.avg_gwps = {"GWP": {"A1-A3": len(ctx.process.uuid)}}
+            ctx.report = {"seen": seen}
+            ctx.success = ctx.process.uuid != "c"
+            return ctx
+
+    submitted, printed = [], []
+
+    class _Writer:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def submit(self, process, gwps, props, report):
+            submitted.append((process.uuid, report["seen"]))
+
+        def close(self):
+            return []
+
+    monkeypatch.setattr(run, "Pipeline", _Pipeline)
+    monkeypatch.setattr(
+        run, "RecipeFactory", lambda: SimpleNamespace(build=lambda ctx: [])
+    )
+    monkeypatch.setattr(run, "OutputWriter", _Writer)
+    monkeypatch.setattr(
+        run, "print_pipeline_summary", lambda ctx: printed.append(ctx.process.uuid)
+    )
+
+    run.run_materia(tmp_path, tmp_path, tmp_path, jobs=jobs)
+
+    assert printed == ["a", "b", "c", "kit"]
+    assert [uuid for uuid, _ in submitted] == ["a", "b", "kit"]
+    assert submitted[-1][1] == ["a", "b"]
+    assert products[1].material.mass == 1.0
+    base_pids = {seen for _, seen in submitted[:2]}
+    assert (os.getpid() in base_pids) == (jobs == 1)
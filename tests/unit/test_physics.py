@@ -79,7 +79,7 @@ def test_material_to_dict_and_compute_conflicts():
 def test_material_rescale_valid_volume():
     m = ph.Material(mass=10, volume=5)
     # Rescale volume by factor 2
-    m.rescale({"volume": 10})
+    m = m.rescale({"volume": 10})
     assert math.isclose(m.volume, 10.0, rel_tol=1e-8)
     assert m.scaling_factor > 0
 
@@ -105,7 +105,7 @@ def test_material_rescale_invalid_combo():
 def test_material_rescale_layer_thickness_logic():
     # Valid rescale with surface + layer_thickness (allowed combo)
     m = ph.Material(surface=2.0, gross_density=1.5, grammage=3.0, layer_thickness=2.0)
-    m.rescale({"surface": 4.0, "layer_thickness": 4.0})
+    m = m.rescale({"surface": 4.0, "layer_thickness": 4.0})
     assert math.isclose(m.surface, 4.0)
     assert math.isclose(m.layer_thickness, 4.0)
     # grammage scaled proportionally to surface and thickness
@@ -126,7 +126,8 @@ def test_material_compute_detects_conflict():
 
 
 def test_clean_raises_when_conflicts_remain(monkeypatch):
-    m = ph.Material(mass=2.0, volume=1.0, gross_density=3.0)  # inconsistent: 2 ≠ 1*3
+    # inconsistent: 2 ≠ 1*3
+    m = ph.Material(mass=2.0, volume=1.0, gross_density=3.0)._thaw()
     m._compute()
     assert (
         m._conflicts
@@ -163,13 +164,13 @@ def test_rescale_thickness_requires_density():
 
 def test_rescale_mass_scales_other_quantities():
     m = ph.Material(mass=2.0, length=3.0)  # length is a QUANTITY
-    m.rescale({"mass": 4.0})
+    m = m.rescale({"mass": 4.0})
     # scaling_factor should be 2, so length doubles
     assert math.isclose(m.length, 6.0, rel_tol=1e-8)
 
 
 def test_clean_returns_self_when_conflicts_is_none():
-    m = ph.Material()
+    m = ph.Material()._thaw()
     m._conflicts = None  # force the early-return path
     # Should just return without needing baseline/projection
     assert m._clean({}) is None or isinstance(m, ph.Material)
@@ -189,3 +190,229 @@ def test_rescale_thickness_requires_density_when_surface_known():
     with pytest.raises(ValueError, match="density.*must be known"):
         # Still the accepted combo; thickness processed first
         m.rescale({"layer_thickness": 2.0, "surface": 1.0})
+
+
+def test_material_is_immutable_and_rescale_returns_copy():
+    m = ph.Material(mass=2.0, volume=1.0)
+    with pytest.raises(AttributeError):
+        m.mass = 3.0
+
+    scaled = m.rescale({"mass": 4.0})
+    assert scaled is not m
+    assert (m.mass, m.volume, m.scaling_factor) == (2.0, 1.0, 1.0)
+    assert (scaled.mass, scaled.volume, scaled.scaling_factor) == (4.0, 2.0, 2.0)
+    with pytest.raises(AttributeError):
+        scaled.scaling_factor = 1.0
+
+
+def test_rescale_is_memoized_per_material_and_targets():
+    ph._rescale_cached.cache_clear()
+    first = ph.Material(mass=2.0, volume=1.0).rescale({"mass": 4.0})
+    # an equal material (e.g. the same EPD in another product) hits the cache
+    again = ph.Material(mass=2.0, volume=1.0).rescale({"mass": 4.0})
+    other = ph.Material(mass=2.0, volume=1.0).rescale({"volume": 4.0})
+
+    assert again is first
+    assert other is not first
+    info = ph._rescale_cached.cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+    assert info.maxsize == ph.RESCALE_CACHE_SIZE
+
+
+def test_rescale_failures_are_memoized():
+    ph._rescale_cached.cache_clear()
+    m = ph.Material(mass=5)
+    raised = []
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Cannot scale") as excinfo:
+            m.rescale({"volume": 1.0})
+        raised.append(excinfo.value)
+    assert ph._rescale_cached.cache_info().hits == 1
+    assert raised[0] is not raised[1]
+
+
+def test_rescale_applies_targets_in_caller_order():
+    ph._rescale_cached.cache_clear()
+    m = ph.Material(mass=5.0)
+    with pytest.raises(ValueError, match="'surface' is None"):
+        m.rescale({"surface": 1.0, "layer_thickness": 0.1})
+    with pytest.raises(ValueError, match="'layer_thickness' is None"):
+        m.rescale({"layer_thickness": 0.1, "surface": 1.0})
+
+
+def test_propagate_rules_matches_scalar_compute():
+    rng = np.random.default_rng(0)
+    values = rng.uniform(0.1, 10.0, size=(2000, len(ph.VARS)))
+    values[rng.random(values.shape) < 0.6] = np.nan
+    values[0, :] = np.nan
+    values[1, :3] = [1e-9, 2.0, -1.0]  # near-zero and non-positive entries
+
+    derived, conflicts = ph.propagate_rules(values)
+
+    assert conflicts.any() and not conflicts.all()
+    for row, got, clash in zip(values, derived, conflicts):
+        expected, expected_clash = ph._propagate_row(row)
+        np.testing.assert_array_equal(got, expected)
+        assert clash == expected_clash
+
+
+def test_with_derivation_rescales_like_plain_material():
+    kwargs = {"mass": 2.0, "volume": 0.5, "surface": 4.0}
+    derived, _ = ph.propagate_rules(
+        np.array([[kwargs.get(name, np.nan) for name in ph.VARS]])
+    )
+    m = ph.Material.with_derivation(
+        [None if np.isnan(v) else v for v in derived[0]], **kwargs
+    )
+
+    assert m == ph.Material(**kwargs)
+    ph._rescale_cached.cache_clear()
+    scaled = m.rescale({"mass": 4.0})
+    ph._rescale_cached.cache_clear()
+    assert scaled.to_dict() == ph.Material(**kwargs).rescale({"mass": 4.0}).to_dict()
+
+
+def test_derivation_plan_matches_rule_queue():
+    rng = np.random.default_rng(1)
+    values = rng.uniform(0.1, 10.0, size=(2000, len(ph.VARS)))
+    values[rng.random(values.shape) < 0.6] = np.nan
+    values[:50, 0] = 1e-9  # near-zero denominators take the queue fallback
+
+    for row in values:
+        kwargs = {n: None if np.isnan(v) else float(v) for n, v in zip(ph.VARS, row)}
+        planned = ph.Material(**kwargs)._thaw()
+        queued = ph.Material(**kwargs)._thaw()
+        planned._compute()
+        queued._compute_queued()
+        assert planned.to_dict() == queued.to_dict()
+        assert planned._conflicts == queued._conflicts
+
+
+def test_derivation_plan_is_memoized_per_pattern():
+    mass, volume = ph.VARS.index("mass"), ph.VARS.index("volume")
+    plan = ph._derivation_plan(1 << mass | 1 << volume)
+
+    assert plan is ph._derivation_plan(1 << mass | 1 << volume)
+    assert (
+        ph.PlanStep(
+            ph.VARS.index("gross_density"), ph.RuleMode.DIVIDE, (mass, volume), True
+        )
+        in plan
+    )
+
+
+def _conflicting_materials(n):
+    rng = np.random.default_rng(2)
+    names = ["mass", "volume", "gross_density", "surface", "layer_thickness"]
+    return [
+        ph.Material(**dict(zip(names, rng.uniform(0.5, 5.0, size=len(names)))))
+        for _ in range(n)
+    ]
+
+
+def test_rescale_many_matches_rescale_and_fills_memo():
+    materials = _conflicting_materials(200)
+    targets = {"mass": 3.0}
+
+    ph._rescale_cached.cache_clear()
+    expected = [ph._rescale_outcome(m, (("mass", 3.0),)) for m in materials]
+    outcomes = ph.rescale_many(materials + materials[:5], targets)
+
+    assert len(outcomes) == 205 and outcomes[200] is outcomes[0]
+    for (got, got_err), (exp, exp_err) in zip(outcomes, expected):
+        if exp is None:
+            assert got_err == exp_err
+        else:
+            assert got.to_dict() == exp.to_dict()
+            assert got.scaling_factor == exp.scaling_factor
+    assert materials[0].rescale(targets) is outcomes[0][0]
+    assert ph._rescale_cached.cache_info().currsize == 200
+
+
+def test_projection_operator_is_cached_per_pattern():
+    ph._projection_operator.cache_clear()
+    ph._rescale_cached.cache_clear()
+    ph.rescale_many(_conflicting_materials(50), {"mass": 3.0})
+    info = ph._projection_operator.cache_info()
+    assert info.currsize == 1 and info.hits == 0
+
+
+def test_missing_field_screen_agrees_with_rescale():
+    from itertools import combinations
+
+    from materia_epd.core.constants import ACCEPTED_RESCALINGS, VARS
+
+    screened = 0
+    for size in range(4):
+        for names in combinations(VARS, size):
+            material = ph.Material(**dict.fromkeys(names, 2.0))
+            bits = material.derived_bits()
+            mask = ph.feasible_rescalings(bits)
+            for k, combo in enumerate(ACCEPTED_RESCALINGS):
+                # both orders: the first failing target names the error
+                for order in (sorted(combo), sorted(combo, reverse=True)):
+                    targets = dict.fromkeys(order, 4.0)
+                    assert ph.rescaling_index(targets) == k
+                    missing = ph.missing_field_error(bits, targets)
+                    assert (missing is None) == bool(mask >> k & 1)
+                    if missing is None:
+                        continue
+                    screened += 1
+                    with pytest.raises(ValueError) as exc:
+                        material.rescale(targets)
+                    assert str(exc.value) == missing
+    assert screened > 0
+    assert ph.rescaling_index({"mass": -1.0}) is None
+    assert ph.rescaling_index({"mass": 1.0, "surface": 1.0}) is None
+
+
+def _uncached_projection(baseline, targets):
+    known = [ph.NAME_TO_IDX[n] for n in ph.VARS if baseline.get(n) is not None]
+    A_eq, _ = ph._build_property_eq_system({idx: j for j, idx in enumerate(known)})
+    n, r, c = len(known), A_eq.shape[0], len(targets)
+    E = np.zeros((n, c))
+    E[[known.index(ph.NAME_TO_IDX[k]) for k in targets], range(c)] = 1
+    K = np.block(
+        [
+            [2.0 * np.eye(n), A_eq.T, E],
+            [A_eq, np.zeros((r, r)), np.zeros((r, c))],
+            [E.T, np.zeros((c, r)), np.zeros((c, c))],
+        ]
+    )
+    rhs = np.concatenate(
+        [
+            2.0 * np.log([baseline[ph.VARS[i]] for i in known]),
+            np.zeros(r),
+            np.log(list(targets.values())),
+        ]
+    )
+    return np.linalg.lstsq(K, rhs, rcond=None)[0][:n]
+
+
+def test_projection_operator_handles_rank_deficient_constraints():
+    baseline = {
+        **dict.fromkeys(ph.VARS),
+        "mass": 170.9550529585246,
+        "volume": 0.0718664804163639,
+        "surface": 3.1254789351152077,
+        "linear_density": 18.566364092509122,
+        "cross_sectional_area": 0.0078049710632484386,
+    }
+    m = ph.Material(**baseline)._thaw()
+    m._compute()
+    scaled = m.to_dict()
+    known = [name for name in ph.VARS if scaled[name] is not None]
+    A_eq, _ = ph._build_property_eq_system(
+        {ph.NAME_TO_IDX[name]: j for j, name in enumerate(known)}
+    )
+    assert np.linalg.matrix_rank(A_eq) < A_eq.shape[0]
+
+    targets = {"surface": 1.0}
+    projected = ph._project_logs_onto_eq(
+        scaled, targets, {name: j for j, name in enumerate(known)}
+    )
+    assert np.allclose(projected, _uncached_projection(scaled, targets))
+
+    rescaled = ph.Material(**baseline).rescale(targets)
+    assert rescaled.mass == pytest.approx(54.697, rel=1e-4)
+    assert rescaled.volume == pytest.approx(0.02299, rel=1e-3)
@@ -68,6 +68,14 @@ def test_get_regions_mapping(mock_load):
     mock_load.assert_called_once_with("regions_mapping.json")
 
 
+@patch("materia_epd.resources.load_json_from_package")
+def test_get_ilcd_location_table(mock_load):
+    res.get_ilcd_location_table.cache_clear()
+    mock_load.return_value = {"FR": "FRA"}
+    assert res.get_ilcd_location_table() == {"FR": "FRA"}
+    mock_load.assert_called_once_with("ilcd_locations.json")
+
+
 @patch("materia_epd.resources.load_json_from_package")
 def test_get_indicator_synonyms(mock_load):
     res.get_indicator_synonyms.cache_clear()
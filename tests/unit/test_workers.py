@@ -0,0 +1,48 @@
+# tests/unit/test_workers.py
+import subprocess
+import sys
+import time
+
+from materia_epd.epd import workers
+
+
+class _ListQueue(list):
+    def put(self, item):
+        self.append(item)
+
+
+def test_init_extraction_worker_reports_startup():
+    queue = _ListQueue()
+    workers.init_extraction_worker(queue, time.time())
+    [entry] = queue
+    assert set(entry) == {"pid", "spawn_s", "import_s", "warm_s"}
+    assert entry["import_s"] >= 0 and entry["warm_s"] >= 0
+
+    workers.init_extraction_worker()  # no queue: just warms
+
+
+def test_summarize_worker_startup():
+    assert workers.summarize_worker_startup([]) == {"count": 0}
+    summary = workers.summarize_worker_startup(
+        [
+            {"pid": 1, "spawn_s": 0.5, "import_s": 0.2, "warm_s": 0.1},
+            {"pid": 2, "spawn_s": None, "import_s": 0.1, "warm_s": 0.1},
+        ]
+    )
+    assert summary["count"] == 2
+    assert summary["max_s"] == 0.8
+    assert summary["mean_s"] == 0.5
+    assert summary["spawn_max_s"] == 0.5
+    assert summary["import_max_s"] == 0.2
+
+
+def test_extraction_import_path_is_slim():
+    code = (
+        "import sys, materia_epd.epd.extract, materia_epd.epd.workers;"
+        "heavy = {'pandas', 'numpy', 'rich', 'matplotlib', 'pyarrow'};"
+        "print(sorted(heavy & set(sys.modules)))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "[]"
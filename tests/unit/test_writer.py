@@ -0,0 +1,93 @@
+"""Tests for the background output writer used by run_materia."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from materia_epd.pipeline import writer as mod
+from materia_epd.pipeline.writer import OutputWriter, WriteFailure
+
+
+class _XmlProcess:
+    def __init__(self, log, uuid):
+        self.log, self.uuid = log, uuid
+
+    def write_process(self, gwps, out):
+        self.log.append(("process", self.uuid))
+        return True
+
+    def write_flow(self, props, out):
+        self.log.append(("flow", self.uuid))
+        return self.uuid != "bad-flow"
+
+
+class _Process:
+    def __init__(self, log, uuid):
+        self.log, self.uuid = log, uuid
+
+    def reload(self):
+        if self.uuid == "missing":
+            raise FileNotFoundError(self.uuid)
+        return _XmlProcess(self.log, self.uuid)
+
+
+@pytest.fixture
+def outputs(monkeypatch):
+    log = []
+    state = {"running": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def _slow(kind):
+        def _write(report, out, uuid):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.01)
+            with lock:
+                state["running"] -= 1
+            if report.get("fail") == kind:
+                raise OSError(f"{kind} failed")
+            log.append((kind, uuid))
+
+        return _write
+
+    monkeypatch.setattr(mod, "write_report", _slow("report"))
+    monkeypatch.setattr(mod, "draw_report", _slow("pdf"))
+    return log, state
+
+
+def test_background_writer_bounds_pending_jobs_and_collects_failures(outputs, tmp_path):
+    log, state = outputs
+    uuids = [f"p-{i}" for i in range(6)] + ["missing", "bad-flow", "bad-pdf"]
+
+    writer = OutputWriter(tmp_path, workers=3, max_pending=2, pdf_processes=False)
+    for uuid in uuids:
+        report = {"fail": "pdf"} if uuid == "bad-pdf" else {}
+        writer.submit(_Process(log, uuid), {}, {}, report)
+    failures = writer.close()
+
+    assert state["peak"] <= 2
+    assert failures == [
+        WriteFailure("bad-flow", "flow", "write failed"),
+        WriteFailure("bad-pdf", "pdf", "OSError: pdf failed"),
+        WriteFailure("missing", "xml", "FileNotFoundError: missing"),
+    ]
+    for uuid in uuids[:6]:
+        for kind in ("process", "flow", "report", "pdf"):
+            assert (kind, uuid) in log
+    # the report is still written when the XML could not be
+    assert ("report", "missing") in log
+
+
+def test_inline_writer_keeps_submission_order(outputs, tmp_path):
+    log, _ = outputs
+
+    with OutputWriter(tmp_path, workers=0) as writer:
+        writer.submit(_Process(log, "a"), {}, {}, {})
+        writer.submit(_Process(log, "b"), {}, {}, {"fail": "report"})
+
+    assert [uuid for _, uuid in log] == ["a"] * 4 + ["b"] * 3
+    assert writer.failures == [WriteFailure("b", "report", "OSError: report failed")]